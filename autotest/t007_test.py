@@ -294,6 +294,81 @@ def test_export_output():
     assert np.array_equal(ibound_mask, arr_mask)
 
 
+def _build_ensemble(nmembers):
+    """Models of an ensemble with copies of the same binary output files."""
+    mp6_ws = os.path.join('..', 'examples', 'data', 'mp6')
+    models = []
+    for i in range(nmembers):
+        name = 'ens_{}'.format(i)
+        model_ws = os.path.join(tpth, 'ensemble', name)
+        if not os.path.isdir(model_ws):
+            os.makedirs(model_ws)
+        m = flopy.modflow.Modflow(modelname=name, model_ws=model_ws)
+        flopy.modflow.ModflowDis(m, nlay=5, nrow=25, ncol=25)
+        oc = flopy.modflow.ModflowOc(m, stress_period_data={
+            (0, 0): ['save head', 'save budget']})
+        # output file extensions used by load_results
+        oc.extension = ['oc', 'hds', 'ddn', 'cbc', 'ibo']
+        shutil.copyfile(os.path.join(mp6_ws, 'EXAMPLE.HED'),
+                        os.path.join(model_ws, name + '.hds'))
+        shutil.copyfile(os.path.join(mp6_ws, 'EXAMPLE.BUD'),
+                        os.path.join(model_ws, name + '.cbc'))
+        models.append(m)
+    return models
+
+
+def test_ensemble_results():
+    from flopy.export.utils import _iter_ensemble_results
+    models = _build_ensemble(3)
+    oudic0 = models[0].load_results(as_dict=True)
+    assert len(oudic0) == 2
+
+    # the files of the realizations are opened with the record index of
+    # the files of the first model and closed before the next realization
+    results = []
+    for m, oudic in _iter_ensemble_results(models, oudic0):
+        expected = m.load_results(as_dict=True)
+        assert sorted(oudic) == sorted(expected)
+        for key, out in oudic.items():
+            out0 = oudic0[os.path.join(models[0].model_ws,
+                                       os.path.basename(key).replace(
+                                           m.name, models[0].name))]
+            assert out.recordarray is out0.recordarray
+            assert np.array_equal(out.recordarray, expected[key].recordarray)
+            d, d0 = out.get_data(idx=1), expected[key].get_data(idx=1)
+            if isinstance(out, flopy.utils.CellBudgetFile):
+                d, d0 = d[0], d0[0]
+            assert np.array_equal(d, d0)
+            assert not out.file.closed
+            expected[key].close()
+        results.append(oudic)
+    assert len(results) == 2
+    for oudic in results:
+        assert all(out.file.closed for out in oudic.values())
+
+    # realizations without all of the files are loaded with load_results
+    os.remove(os.path.join(models[2].model_ws, models[2].name + '.cbc'))
+    keys = [sorted(oudic) for m, oudic in
+            _iter_ensemble_results(models, oudic0)]
+    assert len(keys[0]) == 2
+    assert keys[1] == [os.path.join(models[2].model_ws,
+                                    models[2].name + '.hds')]
+    for out in oudic0.values():
+        out.close()
+
+    # export of the outputs of the ensemble
+    try:
+        import netCDF4
+        import pyproj
+    except:
+        return
+    f_in, f_out = flopy.export.utils.ensemble_helper(
+        None, os.path.join(npth, 'ensemble.out.nc'), models[:2])
+    assert f_in is None
+    assert 'head' in f_out.nc.variables
+    return
+
+
 def test_write_shapefile():
     sf = import_shapefile()
     if not sf:
@@ -1707,6 +1782,7 @@ def main():
     test_mapview_plot_bc()
     test_crosssection_plot_bc()
     test_output_helper_shapefile_export()
+    test_ensemble_results()
 
 if __name__ == '__main__':
 
@@ -581,6 +581,32 @@ def test_SfrFile():
     assert sfrout.times == expected_times, sfrout.times
 
 
+def test_SfrFile_results():
+    sfrout = SfrFile('../examples/data/sfr_examples/sfroutput2.txt')
+    if sfrout.pd is None:
+        return
+    df = sfrout.get_dataframe()
+    assert df.shape == (6, 22), df.shape
+    assert list(df.kstpkper) == [(0, 0)] * 3 + [(49, 1)] * 3
+    results = sfrout.get_results(1, 2)
+    assert results.shape[0] == 2
+    assert list(results.kstpkper) == [(0, 0), (49, 1)]
+    assert list(results.column) == [168, 168]
+
+    sfrout = SfrFile('../examples/data/sfr_examples/test1tr.flw')
+    df = sfrout.df
+    results = sfrout.get_results(4, 3)
+    expected = df.loc[(df.segment == 4) & (df.reach == 3)]
+    assert results.shape[0] == len(sfrout.times)
+    assert np.array_equal(results.Qout.values, expected.Qout.values)
+    assert list(results.kstpkper) == sfrout.times
+    results = sfrout.get_results([4, 1, 99], [3, 1, 1])
+    assert results.shape[0] == 2 * len(sfrout.times)
+    assert list(results.segment[:len(sfrout.times)]) == \
+        [4] * len(sfrout.times)
+    assert sfrout.get_results(99, 1).shape[0] == 0
+
+
 def test_sfr_plot():
     #m = flopy.modflow.Modflow.load('test1ss.nam', model_ws=path, verbose=False)
     #sfr = m.get_package('SFR')
@@ -602,5 +628,6 @@ if __name__ == '__main__':
     # mtest_sfr_plot()
     # test_assign_layers()
     #test_SfrFile()
+    # test_SfrFile_results()
     # test_const()
     pass
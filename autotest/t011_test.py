@@ -4,6 +4,7 @@ Some basic tests for mflistfile.py module (not super rigorous)
 """
 
 import os
+import shutil
 import flopy
 import numpy as np
 from nose.tools import raises
@@ -56,6 +57,71 @@ def test_mflistfile():
 
     return
 
+
+def test_mflistfile_cache():
+    pth = os.path.join('..', 'examples', 'data', 'freyberg')
+    cpth = os.path.join('temp', 't011')
+    if not os.path.isdir(cpth):
+        os.makedirs(cpth)
+    list_file = os.path.join(cpth, 'freyberg.gitlist')
+    shutil.copyfile(os.path.join(pth, 'freyberg.gitlist'), list_file)
+    cache_file = list_file + '.flopynpz'
+    if os.path.isfile(cache_file):
+        os.remove(cache_file)
+    mflist0 = flopy.utils.MfListBudget(list_file)
+    mflist = flopy.utils.MfListBudget(list_file, cache_data=True)
+    assert os.path.isfile(cache_file)
+    mflist = flopy.utils.MfListBudget(list_file, cache_data=True)
+    assert mflist.isvalid()
+    assert mflist.idx_map == mflist0.idx_map
+    assert mflist.get_record_names() == mflist0.get_record_names()
+    assert mflist.get_kstpkper() == mflist0.get_kstpkper()
+    inc, cum = mflist.get_budget()
+    inc0, cum0 = mflist0.get_budget()
+    assert np.array_equal(inc, inc0) and np.array_equal(cum, cum0)
+
+    # a budget cache for a different budget key is not used
+    mflist = flopy.utils.SwrListBudget(list_file, cache_data=True)
+    assert not mflist.isvalid()
+    return
+
+
+def test_mflistfile_refresh():
+    pth = os.path.join('..', 'examples', 'data', 'mf6', 'test005_advgw_tidal',
+                       'expected_output')
+    cpth = os.path.join('temp', 't011')
+    if not os.path.isdir(cpth):
+        os.makedirs(cpth)
+    with open(os.path.join(pth, 'AdvGW_tidal.gitlist'), 'rb') as f:
+        data = f.read()
+    mflist0 = flopy.utils.Mf6ListBudget(os.path.join(pth,
+                                                     'AdvGW_tidal.gitlist'))
+    kstpkper0 = mflist0.get_kstpkper()
+    assert len(kstpkper0) > 1
+
+    # write the list file up to the middle of the last budget table
+    list_file = os.path.join(cpth, 'AdvGW_tidal_refresh.list')
+    ipos = mflist0.idx_map[-1][2] + 200
+    with open(list_file, 'wb') as f:
+        f.write(data[:ipos])
+    mflist = flopy.utils.Mf6ListBudget(list_file)
+    complete = list(mflist.follow(interval=0., timeout=0.))
+    assert complete == kstpkper0
+    assert np.isnan(mflist.get_times()[-1])
+
+    # the incomplete budget table is read again until it is complete
+    assert mflist.refresh() == kstpkper0[-1:]
+    with open(list_file, 'ab') as f:
+        f.write(data[ipos:])
+    assert mflist.refresh() == kstpkper0[-1:]
+    assert mflist.refresh() == []
+    assert mflist.idx_map == mflist0.idx_map
+    inc, cum = mflist.get_budget()
+    inc0, cum0 = mflist0.get_budget()
+    assert np.array_equal(inc, inc0) and np.array_equal(cum, cum0)
+    return
+
+
 def test_mflist_reducedpumping():
     '''
     test reading reduced pumping data from list file
@@ -103,6 +169,8 @@ def test_mflist_reducedpumping_fail():
 
 if __name__ == '__main__':
     test_mflistfile()
+    test_mflistfile_cache()
+    test_mflistfile_refresh()
     test_mflist_reducedpumping()
     test_mflist_reducedpumping_fail()
     test_mf6listfile()
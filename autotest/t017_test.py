@@ -1,6 +1,8 @@
 # Test binary and formatted data readers
 import os
 import shutil
+import threading
+import weakref
 import numpy as np
 import flopy
 from nose.tools import assert_raises
@@ -48,6 +50,42 @@ def test_formattedfile_read():
     return
 
 
+def test_formattedfile_wrapped_rows():
+    # write a formatted head file with rows that wrap over several lines
+    nlay, nrow, ncol, ntimes = 2, 6, 23, 3
+    a = np.arange(ntimes * nlay * nrow * ncol, dtype=np.float32)
+    a = a.reshape(ntimes, nlay, nrow, ncol) / 7.
+    fname = os.path.join(cpth, 'wrapped.fhd')
+    with open(fname, 'w') as f:
+        for n in range(ntimes):
+            for k in range(nlay):
+                f.write('{:6d}{:5d}{:15.6E}{:15.6E}{:>16s}{:6d}{:6d}{:6d}'
+                        ' (10E12.4)\n'.format(n + 1, 1, n + 1., n + 1.,
+                                               'HEAD', ncol, nrow, k + 1))
+                for i in range(nrow):
+                    for j in range(0, ncol, 10):
+                        f.write(''.join('{:12.4E}'.format(v)
+                                        for v in a[n, k, i, j:j + 10]))
+                        f.write('\n')
+    a = np.array([[[[float('{:12.4E}'.format(v)) for v in row]
+                    for row in layer] for layer in t] for t in a],
+                 dtype=np.float32)
+
+    h = flopy.utils.FormattedHeadFile(fname)
+    assert np.array_equal(h.get_alldata(), a)
+    cells = [(0, 0, 0), (1, 5, 22), (0, 3, 10), (1, 2, 9), (0, 3, 19)]
+    ts = h.get_ts(cells)
+    assert np.array_equal(ts[:, 0], [1., 2., 3.])
+    for istat, (k, i, j) in enumerate(cells, 1):
+        assert np.array_equal(ts[:, istat], a[:, k, i, j])
+    cells = [(k, i, j) for k in range(nlay) for i in range(nrow)
+             for j in range(ncol)]
+    ts = h.get_ts(cells)
+    assert np.array_equal(ts[:, 1:].reshape(a.shape), a)
+    h.close()
+    return
+
+
 def test_binaryfile_read():
 
     h = flopy.utils.HeadFile(
@@ -99,6 +137,464 @@ def test_binaryfile_read_context():
     assert str(e.exception) == 'seek of closed file', str(e.exception)
 
 
+def test_binaryfile_read_mmap():
+    hds_path = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                            'test005_advgw_tidal', 'expected_output',
+                            'AdvGW_tidal.hds')
+    h = flopy.utils.HeadFile(hds_path)
+    hm = flopy.utils.HeadFile(hds_path, mmap=True)
+    assert hm._mmapdata is not None, 'structured memory map not created'
+
+    times = h.get_times()
+    for totim in (times[0], times[-1]):
+        assert np.array_equal(h.get_data(totim=totim),
+                              hm.get_data(totim=totim)), \
+            'memory-mapped head != head read for totim {}'.format(totim)
+    assert np.array_equal(h.get_data(mflay=2), hm.get_data(mflay=2))
+
+    # data returned from a memory-mapped file are read-only views
+    with assert_raises(ValueError):
+        hm.get_data()[0, 0, 0] = 0.
+
+    assert np.array_equal(h.get_alldata(), hm.get_alldata()), \
+        'memory-mapped get_alldata() != get_alldata()'
+    assert np.array_equal(h.get_alldata(mflay=1), hm.get_alldata(mflay=1))
+
+    idx = [(0, 0, 0), (2, 14, 9), (1, 7, 5)]
+    assert np.array_equal(h.get_ts(idx), hm.get_ts(idx)), \
+        'memory-mapped get_ts() != get_ts()'
+    h.close()
+    hm.close()
+    return
+
+
+def test_binaryfile_get_ts_many_cells():
+    hds_path = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                            'test005_advgw_tidal', 'expected_output',
+                            'AdvGW_tidal.hds')
+    h = flopy.utils.HeadFile(hds_path)
+    alldata = h.get_alldata(nodata=np.inf)
+    idx = [(k, i, j) for k in range(h.nlay) for i in range(h.nrow)
+           for j in range(0, h.ncol, 3)]
+    ts = h.get_ts(idx)
+    assert ts.shape == (len(h.get_times()), len(idx) + 1)
+    assert np.array_equal(ts[:, 0], h.get_times())
+    for istat, (k, i, j) in enumerate(idx, start=1):
+        assert np.array_equal(ts[:, istat], alldata[:, k, i, j]), \
+            'time series for cell {} is not correct'.format((k, i, j))
+    h.close()
+    return
+
+
+def test_binaryfile_index_cache():
+    hds_path = os.path.join(cpth, 'AdvGW_tidal.hds')
+    shutil.copy(os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                             'test005_advgw_tidal', 'expected_output',
+                             'AdvGW_tidal.hds'), hds_path)
+    cbc_path = os.path.join(cpth, 'mnw1.gitcbc')
+    shutil.copy(os.path.join('..', 'examples', 'data', 'mf2005_test',
+                             'mnw1.gitcbc'), cbc_path)
+
+    for cls, fpth in ((flopy.utils.HeadFile, hds_path),
+                      (flopy.utils.CellBudgetFile, cbc_path)):
+        idx_path = fpth + '.flopyidx'
+        v0 = cls(fpth)
+        assert not os.path.isfile(idx_path), 'index cache written by default'
+        v1 = cls(fpth, cache_index=True)
+        assert os.path.isfile(idx_path), 'index cache was not written'
+        # index is read from the index cache file
+        v2 = cls(fpth, cache_index=True)
+        for v in (v1, v2):
+            assert np.array_equal(v0.recordarray, v.recordarray)
+            assert np.array_equal(v0.iposarray, v.iposarray)
+            assert v0.get_times() == v.get_times()
+            assert v0.get_kstpkper() == v.get_kstpkper()
+            assert v0.nlay == v.nlay
+        if isinstance(v2, flopy.utils.CellBudgetFile):
+            assert v0.get_unique_record_names() == \
+                   v2.get_unique_record_names()
+            for t0, t2 in zip(v0.get_data(text='DRAINS'),
+                              v2.get_data(text='DRAINS')):
+                assert np.array_equal(t0, t2)
+        else:
+            assert np.array_equal(v0.get_alldata(), v2.get_alldata())
+
+        # a changed modification time invalidates the index cache
+        os.remove(idx_path)
+        v1 = cls(fpth, cache_index=True)
+        stat = os.stat(fpth)
+        os.utime(fpth, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with open(idx_path, 'r+b') as f:
+            f.truncate(16)
+        v2 = cls(fpth, cache_index=True)
+        assert np.array_equal(v0.recordarray, v2.recordarray)
+        assert os.path.getsize(idx_path) > 16, 'index cache was not rebuilt'
+        for v in (v0, v1, v2):
+            v.close()
+    return
+
+
+def test_binaryfile_refresh():
+    # simulate a running model by writing the file in chunks that end
+    # within records
+    files = ((flopy.utils.HeadFile,
+              os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                           'test005_advgw_tidal', 'expected_output',
+                           'AdvGW_tidal.hds')),
+             (flopy.utils.CellBudgetFile,
+              os.path.join('..', 'examples', 'data', 'mf6-freyberg',
+                           'freyberg.cbc')),
+             (flopy.utils.CellBudgetFile,
+              os.path.join('..', 'examples', 'data', 'mf2005_test',
+                           'test1tr.gitcbc')))
+    for cls, src in files:
+        with open(src, 'rb') as f:
+            data = f.read()
+        v0 = cls(src)
+        precision = 'double' if v0.realtype == np.float64 else 'single'
+        fpth = os.path.join(cpth, 'growing_' + os.path.basename(src))
+        chunk = len(data) // 7 + 13
+        with open(fpth, 'wb') as f:
+            f.write(data[:chunk])
+            f.flush()
+            v = cls(fpth, precision=precision)
+            assert len(v.recordarray) < len(v0.recordarray)
+            nkeys = len(v.get_times() if cls is flopy.utils.HeadFile
+                        else v.get_kstpkper())
+            for i0 in range(chunk, len(data), chunk):
+                f.write(data[i0:i0 + chunk])
+                f.flush()
+                nkeys += len(v.refresh())
+            assert v.totalbytes == len(data)
+        if cls is flopy.utils.HeadFile:
+            assert nkeys == len(v0.get_times())
+            assert v.get_times() == v0.get_times()
+            assert np.array_equal(v.get_alldata(), v0.get_alldata())
+        else:
+            assert nkeys == len(v0.get_kstpkper())
+            assert v.get_kstpkper() == v0.get_kstpkper()
+            assert v.get_unique_record_names() == v0.get_unique_record_names()
+            for idx in range(v0.get_nrecords()):
+                assert str(v.get_record(idx)) == str(v0.get_record(idx))
+            for text in v0.get_unique_record_names():
+                assert np.array_equal(v.get_indices(text),
+                                      v0.get_indices(text))
+        assert np.array_equal(v.recordarray, v0.recordarray)
+        assert np.array_equal(v.iposarray, v0.iposarray)
+
+        # follow yields all of the time steps in the completed file
+        keys = list(v.follow(interval=0.01, timeout=0.05))
+        if cls is flopy.utils.HeadFile:
+            assert keys == v0.get_times()
+        else:
+            assert keys == v0.get_kstpkper()
+        v.close()
+        v0.close()
+    return
+
+
+def test_binaryfile_ensemble():
+    # copies of the same files are an ensemble with identical structure
+    hpth = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                        'test005_advgw_tidal', 'expected_output',
+                        'AdvGW_tidal.hds')
+    cbpth = os.path.join('..', 'examples', 'data', 'mf2005_test',
+                         'test1tr.gitcbc')
+    hfiles, cbfiles = [], []
+    for i in range(3):
+        hfiles.append(os.path.join(cpth, 'ens{}.hds'.format(i)))
+        shutil.copyfile(hpth, hfiles[-1])
+        cbfiles.append(os.path.join(cpth, 'ens{}.cbc'.format(i)))
+        shutil.copyfile(cbpth, cbfiles[-1])
+    h = flopy.utils.HeadFile(hpth)
+    cb = flopy.utils.CellBudgetFile(cbpth)
+    kstpkper = h.get_kstpkper()[-1]
+    text = cb.get_unique_record_names()[1]
+    for pool in ('thread', 'process'):
+        ens = flopy.utils.EnsembleFile(hfiles, pool=pool, max_workers=2)
+        assert ens.get_times() == h.get_times()
+        d = ens.get_data(kstpkper=kstpkper)
+        assert d.shape == (3,) + h.get_data(kstpkper=kstpkper).shape
+        for i in range(3):
+            assert np.array_equal(d[i], h.get_data(kstpkper=kstpkper))
+        assert np.allclose(ens.get_mean(kstpkper=kstpkper),
+                           h.get_data(kstpkper=kstpkper))
+        ts = ens.get_ts([(0, 0, 0), (2, 5, 5)])
+        assert np.array_equal(ts[1], h.get_ts([(0, 0, 0), (2, 5, 5)]))
+        assert np.allclose(ens.get_std(method='get_ts', idx=(0, 0, 0)), 0.)
+        p = ens.get_percentile([10, 90], method='get_ts', idx=(0, 0, 0))
+        assert np.allclose(p[1], h.get_ts((0, 0, 0)))
+
+        ens = flopy.utils.EnsembleFile(cbfiles, pool=pool,
+                                       filetype=flopy.utils.CellBudgetFile)
+        assert ens.get_kstpkper() == cb.get_kstpkper()
+        d = ens.get_data(text=text, full3D=True)
+        assert np.array_equal(d[2], cb.get_data(text=text, full3D=True))
+
+    # the shared record index is checked against the file
+    h.close()
+    with open(hfiles[0], 'wb') as f:
+        f.write(b'\0' * 100)
+    assert_raises(Exception, flopy.utils.HeadFile, hfiles[0],
+                  precision='double', index=h)
+    cb.close()
+    return
+
+
+class _TrackedHeadFile(flopy.utils.HeadFile):
+    """HeadFile that counts the arrays returned by get_data that are still
+    referenced."""
+    lock = threading.Lock()
+    alive = 0
+    max_alive = 0
+
+    @classmethod
+    def _release(cls):
+        with cls.lock:
+            cls.alive -= 1
+
+    def get_data(self, **kwargs):
+        data = super(_TrackedHeadFile, self).get_data(**kwargs)
+        cls = _TrackedHeadFile
+        with cls.lock:
+            cls.alive += 1
+            cls.max_alive = max(cls.max_alive, cls.alive)
+        weakref.finalize(data, cls._release)
+        return data
+
+
+def test_binaryfile_ensemble_memory():
+    # the same file is used for all of the realizations of the ensemble
+    hpth = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                        'test005_advgw_tidal', 'expected_output',
+                        'AdvGW_tidal.hds')
+    h = flopy.utils.HeadFile(hpth)
+    kstpkper = h.get_kstpkper()[-1]
+    nmembers, max_workers = 40, 2
+    ens = flopy.utils.EnsembleFile([hpth] * nmembers, pool='thread',
+                                   max_workers=max_workers,
+                                   filetype=_TrackedHeadFile)
+    _TrackedHeadFile.alive = _TrackedHeadFile.max_alive = 0
+    mean = ens.get_mean(kstpkper=kstpkper)
+    assert np.allclose(mean, h.get_data(kstpkper=kstpkper))
+    assert np.allclose(ens.get_std(kstpkper=kstpkper), 0.)
+    # only the results of the submitted tasks are held in memory
+    assert 0 < _TrackedHeadFile.max_alive <= 2 * max_workers + 1, \
+        '{} results held at once'.format(_TrackedHeadFile.max_alive)
+    assert _TrackedHeadFile.alive == 0
+    h.close()
+    return
+
+
+def test_binaryfile_reductions():
+    fpth = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                        'test005_advgw_tidal', 'expected_output',
+                        'AdvGW_tidal.hds')
+    h = flopy.utils.HeadFile(fpth)
+    a = h.get_alldata()
+    times = np.array(h.get_times())
+
+    # chunks of the data in the file
+    data = [d for t, d in h.iter_data(chunk=7)]
+    assert np.array_equal(np.concatenate(data), a, equal_nan=True)
+    t, d = next(h.iter_data(chunk=7, mflay=1))
+    assert np.array_equal(t, times[:7])
+    assert np.array_equal(d, a[:7, 1], equal_nan=True)
+
+    # reductions over time
+    for chunk in (1, 50):
+        assert np.allclose(h.get_min(chunk=chunk), np.nanmin(a, axis=0))
+        assert np.allclose(h.get_max(chunk=chunk), np.nanmax(a, axis=0))
+        assert np.allclose(h.get_mean(chunk=chunk), np.nanmean(a, axis=0))
+        assert np.allclose(h.get_max(mflay=2, chunk=chunk),
+                           np.nanmax(a[:, 2], axis=0))
+        tmax = times[np.argmax(a, axis=0)]
+        assert np.allclose(h.get_time_of_max(chunk=chunk), tmax)
+        value = np.median(a)
+        exceeds = a > value
+        tfirst = np.where(exceeds.any(axis=0),
+                          times[np.argmax(exceeds, axis=0)], np.nan)
+        assert np.allclose(h.get_first_exceedance(value, chunk=chunk),
+                           tfirst, equal_nan=True)
+    assert np.allclose(h.get_percentile([10, 90]),
+                       np.percentile(a, [10, 90], axis=0))
+    assert np.allclose(h.get_percentile(50, mflay=0),
+                       np.percentile(a[:, 0], 50, axis=0))
+    h.close()
+
+    # unstructured head files return a list of arrays for each layer
+    fpth = os.path.join('..', 'examples', 'data', 'unstructured',
+                        'headu.githds')
+    h = flopy.utils.HeadUFile(fpth)
+    hmax = h.get_max()
+    assert len(hmax) == h.nlay
+    for k in range(h.nlay):
+        a = np.array([h.get_data(totim=t)[k] for t in h.get_times()])
+        assert np.allclose(hmax[k], a.max(axis=0))
+        assert np.allclose(h.get_max(mflay=k), a.max(axis=0))
+
+    # reductions without any times raise an error
+    h.times = []
+    assert list(h.iter_data()) == []
+    for reduction in (h.get_min, h.get_max, h.get_mean, h.get_percentile,
+                      h.get_time_of_max, h.get_first_exceedance):
+        args = (50,) if reduction == h.get_percentile else ()
+        if reduction == h.get_first_exceedance:
+            args = (0.,)
+        with assert_raises(Exception) as e:
+            reduction(*args)
+        assert 'no times found' in str(e.exception)
+    h.close()
+    return
+
+
+def test_cellbudgetfile_get_node_ts():
+    fpth = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                        'test028_sfr', 'expected_output', 'test1tr.cbc')
+    modelgrid = flopy.discretization.StructuredGrid(
+        delc=np.ones(15), delr=np.ones(10), nlay=1)
+    cbc = flopy.utils.CellBudgetFile(fpth, modelgrid=modelgrid)
+    kstpkper = cbc.get_kstpkper()
+    for text in ('WEL', 'SFR'):
+        nodes = np.unique(cbc.get_data(text=text)[0]['node'])
+        nodes = np.append(nodes, 1)
+        ts = cbc.get_node_ts(nodes.tolist(), text=text)
+        assert ts.shape == (len(kstpkper), len(nodes) + 1)
+        assert np.allclose(ts[:, 0], cbc.get_times())
+        for itim, k in enumerate(kstpkper):
+            rec = cbc.get_data(kstpkper=k, text=text)
+            for istat, node in enumerate(nodes):
+                q = rec[0]['q'][rec[0]['node'] == node]
+                if len(q) == 0:
+                    assert np.isnan(ts[itim, istat + 1])
+                else:
+                    assert np.allclose(ts[itim, istat + 1], q.sum())
+
+        # get_ts for cells gives the same values
+        kijlist = [(0, (node - 1) // 10, (node - 1) % 10) for node in nodes]
+        assert np.allclose(cbc.get_ts(kijlist, text=text), ts,
+                           equal_nan=True)
+
+    # reach numbers are in the node2 column of the model budget file
+    ts = cbc.get_node_ts(3, text='SFR', node2=True)
+    for itim, k in enumerate(kstpkper):
+        rec = cbc.get_data(kstpkper=k, text='SFR')[0]
+        assert np.allclose(ts[itim, 1], rec['q'][rec['node2'] == 3].sum())
+    cbc.close()
+    return
+
+
+def test_cellbudgetfile_record_lookups():
+    fpth = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                        'test028_sfr', 'expected_output', 'test1tr.cbc')
+    cbc = flopy.utils.CellBudgetFile(fpth)
+    recordarray = cbc.recordarray
+    for text in cbc.get_unique_record_names():
+        idx = np.where(recordarray['text'] == text)[0]
+        assert np.array_equal(cbc.get_indices(text=text), idx)
+        assert len(cbc.get_data(text=text)) == len(idx)
+        for kstp, kper in cbc.get_kstpkper()[::5]:
+            idx = np.where((recordarray['text'] == text) &
+                           (recordarray['kstp'] == kstp + 1) &
+                           (recordarray['kper'] == kper + 1))[0]
+            data = cbc.get_data(kstpkper=(kstp, kper), text=text)
+            assert len(data) == len(idx)
+            for d, i in zip(data, idx):
+                assert str(d) == str(cbc.get_record(i))
+    paknam = cbc.get_unique_package_names()[-1]
+    data = cbc.get_data(kstpkper=(0, 0), paknam=paknam)
+    assert len(data) == np.sum((recordarray['paknam'] == paknam) &
+                               (recordarray['kstp'] == 1) &
+                               (recordarray['kper'] == 1))
+    assert cbc.get_data(kstpkper=(100, 100), text='WEL') == []
+    cbc.close()
+    return
+
+
+def test_binaryfile_writers():
+    # head file round trip
+    fpth = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                        'test005_advgw_tidal', 'expected_output',
+                        'AdvGW_tidal.hds')
+    h = flopy.utils.HeadFile(fpth)
+    times = h.get_times()
+    pertim = [h.recordarray['pertim'][h.recordarray['totim'] == t][0]
+              for t in times]
+    for precision in ('single', 'double'):
+        opth = os.path.join(cpth, 'writer_{}.hds'.format(precision))
+        with flopy.utils.HeadFileWriter(opth, precision=precision) as f:
+            f.write_alldata((h.get_data(totim=t) for t in times),
+                            h.get_kstpkper(), pertim, times)
+        h2 = flopy.utils.HeadFile(opth, precision=precision)
+        assert np.allclose(h2.get_times(), times)
+        assert h2.get_kstpkper() == h.get_kstpkper()
+        assert np.allclose(h2.get_alldata(), h.get_alldata())
+        h2.close()
+    h.close()
+
+    # time steps are written with their own totim
+    fpth = os.path.join('..', 'examples', 'data', 'mp6', 'EXAMPLE.HED')
+    h = flopy.utils.HeadFile(fpth)
+    opth = os.path.join(cpth, 'writer_totim.hds')
+    with flopy.utils.HeadFileWriter(opth) as f:
+        for t, (kstp, kper) in zip(h.get_times(), h.get_kstpkper()):
+            f.write_data(h.get_data(totim=t), kstp + 1, kper + 1, totim=t)
+    h2 = flopy.utils.HeadFile(opth)
+    assert h2.get_kstpkper() == h.get_kstpkper()
+    assert np.allclose(h2.get_times(), h.get_times())
+    assert h2.get_alldata().shape == (12, 5, 25, 25)
+    assert np.allclose(h2.get_alldata(), h.get_alldata())
+    h2.close()
+    d = h.get_data(idx=0)
+    h.close()
+    with flopy.utils.HeadFileWriter(opth) as f:
+        f.write_data(d, 1, 1)
+        with assert_raises(Exception):
+            f.write_data(d, 2, 1)
+        f.write_data(d, 2, 1, totim=2.)
+        with assert_raises(Exception):
+            f.write_data(d, 3, 1, totim=1.)
+    h2 = flopy.utils.HeadFile(opth)
+    assert h2.get_kstpkper() == [(0, 0), (1, 0)]
+    h2.close()
+
+    # budget file round trip with array and list records
+    for fpth in (os.path.join('..', 'examples', 'data', 'mf2005_test',
+                              'test1tr.gitcbc'),
+                 os.path.join('..', 'examples', 'data', 'mf6',
+                              'create_tests', 'test028_sfr',
+                              'expected_output', 'test1tr.cbc')):
+        cbc = flopy.utils.CellBudgetFile(fpth)
+        precision = 'double' if cbc.realtype == np.float64 else 'single'
+        opth = os.path.join(cpth, 'writer.cbc')
+        shape = (cbc.nlay, cbc.nrow, cbc.ncol)
+        with flopy.utils.CellBudgetFileWriter(opth, shape,
+                                              precision=precision) as f:
+            for idx, h in enumerate(cbc.recordarray):
+                args = (h['text'], h['kstp'], h['kper'], h['delt'],
+                        h['pertim'], h['totim'])
+                if h['imeth'] in (0, 1):
+                    f.write_array(cbc.get_record(idx), *args,
+                                  compact=h['imeth'] == 1)
+                elif h['imeth'] == 3:
+                    layer, data = cbc.get_record(idx)
+                    f.write_layer(data, *args, layer=layer)
+                elif h['imeth'] == 4:
+                    f.write_layer(cbc.get_record(idx), *args)
+                else:
+                    names = [h[name].decode() for name in
+                             ('modelnam', 'paknam', 'modelnam2', 'paknam2')]
+                    f.write_list(cbc.get_record(idx), *args, *names,
+                                 imeth=h['imeth'])
+        with open(fpth, 'rb') as f1, open(opth, 'rb') as f2:
+            assert f1.read() == f2.read()
+        cbc2 = flopy.utils.CellBudgetFile(opth, precision=precision)
+        assert np.array_equal(cbc2.recordarray, cbc.recordarray)
+        cbc2.close()
+        cbc.close()
+    return
+
+
 def test_cellbudgetfile_read_context():
     cbc_path = os.path.join(
             '..', 'examples', 'data', 'mf2005_test', 'mnw1.gitcbc')
@@ -360,9 +856,20 @@ def test_binaryfile_writeread():
 
 
 if __name__ == '__main__':
+    test_binaryfile_read_mmap()
+    test_binaryfile_get_ts_many_cells()
+    test_binaryfile_index_cache()
+    test_binaryfile_refresh()
+    test_binaryfile_ensemble()
+    test_binaryfile_ensemble_memory()
+    test_binaryfile_reductions()
+    test_cellbudgetfile_get_node_ts()
+    test_cellbudgetfile_record_lookups()
     test_cellbudgetfile_position()
     test_binaryfile_writeread()
+    test_binaryfile_writers()
     test_formattedfile_read()
+    test_formattedfile_wrapped_rows()
     test_binaryfile_read()
     test_cellbudgetfile_read()
     test_cellbudgetfile_readrecord()
@@ -212,8 +212,82 @@ def test_mf6obsfile_read():
     return
 
 
+def test_mf6obsfile_csv():
+    import os
+    import flopy
+    from flopy.mf6.utils.mfobservation import Observations
+
+    pth = os.path.join('..', 'examples', 'data', 'mf6', 'test045_lake2tr',
+                       'obstest.lak.csv')
+    h = flopy.utils.Mf6Obs(pth, isBinary=False)
+    with open(pth) as f:
+        labels = f.readline().strip().split(',')[1:]
+    ref = np.loadtxt(pth, delimiter=',', skiprows=1, ndmin=2)
+    assert h.get_obsnames() == labels
+    assert h.get_times() == ref[:, 0].tolist()
+    for idx, label in enumerate(labels):
+        assert np.array_equal(h.get_data(obsname=label)[label],
+                              ref[:, idx + 1])
+
+    # the mf6 observation utility returns the same values
+    obs = Observations(pth)
+    assert obs.get_times() == ref[:, 0].tolist()
+    assert obs.get_nrecords() == len(labels) + 1
+    assert obs.get_data(key=labels[3]) == ref[:, 4].tolist()
+    assert obs.get_data(key=labels[3], idx=2) == ref[2, 4]
+    data = obs.get_data()
+    assert data.shape == (ref.shape[0] + 1, ref.shape[1])
+    assert data[0, 1] == labels[0]
+    assert float(data[3, 2]) == ref[2, 2]
+    return
+
+
+def test_hydmodfile_mmap():
+    import os
+    import flopy
+
+    pth = os.path.join('..', 'examples', 'data', 'hydmod_test',
+                       'test1tr.hyd.gitbin')
+    h0 = flopy.utils.HydmodObs(pth)
+    h = flopy.utils.HydmodObs(pth, mmap=True)
+    assert isinstance(h.data, np.memmap)
+    assert h.get_times() == h0.get_times()
+    assert h.get_obsnames() == h0.get_obsnames()
+    assert np.array_equal(h.get_data(), h0.get_data())
+
+    # select observations and a range of times
+    labels = h.get_obsnames()
+    times = h.get_times()
+    names = [labels[2], labels[0]]
+    data = h.get_data(obsname=names, totim_range=(times[10], times[20]))
+    assert data.dtype.names == ('totim', labels[0], labels[2])
+    assert data.shape == (11,)
+    assert np.array_equal(data['totim'], times[10:21])
+    for name in names:
+        assert np.array_equal(data[name], h0.get_data()[name][10:21])
+    data = h.get_data(obsname=labels[1], totim_range=(None, times[4]))
+    assert data.shape == (5,)
+    assert h.get_data(obsname=[labels[0], 'not an obs']) is None
+    assert names == [labels[2], labels[0]]
+
+    try:
+        import pandas as pd
+    except:
+        print('pandas not available...')
+        return
+    df = h.get_dataframe(obsname=names, totim_range=(times[10], None),
+                         start_datetime=None)
+    assert list(df.columns) == ['totim'] + names
+    assert df.shape == (len(times) - 10, 3)
+    assert np.array_equal(df.index, times[10:])
+    assert np.array_equal(df[labels[2]], h0.get_data()[labels[2]][10:])
+    return
+
+
 if __name__ == '__main__':
     test_mf6obsfile_read()
+    test_mf6obsfile_csv()
     test_hydmodfile_create()
     test_hydmodfile_load()
     test_hydmodfile_read()
+    test_hydmodfile_mmap()
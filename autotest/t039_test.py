@@ -4,7 +4,7 @@ Test zonbud utility
 import os
 import numpy as np
 from flopy.utils import CellBudgetFile, ZoneBudget, \
-    MfListBudget, read_zbarray, write_zbarray
+    MfListBudget, MfGrdFile, read_zbarray, write_zbarray, zone_budgets
 
 loadpth = os.path.join('..', 'examples', 'data', 'zonbud_examples')
 outpth = os.path.join('temp', 't039')
@@ -335,6 +335,134 @@ def test_zonebudget_output_to_netcdf():
     output_helper(os.path.join(outpth, ncf_name), ml, export_dict)
 
 
+def test_zonbud_pool():
+    # compare budgets computed serially and by pools of threads and
+    # processes for a model with constant head cells and lower face flows
+    cbc_fname = os.path.join('..', 'examples', 'data', 'mp6', 'EXAMPLE.BUD')
+    cbc = CellBudgetFile(cbc_fname)
+    zon = np.ones((cbc.nlay, cbc.nrow, cbc.ncol), dtype=int)
+    zon[:, :, 12:] = 2
+    zon[2:, :, :] += 2
+    zb = ZoneBudget(cbc, zon)
+    bud = zb.get_budget()
+    assert bud.shape[0] == len(cbc.get_kstpkper()) * \
+        len(zb.get_record_names())
+    for pool in ['thread', 'process']:
+        zbp = ZoneBudget(cbc_fname, zon, pool=pool, max_workers=2)
+        budp = zbp.get_budget()
+        assert np.array_equal(budp['name'], bud['name'])
+        for name in zb._zonenamedict.values():
+            assert np.array_equal(budp[name], bud[name]), name
+    return
+
+
+def test_zonbud_many_zones():
+    # flows between many zones are consistent with the flows between
+    # groups of these zones
+    cbc_fname = os.path.join('..', 'examples', 'data', 'mp6', 'EXAMPLE.BUD')
+    cbc = CellBudgetFile(cbc_fname)
+    kstpkper = cbc.get_kstpkper()[-1]
+    zon = np.arange(cbc.nrow * cbc.ncol).reshape(cbc.nrow, cbc.ncol)
+    zon = zon // 4 + 1
+    zong = (zon - 1) // 10 + 1
+    zb = ZoneBudget(cbc, zon, kstpkper=kstpkper)
+    zbg = ZoneBudget(cbc, zong, kstpkper=kstpkper)
+    nz, nzg = zon.max(), zong.max()
+    assert len(zb.allzones) == nz
+
+    def flow_matrix(z, prefix):
+        bud = z.get_budget()
+        names = list(z._zonenamedict.values())
+        rows = [np.flatnonzero(bud['name'] == prefix + n)[0] for n in names]
+        return np.array([[bud[n][i] for n in names] for i in rows])
+
+    # flow from zone a to zone b is in FROM_ZONE_a and TO_ZONE_b
+    fm = flow_matrix(zb, 'FROM_')
+    assert np.array_equal(fm, flow_matrix(zb, 'TO_').T)
+    assert np.all(np.diag(fm) == 0.)
+
+    # sum the flows between zones in different groups
+    g = np.arange(nz) // 10
+    fmg = np.zeros((nzg, nzg))
+    np.add.at(fmg, (g[:, None], g[None, :]), fm)
+    fmg[np.diag_indices(nzg)] = 0.
+    assert np.allclose(fmg, flow_matrix(zbg, 'FROM_'), rtol=1e-5,
+                       atol=1e-3)
+    return
+
+
+def test_zonbud_mf6_grb():
+    # zone budgets of MODFLOW 6 DIS, DISV and DISU models computed from
+    # FLOW-JA-FACE and the binary grid file are balanced in each zone
+    pth = os.path.join('..', 'examples', 'data')
+    models = [(os.path.join(pth, 'mf6-freyberg', 'freyberg.cbc'),
+               os.path.join(pth, 'mf6-freyberg', 'freyberg.dis.grb')),
+              (os.path.join(pth, 'mf6', 'test003_gwftri_disv',
+                            'tri_model.cbc'),
+               os.path.join(pth, 'mf6', 'test003_gwftri_disv',
+                            'tri_model.disv.grb')),
+              (os.path.join(pth, 'mf6', 'test006_gwf3', 'expected_output',
+                            'flow_adj.cbc'),
+               os.path.join(pth, 'mfgrd_test', 'flow.disu.grb'))]
+    for cbc_fname, grb_fname in models:
+        cbc = CellBudgetFile(cbc_fname, precision='double')
+        grb = MfGrdFile(grb_fname)
+        nodes = grb._datadict['IA'].size - 1
+        zon = np.arange(nodes) % 5
+        zb = ZoneBudget(cbc, zon, grb_file=grb)
+        bud = zb.get_budget()
+        totin = bud[bud['name'] == 'TOTAL_IN']
+        inout = bud[bud['name'] == 'IN-OUT']
+        for z in range(1, 5):
+            name = 'ZONE_{}'.format(z)
+            assert totin[name][0] > 0., name
+            assert inout[name][0] < 1e-4 * totin[name][0], name
+        assert 'FROM_ZONE_0' in zb.get_record_names()
+        assert not np.any([n.startswith('FROM_DATA')
+                           for n in zb.get_record_names()])
+    return
+
+
+def test_zone_budgets():
+    # budgets of several zone arrays are computed with a single pass over
+    # the cell budget file records
+    cbc_fname = os.path.join('..', 'examples', 'data', 'mp6', 'EXAMPLE.BUD')
+    cbc = CellBudgetFile(cbc_fname)
+    zon = np.ones((cbc.nlay, cbc.nrow, cbc.ncol), dtype=int)
+    zones = {'cols': zon.copy(), 'layers': zon.copy(), 'rows': zon.copy()}
+    zones['cols'][:, :, 12:] = 2
+    zones['layers'][2:, :, :] = 0
+    zones['rows'][:, ::2, :] = 3
+
+    # count the records that are read
+    texts = []
+    get_data = cbc.get_data
+
+    def counting_get_data(*args, **kwargs):
+        if kwargs.get('text') is not None:
+            texts.append(kwargs['text'])
+        return get_data(*args, **kwargs)
+
+    cbc.get_data = counting_get_data
+    zbs = zone_budgets(cbc, zones)
+    nread = len(texts)
+    del texts[:]
+    ZoneBudget(cbc, zones['cols'])
+    assert nread == len(texts)
+
+    for key, z in zones.items():
+        bud = ZoneBudget(cbc_fname, z).get_budget()
+        budz = zbs[key].get_budget()
+        assert np.array_equal(budz['name'], bud['name'])
+        for name in zbs[key]._zonenamedict.values():
+            assert np.allclose(budz[name], bud[name], equal_nan=True), name
+
+    zbs = zone_budgets(cbc_fname, list(zones.values()), pool='thread',
+                       max_workers=2)
+    assert len(zbs) == len(zones)
+    return
+
+
 def test_zonbud_active_areas_zone_zero(rtol=1e-2):
     try:
         import pandas as pd
@@ -383,3 +511,7 @@ if __name__ == '__main__':
     test_get_model_shape()
     test_zonebudget_output_to_netcdf()
     test_zonbud_active_areas_zone_zero()
+    test_zonbud_pool()
+    test_zonbud_many_zones()
+    test_zonbud_mf6_grb()
+    test_zone_budgets()
@@ -2,12 +2,15 @@
 Test postprocessing utilities
 """
 
+import os
 import sys
 sys.path.append('/Users/aleaf/Documents/GitHub/flopy3')
 import numpy as np
 import flopy
 from flopy.utils.postprocessing import get_transmissivities, get_water_table, \
-    get_gradients, get_saturated_thickness
+    get_gradients, get_saturated_thickness, get_extended_budget, \
+    get_specific_discharge, get_extended_budget_batch, \
+    get_specific_discharge_batch
 
 mf = flopy.modflow
 
@@ -95,7 +98,154 @@ def test_get_sat_thickness_gradients():
     sat_thick = get_saturated_thickness(hds, m, nodata)
     assert np.abs(np.sum(sat_thick[:, 1, 1] - np.array([0.2, 1., 1.]))) < 1e-6
 
+
+def test_get_specific_discharge_batch():
+    model_ws = os.path.join('..', 'examples', 'data', 'mp6')
+    m = mf.Modflow.load('EXAMPLE.nam', model_ws=model_ws, check=False)
+    cbcfile = os.path.join(model_ws, 'EXAMPLE.BUD')
+    hdsfile = os.path.join(model_ws, 'EXAMPLE.HED')
+    boundary_ifaces = {'RIVER LEAKAGE': 6,
+                       'WELLS': [[0, 5, 5, -1., 5], [2, 10, 10, -3., 2],
+                                 [2, 10, 10, -1., 2]]}
+    kstpkper = flopy.utils.CellBudgetFile(cbcfile).get_kstpkper()
+    kstpkper = kstpkper[:2] + kstpkper[-1:]
+    idomain = m.modelgrid._idomain.copy()
+
+    # extended budget written into memory-mapped arrays
+    cpth = os.path.join('temp', 't042')
+    if not os.path.isdir(cpth):
+        os.makedirs(cpth)
+    nlay, nrow, ncol = m.nlay, m.nrow, m.ncol
+    shapes = [(nlay, nrow, ncol + 1), (nlay, nrow + 1, ncol),
+              (nlay + 1, nrow, ncol)]
+    out = tuple(np.lib.format.open_memmap(
+        os.path.join(cpth, 'Q{}.npy'.format(i)), mode='w+',
+        dtype=np.float32, shape=(len(kstpkper),) + shape)
+        for i, shape in enumerate(shapes))
+    Q_ext = get_extended_budget_batch(cbcfile, kstpkper=kstpkper,
+                                      boundary_ifaces=boundary_ifaces,
+                                      hdsfile=hdsfile, model=m, out=out)
+    assert all(a is b for a, b in zip(Q_ext, out))
+    for n, kk in enumerate(kstpkper):
+        Q = get_extended_budget(cbcfile, kstpkper=kk,
+                                boundary_ifaces=boundary_ifaces,
+                                hdsfile=hdsfile, model=m)
+        for a, b in zip(Q, Q_ext):
+            assert np.allclose(a, b[n])
+
+    # specific discharge with and without heads
+    for hds, position in [(None, 'centers'), (hdsfile, 'centers'),
+                          (None, 'faces'), (hdsfile, 'faces')]:
+        bi = None if hds is None else boundary_ifaces
+        qb = get_specific_discharge_batch(m, cbcfile, kstpkper=kstpkper,
+                                          boundary_ifaces=bi, hdsfile=hds,
+                                          position=position,
+                                          dtype=np.float64)
+        assert np.array_equal(m.modelgrid._idomain, idomain)
+        for n, kk in enumerate(kstpkper):
+            q = get_specific_discharge(m, cbcfile, kstpkper=kk,
+                                       boundary_ifaces=bi, hdsfile=hds,
+                                       position=position)
+            m.modelgrid._idomain[:] = idomain
+            for a, b in zip(q, qb):
+                assert a.shape == b[n].shape
+                assert np.allclose(a, b[n], equal_nan=True)
+    return
+
+
+def _get_extended_budget_reference(cbcfile, hdsfile, m, boundary_ifaces,
+                                   kstpkper):
+    """Cell by cell reference for the boundary_ifaces rules."""
+    cbf = flopy.utils.CellBudgetFile(cbcfile)
+    head = flopy.utils.HeadFile(hdsfile).get_data(kstpkper=kstpkper)
+    nlay, nrow, ncol = m.nlay, m.nrow, m.ncol
+    Qx = np.zeros((nlay, nrow, ncol + 1))
+    Qy = np.zeros((nlay, nrow + 1, ncol))
+    Qz = np.zeros((nlay + 1, nrow, ncol))
+    Qx[:, :, 1:] = cbf.get_data(kstpkper=kstpkper, text='FLOW RIGHT FACE')[0]
+    Qy[:, 1:, :] = -cbf.get_data(kstpkper=kstpkper, text='FLOW FRONT FACE')[0]
+    Qz[1:, :, :] = -cbf.get_data(kstpkper=kstpkper, text='FLOW LOWER FACE')[0]
+    inactive = (head == m.hnoflo) | (head == m.hdry)
+    for term, iface_info in boundary_ifaces.items():
+        q = cbf.get_data(kstpkper=kstpkper, text=term, full3D=True)[0]
+        q = np.ma.filled(q, 0.)
+        if isinstance(iface_info, int):
+            faces = {1: (Qx[:, :, :-1], 1.), 2: (Qx[:, :, 1:], -1.),
+                     3: (Qy[:, 1:, :], 1.), 4: (Qy[:, :-1, :], -1.),
+                     5: (Qz[1:, :, :], 1.), 6: (Qz[:-1, :, :], -1.)}
+            Q, sign = faces[iface_info]
+            Q += sign * q
+            continue
+        for cell in iface_info:
+            k, i, j = cell[:3]
+            if inactive[k, i, j]:
+                continue
+            if term == 'WELLS':
+                v = cell[3]
+            elif term == 'RIVER LEAKAGE':
+                v = cell[4] * (cell[3] - max(head[k, i, j], cell[5]))
+            else:
+                v = q[k, i, j]
+            faces = {1: (Qx, (k, i, j), 1.), 2: (Qx, (k, i, j + 1), -1.),
+                     3: (Qy, (k, i + 1, j), 1.), 4: (Qy, (k, i, j), -1.),
+                     5: (Qz, (k + 1, i, j), 1.), 6: (Qz, (k, i, j), -1.)}
+            Q, idx, sign = faces[cell[-1]]
+            Q[idx] += sign * v
+    return Qx, Qy, Qz
+
+
+def test_get_extended_budget_boundary_ifaces():
+    model_ws = os.path.join('..', 'examples', 'data', 'mp6')
+    m = mf.Modflow.load('EXAMPLE.nam', model_ws=model_ws, check=False)
+    cbcfile = os.path.join(model_ws, 'EXAMPLE.BUD')
+    hdsfile = os.path.join(model_ws, 'EXAMPLE.HED')
+    kstpkper = flopy.utils.CellBudgetFile(cbcfile).get_kstpkper()
+    kstpkper = kstpkper[:2] + kstpkper[-1:]
+
+    # rivers with the stage, conductance and bottom of the package input
+    riv = m.riv.stress_period_data[0]
+    riv_cells = [[r['k'], r['i'], r['j'], r['stage'], r['cond'], r['rbot'],
+                  5 + n % 2] for n, r in enumerate(riv)]
+    ch_cells = [[k, i, j, 1 + n % 4] for n, (k, i, j) in
+                enumerate(np.argwhere(m.bas6.ibound.array < 0))]
+    wells = [[0, 5, 5, -1., 5], [2, 10, 10, -3., 2], [2, 10, 10, -1., 2],
+             [4, 20, 3, -2., 3]]
+    variants = [{'WELLS': wells, 'RIVER LEAKAGE': riv_cells},
+                {'RIVER LEAKAGE': 6, 'WELLS': 2, 'CONSTANT HEAD': 3},
+                {'WELLS': 5, 'CONSTANT HEAD': ch_cells, 'RIVER LEAKAGE': 1},
+                {'WELLS': 4, 'RIVER LEAKAGE': riv_cells}]
+    for boundary_ifaces in variants:
+        Q_batch = get_extended_budget_batch(cbcfile, kstpkper=kstpkper,
+                                            boundary_ifaces=boundary_ifaces,
+                                            hdsfile=hdsfile, model=m)
+        for n, kk in enumerate(kstpkper):
+            Q_ref = _get_extended_budget_reference(cbcfile, hdsfile, m,
+                                                   boundary_ifaces, kk)
+            Q = get_extended_budget(cbcfile, kstpkper=kk,
+                                    boundary_ifaces=boundary_ifaces,
+                                    hdsfile=hdsfile, model=m)
+            for a, b, ref in zip(Q, Q_batch, Q_ref):
+                assert np.allclose(a, ref, rtol=1e-5, atol=1e-3)
+                assert np.allclose(b[n], ref, rtol=1e-5, atol=1e-3)
+
+    # specific discharge at cell centers of fully saturated cells
+    Qx, Qy, Qz = get_extended_budget(cbcfile, kstpkper=kstpkper[-1])
+    delc = m.dis.delc.array.reshape(1, -1, 1)
+    delr = m.dis.delr.array.reshape(1, 1, -1)
+    thickness = m.dis.thickness.array
+    qx, qy, qz = get_specific_discharge(m, cbcfile, kstpkper=kstpkper[-1])
+    assert np.allclose(qx, 0.5 * (Qx[:, :, 1:] + Qx[:, :, :-1]) /
+                       (delc * thickness))
+    assert np.allclose(qy, 0.5 * (Qy[:, 1:, :] + Qy[:, :-1, :]) /
+                       (delr * thickness))
+    assert np.allclose(qz, 0.5 * (Qz[1:, :, :] + Qz[:-1, :, :]) /
+                       (delc * delr))
+    return
+
+
 if __name__ == '__main__':
     #test_get_transmissivities()
     #test_get_water_table()
     test_get_sat_thickness_gradients()
+    test_get_specific_discharge_batch()
+    test_get_extended_budget_boundary_ifaces()
@@ -315,6 +315,136 @@ def test_mp6_timeseries_load():
     return
 
 
+def test_mp7_pathline_load():
+    # write a MODPATH 7 pathline file with pathlines of different lengths
+    fpth = os.path.join(cpth, 'mp7.mppth')
+    npts = [3, 1, 4]
+    with open(fpth, 'w') as f:
+        f.write('MODPATH_PATHLINE_FILE         7         2\n')
+        f.write('         1   0.000000000000000E+00   0.000000000000000E+00'
+                '   0.000000000000000E+00   0.000000000000000E+00\n')
+        f.write('END HEADER\n')
+        for ipart, n in enumerate(npts):
+            f.write('{:10d}{:10d}{:10d}{:10d}\n'.format(ipart + 1, 1,
+                                                      ipart + 11, n))
+            for ipt in range(n):
+                f.write('{:10d}'.format(ipart * 10 + ipt + 1) +
+                        4 * ' {:.15E}'.format(ipt * 10. + ipart) +
+                        3 * ' {:.15E}'.format(0.5) +
+                        '{:10d}{:10d}{:10d}\n'.format(2, 1, 1))
+    pth = flopy.utils.PathlineFile(fpth)
+    assert pth._data.shape[0] == sum(npts)
+    assert np.array_equal(pth.nid, [0, 1, 2])
+    assert pth.get_maxid() == 2
+    assert pth.get_maxtime() == 32.
+    for ipart, n in enumerate(npts):
+        p = pth.get_data(partid=ipart)
+        assert p.shape[0] == n
+        assert np.array_equal(p.time, np.arange(n) * 10. + ipart)
+        assert np.all(p.k == 1) and np.all(p.particleid == ipart)
+        p = pth.get_data(partid=ipart, totim=10.)
+        assert np.all(p.time >= 10.) and p.shape[0] == n - 1
+    p = pth._data[pth._data['particleid'] == 2]
+    assert np.array_equal(p['particleidloc'], [12, 12, 12, 12])
+    assert np.array_equal(p['node'], [20, 21, 22, 23])
+    assert pth.get_data(partid=3).shape[0] == 0
+    return
+
+
+def test_mp7_pathline_alldata():
+    # uses the pathline file written by test_mp7_pathline_load
+    fpth = os.path.join(cpth, 'mp7.mppth')
+    test_mp7_pathline_load()
+    pth = flopy.utils.PathlineFile(fpth)
+    for totim in [None, 10.]:
+        plist = pth.get_alldata(totim=totim)
+        assert len(plist) == 3
+        for ipart, p in enumerate(plist):
+            p0 = pth.get_data(partid=ipart, totim=totim)
+            assert p.dtype == p0.dtype
+            assert np.array_equal(p, p0)
+    plist = pth.get_alldata(totim=20., ge=False)
+    assert [p.shape[0] for p in plist] == [3, 1, 2]
+    plist = pth.get_destination_pathline_data([22])
+    assert len(plist) == 1 and np.all(plist[0].particleid == 2)
+    assert np.array_equal(plist[0], pth.get_data(partid=2))
+    ra = pth.get_destination_pathline_data([2, 22], to_recarray=True)
+    assert np.array_equal(np.unique(ra.particleid), [0, 2])
+    return
+
+
+def test_mp7_pathline_cache():
+    # uses the pathline file written by test_mp7_pathline_load
+    fpth = os.path.join(cpth, 'mp7.mppth')
+    test_mp7_pathline_load()
+    cfpth = fpth + '.flopynpy'
+    if os.path.isfile(cfpth):
+        os.remove(cfpth)
+    pth0 = flopy.utils.PathlineFile(fpth)
+    pth = flopy.utils.PathlineFile(fpth, cache_data=True)
+    assert os.path.isfile(cfpth)
+    assert np.array_equal(pth._data, pth0._data)
+    pth = flopy.utils.PathlineFile(fpth, cache_data=True)
+    assert isinstance(pth._data, np.memmap)
+    assert pth._data.dtype == pth0._data.dtype
+    assert np.array_equal(pth._data, pth0._data)
+    for ipart in range(3):
+        assert np.array_equal(pth.get_data(partid=ipart),
+                              pth0.get_data(partid=ipart))
+
+    # the cache is rebuilt when the pathline file changes
+    with open(fpth, 'a') as f:
+        f.write('{:10d}{:10d}{:10d}{:10d}\n'.format(4, 1, 14, 1))
+        f.write('{:10d}'.format(31) + 4 * ' {:.15E}'.format(3.) +
+                3 * ' {:.15E}'.format(0.5) +
+                '{:10d}{:10d}{:10d}\n'.format(2, 1, 1))
+    pth = flopy.utils.PathlineFile(fpth, cache_data=True)
+    assert not isinstance(pth._data, np.memmap)
+    assert pth._data.shape[0] == pth0._data.shape[0] + 1
+    pth = flopy.utils.PathlineFile(fpth, cache_data=True)
+    assert isinstance(pth._data, np.memmap)
+    assert pth._data.shape[0] == pth0._data.shape[0] + 1
+    return
+
+
+def test_mp7_pathline_queries():
+    from flopy.utils.geometry import Polygon
+    # uses the pathline file written by test_mp7_pathline_load
+    fpth = os.path.join(cpth, 'mp7.mppth')
+    test_mp7_pathline_load()
+    pth = flopy.utils.PathlineFile(fpth)
+    assert np.array_equal(pth.particles_through_cells([2, 22]), [0, 2])
+    assert np.array_equal(pth.particles_through_cells([10]), [1])
+    assert pth.particles_through_cells([5, 30]).shape[0] == 0
+    tt = pth.travel_time_to_cells([1, 22, 23])
+    assert np.array_equal(tt.particleid, [0, 2])
+    assert np.array_equal(tt.time, [10., 22.])
+    assert np.array_equal(tt.traveltime, [10., 20.])
+    assert pth.travel_time_to_cells([5]).shape[0] == 0
+
+    # points have x = y = time
+    square = [(5., 5.), (15., 5.), (15., 15.), (5., 15.)]
+    assert np.array_equal(pth.particles_in_polygon(square), [0, 2])
+    hole = [(11., 11.), (13., 11.), (13., 13.), (11., 13.)]
+    poly = Polygon(square, interiors=[hole])
+    assert np.array_equal(pth.particles_in_polygon(poly), [0, 2])
+    far = [(100., 100.), (200., 100.), (200., 200.)]
+    assert pth.particles_in_polygon(far).shape[0] == 0
+
+    # segments that cross a polygon with both points outside of it
+    between = [(4., 4.), (7., 4.), (7., 7.), (4., 7.)]
+    assert np.array_equal(pth.particles_in_polygon(between), [0, 2])
+    between = [(25., 25.), (27., 25.), (27., 27.), (25., 27.)]
+    assert np.array_equal(pth.particles_in_polygon(between), [2])
+    hole = [(24., 24.), (28., 24.), (28., 28.), (24., 28.)]
+    poly = Polygon([(23., 23.), (29., 23.), (29., 29.), (23., 29.)],
+                   interiors=[hole])
+    assert np.array_equal(pth.particles_in_polygon(poly), [2])
+    beside = [(5., 0.), (9., 0.), (9., 3.)]
+    assert pth.particles_in_polygon(beside).shape[0] == 0
+    return
+
+
 def eval_timeseries(file):
     ts = flopy.utils.TimeseriesFile(file)
     msg = '{} '.format(os.path.basename(file)) + \
@@ -397,3 +527,7 @@ if __name__ == '__main__':
     test_mp5_load()
     test_mp5_timeseries_load()
     test_mp6_timeseries_load()
+    test_mp7_pathline_load()
+    test_mp7_pathline_alldata()
+    test_mp7_pathline_cache()
+    test_mp7_pathline_queries()
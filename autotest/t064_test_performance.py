@@ -7,6 +7,7 @@ import shutil
 import time
 import numpy as np
 import flopy.modflow as fm
+from flopy.utils import CellBudgetFile
 
 
 class TestModflowPerformance():
@@ -100,3 +101,106 @@ class TestModflowPerformance():
     def teardown_class(cls):
         # cleanup
         shutil.rmtree(cls.model_ws)
+
+
+class _ScanCountingList(list):
+    """List that counts the items scanned by membership tests."""
+
+    def __init__(self, owner):
+        super(_ScanCountingList, self).__init__()
+        self.owner = owner
+
+    def __contains__(self, item):
+        self.owner.nscanned += len(self)
+        return super(_ScanCountingList, self).__contains__(item)
+
+
+class _HeaderCountingCellBudgetFile(CellBudgetFile):
+    """CellBudgetFile that counts the record headers that are read and the
+    items of the time, kstpkper, text and package name lists that are
+    scanned while the index is built."""
+    nheaders = 0
+    nscanned = 0
+
+    def _get_header(self):
+        self.nheaders += 1
+        return super(_HeaderCountingCellBudgetFile, self)._get_header()
+
+    def _build_index(self):
+        self.times = _ScanCountingList(self)
+        self.kstpkper = _ScanCountingList(self)
+        self.textlist = _ScanCountingList(self)
+        self.paknamlist = _ScanCountingList(self)
+        return super(_HeaderCountingCellBudgetFile, self)._build_index()
+
+
+class TestCellBudgetFilePerformance():
+    """Test that a cell budget file is indexed by reading each record
+    header once, without scanning the unique values found so far, and that
+    the index is reused by data lookups.
+    """
+    @classmethod
+    def setup_class(cls):
+        """Write synthetic compact budget files with 12,500 and 50,000
+        records."""
+        cls.model_ws = 'temp/t064b'
+        if not os.path.isdir(cls.model_ws):
+            os.makedirs(cls.model_ws)
+
+        h1dt = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('text', 'a16'),
+                         ('ncol', 'i4'), ('nrow', 'i4'), ('nlay', 'i4')])
+        h2dt = np.dtype([('imeth', 'i4'), ('delt', 'f4'), ('pertim', 'f4'),
+                         ('totim', 'f4')])
+        data = np.ones(6, dtype=np.float32).tobytes()
+        texts = ['{:>16}'.format(t) for t in ('STORAGE', 'CONSTANT HEAD')]
+        cls.fnames = {}
+        for nrecords in (12500, 50000):
+            fname = os.path.join(cls.model_ws, '{}.cbc'.format(nrecords))
+            with open(fname, 'wb') as f:
+                for n in range(nrecords):
+                    kstp = n // 2 + 1
+                    f.write(np.array([(kstp, 1, texts[n % 2], 3, 2, -1)],
+                                     dtype=h1dt).tobytes())
+                    f.write(np.array([(1, 1., kstp, kstp)],
+                                     dtype=h2dt).tobytes())
+                    f.write(data)
+            cls.fnames[nrecords] = fname
+
+    def test_index_time(self):
+        """test cell budget file index time for 50,000 records"""
+        elapsed = {}
+        for nrecords, fname in self.fnames.items():
+            t0 = time.time()
+            cbc = _HeaderCountingCellBudgetFile(fname, precision='single')
+            elapsed[nrecords] = time.time() - t0
+            assert cbc.get_nrecords() == nrecords
+            assert len(cbc.get_times()) == nrecords // 2
+            assert len(cbc.get_kstpkper()) == nrecords // 2
+            assert len(cbc.recorddict) == nrecords
+            # each header is read once, plus the first header that is read
+            # again to check the precision of the file
+            assert cbc.nheaders == nrecords + 1, \
+                "{} headers read for {} records".format(cbc.nheaders,
+                                                        nrecords)
+            # unique values are not found by scanning the lists of values
+            # found so far, which takes quadratic time
+            assert cbc.nscanned <= nrecords, \
+                "{} list items scanned for {} records".format(cbc.nscanned,
+                                                              nrecords)
+            # data lookups reuse the index and do not read headers again
+            cbc.get_data(kstpkper=(0, 0))
+            cbc.get_data(totim=cbc.get_times()[-1], text='STORAGE')
+            assert cbc.nheaders == nrecords + 1
+            cbc.close()
+            # timings are informative only; they depend on the machine
+            print('indexing {} records took {:.2f}s'.format(
+                nrecords, elapsed[nrecords]))
+        target = 15.
+        assert elapsed[50000] < target, \
+            "cell budget file index took {:.2f}s, ".format(elapsed[50000]) + \
+            "should take {:.1f}s".format(target)
+
+    @classmethod
+    def teardown_class(cls):
+        # cleanup
+        shutil.rmtree(cls.model_ws)
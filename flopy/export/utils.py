@@ -32,6 +32,69 @@ with open(path + "/unitsformat.json") as f:
     NC_UNITS_FORMAT = json.load(f)
 
 
+def _open_ensemble_results(m, m0, oudic0):
+    """
+    Open the binary output files of a realization of an ensemble with the
+    record index of the corresponding file of the first model m0, whose
+    results are in oudic0, so that the files do not need to be scanned.
+    Returns None if any of the outputs is not a binary output file, or if
+    any of the files is missing or smaller than the file of the first
+    model.
+    """
+    oudic = {}
+    for key, out in oudic0.items():
+        if not isinstance(out, (HeadFile, UcnFile, CellBudgetFile)):
+            break
+        fname = os.path.join(
+            m.model_ws,
+            os.path.basename(out.filename).replace(m0.name, m.name),
+        )
+        if (
+            not os.path.isfile(fname)
+            or os.path.getsize(fname) < out.totalbytes
+        ):
+            break
+        kwargs = {"index": out}
+        if out.realtype == np.float64:
+            kwargs["precision"] = "double"
+        else:
+            kwargs["precision"] = "single"
+        if not isinstance(out, CellBudgetFile):
+            kwargs["text"] = out.text.decode()
+        if getattr(out, "model", None) is not None:
+            kwargs["model"] = m
+        if key == out.filename:
+            key = fname
+        oudic[key] = type(out)(fname, **kwargs)
+    else:
+        return oudic
+    for out in oudic.values():
+        out.close()
+    return None
+
+
+def _iter_ensemble_results(models, oudic0):
+    """
+    Generator that yields each model of an ensemble after the first and
+    its results, where oudic0 are the results of the first model.
+    The binary output files of each realization are opened with the record
+    index of the corresponding file of the first model, and the results of
+    a realization are loaded with load_results() if its output files
+    cannot be opened this way.  The files of a realization are closed
+    before the files of the next realization are opened.
+    """
+    for m in models[1:]:
+        oudic = _open_ensemble_results(m, models[0], oudic0)
+        if oudic is None:
+            oudic = m.load_results(as_dict=True)
+        try:
+            yield m, oudic
+        finally:
+            for out in oudic.values():
+                if hasattr(out, "close"):
+                    out.close()
+
+
 def ensemble_helper(
     inputs_filename, outputs_filename, models, add_reals=True, **kwargs
 ):
@@ -84,31 +147,26 @@ def ensemble_helper(
         f_in.add_global_attributes({"namefile": ""})
 
     if outputs_filename is not None:
+        # output_helper removes zone budget outputs from the dictionary it
+        # is given, so it is given copies of the results of the first model
+        oudic0 = models[0].load_results(as_dict=True)
         f_out = output_helper(
-            outputs_filename,
-            models[0],
-            models[0].load_results(as_dict=True),
-            **kwargs
+            outputs_filename, models[0], dict(oudic0), **kwargs
         )
         vdict = {}
-        vdicts = [
-            output_helper(
-                vdict,
-                models[0],
-                models[0].load_results(as_dict=True),
-                **kwargs
-            )
-        ]
+        vdicts = [output_helper(vdict, models[0], dict(oudic0), **kwargs)]
         i = 1
-        for m in models[1:]:
+        for m, oudic in _iter_ensemble_results(models, oudic0):
             suffix = m.name.split(".")[0].split("_")[-1]
-            oudic = m.load_results(as_dict=True)
             vdict = {}
             output_helper(vdict, m, oudic, **kwargs)
             vdicts.append(vdict)
             if add_reals:
                 f_out.append(vdict, suffix=suffix)
             i += 1
+        for out in oudic0.values():
+            if hasattr(out, "close"):
+                out.close()
 
         mean, stdev = {}, {}
         for vname in vdict.keys():
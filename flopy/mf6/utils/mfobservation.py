@@ -1,6 +1,8 @@
 import numpy as np
 import csv
 
+from ...utils.flopy_io import read_csv_values
+
 
 def try_float(data):
     try:
@@ -76,12 +78,49 @@ class Observations:
         self.Obsname = fi
 
     def _reader(self, fi):
-        # observation file reader is a standard csv reader that we try to
-        # convert each entry to floating point
+        # observation file reader returns the header and the values as an
+        # array of strings
+        header, values = self._read_values(fi)
+        if values is None:
+            # use a standard csv reader that tries to convert each entry
+            # to floating point
+            with open(fi) as f:
+                reader = csv.reader(f)
+                data = [
+                    [try_float(point) for point in line] for line in reader
+                ]
+            return np.array(data)
+        return np.vstack((np.array(header), values.astype(str)))
+
+    def _read_values(self, fi):
+        # read the header with a csv reader and parse all of the values
+        # with a single vectorized call, values is None if they are not
+        # all numeric
         with open(fi) as f:
-            reader = csv.reader(f)
-            data = [[try_float(point) for point in line] for line in reader]
-        return np.array(data)
+            header = next(csv.reader([f.readline()]), [])
+            text = f.read()
+        try:
+            values = read_csv_values(text, len(header))
+        except ValueError:
+            values = None
+        return header, values
+
+    def _read_dict(self, fi, key=None, tolist=True):
+        # read a dictionary of observation names and data without
+        # converting each value, the data are lists or np.ndarrays
+        header, values = self._read_values(fi)
+        if values is None:
+            return self._array_to_dict(self._reader(fi), key)
+        if key is not None:
+            if key not in header:
+                raise KeyError(key)
+            # the last column with the name is used, as in _array_to_dict
+            column = values[:, len(header) - 1 - header[::-1].index(key)]
+            return column.tolist() if tolist else column
+        data = {}
+        for name, column in zip(header, values.T):
+            data[name] = column.tolist() if tolist else column
+        return data
 
     def _array_to_dict(self, data, key=None):
         # convert np.array to dictionary of observation names and data
@@ -97,8 +136,7 @@ class Observations:
     def list_records(self):
         # requester option to list all records (observation names) within an
         # observation file
-        data_str = self._reader(self.Obsname)
-        data = self._array_to_dict(data_str)
+        data = self._read_dict(self.Obsname)
         for key in data:
             print(key)
 
@@ -118,11 +156,10 @@ class Observations:
         -------
         data: (list) observation file data in list
         """
-        data = self._reader(self.Obsname)
-
         # check if user supplied observation key, default is to return
         # all observations
         if key is None:
+            data = self._reader(self.Obsname)
             header = data[0]
             if idx is not None:
                 data = data[idx, :]
@@ -141,7 +178,7 @@ class Observations:
                 pass
 
         else:
-            data = self._array_to_dict(data, key)
+            data = self._read_dict(self.Obsname, key)
             if idx is not None:
                 data = data[idx]
             elif totim is not None:
@@ -163,8 +200,8 @@ class Observations:
         return self.get_data(key="time")
 
     def get_nrecords(self):
-        data_str = self._reader(self.Obsname)
-        return len(self._array_to_dict(data_str))
+        header, values = self._read_values(self.Obsname)
+        return len(set(header))
 
     def get_ntimes(self):
         return len(self.get_times())
@@ -213,8 +250,7 @@ class Observations:
             print("this feature requires pandas")
             return None
 
-        data_str = self._reader(self.Obsname)
-        data = self._array_to_dict(data_str)
+        data = self._read_dict(self.Obsname, tolist=False)
         time = data["time"]
 
         if start_datetime is not None:
@@ -29,6 +29,9 @@ from .binaryfile import (
     UcnFile,
     CellBudgetFile,
     HeadUFile,
+    EnsembleFile,
+    HeadFileWriter,
+    CellBudgetFileWriter,
 )
 from .formattedfile import FormattedHeadFile
 from .modpathfile import PathlineFile, EndpointFile, TimeseriesFile
@@ -58,6 +61,7 @@ from .utils_def import FlopyBinaryData, totim_to_datetime
 from .flopy_io import read_fixed_var, write_fixed_var
 from .zonbud import (
     ZoneBudget,
+    zone_budgets,
     read_zbarray,
     write_zbarray,
     ZoneBudgetOutput,
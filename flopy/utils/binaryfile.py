@@ -7,11 +7,17 @@ important classes that can be accessed by the user.
 *  UcnFile (Binary concentration file from MT3DMS)
 *  CellBudgetFile (Binary cell-by-cell flow file)
 
+The EnsembleFile class reads the binary output files of an ensemble of
+model realizations with identical structure.
+
 """
 from __future__ import print_function
+import os
+import time
 import numpy as np
 import warnings
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from ..utils.datafile import Header, LayerFile
 
 
@@ -272,6 +278,244 @@ def get_headfile_precision(filename):
     return result
 
 
+def _get_index_cache_name(filename):
+    """
+    Return the name of the index cache file for a binary file.
+
+    """
+    return "{}.flopyidx".format(filename)
+
+
+def _write_index_cache(obj, names):
+    """
+    Write the record index of a binary output file object to a sidecar
+    index cache file (<filename>.flopyidx).  The size and modification time
+    of the binary file are stored with the index so that the cache can be
+    invalidated when the binary file changes.
+
+    Parameters
+    ----------
+    obj : object
+        HeadFile, UcnFile, HeadUFile, or CellBudgetFile object with a built
+        record index.
+    names : list of str
+        Names of the index attributes to write.
+
+    Returns
+    -------
+    success : bool
+        True if the index cache file was written.
+
+    """
+    stat = os.stat(obj.filename)
+    arrays = {name: np.asarray(getattr(obj, name)) for name in names}
+    arrays["listnames"] = np.array(
+        [name for name in names if isinstance(getattr(obj, name), list)],
+        dtype=str,
+    )
+    arrays["filesize"] = np.int64(stat.st_size)
+    arrays["mtime"] = np.int64(stat.st_mtime_ns)
+    arrays["realtype"] = np.dtype(obj.realtype).str
+    arrays["usedis"] = obj.dis is not None
+    try:
+        with open(_get_index_cache_name(obj.filename), "wb") as f:
+            np.savez(f, **arrays)
+    except (IOError, OSError) as e:
+        msg = "could not write index cache for {}: {}".format(obj.filename, e)
+        warnings.warn(msg)
+        return False
+    return True
+
+
+def _read_index_cache(obj, names):
+    """
+    Set the record index of a binary output file object from a sidecar
+    index cache file (<filename>.flopyidx), if it exists and is valid for
+    the current size and modification time of the binary file.
+
+    Parameters
+    ----------
+    obj : object
+        HeadFile, UcnFile, HeadUFile, or CellBudgetFile object.
+    names : list of str
+        Names of the index attributes to read.
+
+    Returns
+    -------
+    success : bool
+        True if the record index was set from the index cache file.
+
+    """
+    fname = _get_index_cache_name(obj.filename)
+    if not os.path.isfile(fname):
+        return False
+    stat = os.stat(obj.filename)
+    try:
+        with np.load(fname, allow_pickle=False) as cache:
+            if (
+                cache["filesize"] != stat.st_size
+                or cache["mtime"] != stat.st_mtime_ns
+                or str(cache["realtype"]) != np.dtype(obj.realtype).str
+                or bool(cache["usedis"]) != (obj.dis is not None)
+                or cache["recordarray"].dtype != obj.header_dtype
+            ):
+                return False
+            listnames = cache["listnames"].tolist()
+            index = {}
+            for name in names:
+                value = cache[name]
+                if value.ndim == 0:
+                    value = value[()]
+                elif name in listnames:
+                    if value.ndim > 1:
+                        value = [tuple(v) for v in value]
+                    else:
+                        value = list(value)
+                index[name] = value
+    except Exception:
+        return False
+    for name, value in index.items():
+        setattr(obj, name, value)
+    return True
+
+
+def _follow(obj, keys, complete, interval, timeout):
+    """
+    Generator that refreshes the index of a binary output file object and
+    yields the keys (times or kstpkper) of the time steps written to the
+    file.  The last time step in the file is only yielded once a later time
+    step has been written or complete(key) is True, or when timeout is
+    reached.
+
+    """
+    nyield = 0
+    tlast = time.time()
+    while True:
+        totalbytes = obj.totalbytes
+        obj.refresh()
+        if obj.totalbytes != totalbytes:
+            tlast = time.time()
+        values = keys()
+        ncomplete = len(values)
+        stop = timeout is not None and time.time() - tlast >= timeout
+        if ncomplete > 0 and not stop and not complete(values[-1]):
+            ncomplete -= 1
+        while nyield < ncomplete:
+            yield values[nyield]
+            nyield += 1
+        if stop:
+            return
+        time.sleep(interval)
+
+
+def _get_budget_header_dtypes(precision="single"):
+    """
+    Get the dtypes of the headers of the records in a MODFLOW binary budget
+    file.
+
+    Parameters
+    ----------
+    precision : str
+        budget file precision (accepts 'single' or 'double')
+
+    Returns
+    -------
+    header1_dtype : numpy dtype
+        dtype of the first header (kstp, kper, text, ncol, nrow, nlay).
+    header2_dtype0 : numpy dtype
+        dtype of the second header of compact budget records (imeth, delt,
+        pertim, totim).
+    header2_dtype : numpy dtype
+        dtype of the second header with the model and package names of
+        imeth = 6 records.
+
+    """
+    if precision == "single":
+        ffmt = "f4"
+    else:
+        ffmt = "f8"
+    h1dt = [
+        ("kstp", "i4"),
+        ("kper", "i4"),
+        ("text", "a16"),
+        ("ncol", "i4"),
+        ("nrow", "i4"),
+        ("nlay", "i4"),
+    ]
+    h2dt0 = [
+        ("imeth", "i4"),
+        ("delt", ffmt),
+        ("pertim", ffmt),
+        ("totim", ffmt),
+    ]
+    h2dt = h2dt0 + [
+        ("modelnam", "a16"),
+        ("paknam", "a16"),
+        ("modelnam2", "a16"),
+        ("paknam2", "a16"),
+    ]
+    return np.dtype(h1dt), np.dtype(h2dt0), np.dtype(h2dt)
+
+
+def _group_records(values):
+    """
+    Group the zero-based record numbers by value.
+
+    Parameters
+    ----------
+    values : numpy array
+        Value of each record.
+
+    Returns
+    -------
+    groups : dict
+        Dictionary that maps each unique value to a sorted array of the
+        numbers of the records with that value.
+
+    """
+    uvalues, inverse = np.unique(values, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(uvalues)))[:-1]
+    return dict(zip(uvalues.tolist(), np.split(order, bounds)))
+
+
+def _copy_index(obj, index, names):
+    """
+    Set the record index of a binary output file object from the record
+    index of a file with identical structure, so that the file does not
+    need to be scanned.
+
+    Parameters
+    ----------
+    obj : object
+        HeadFile, UcnFile, HeadUFile, or CellBudgetFile object.
+    index : object or dict
+        Binary output file object of the same type with a built record
+        index, or a dictionary with the index attributes.
+    names : list of str
+        Names of the index attributes to set.
+
+    Returns
+    -------
+    success : bool
+        False if the record index is for a different precision.
+
+    """
+    if not isinstance(index, dict):
+        index = {name: getattr(index, name) for name in names}
+    if index["recordarray"].dtype != obj.header_dtype:
+        return False
+    if os.path.getsize(obj.filename) < index["totalbytes"]:
+        msg = "{} is smaller than the file the record index was built for"
+        raise Exception(msg.format(obj.filename))
+    for name in names:
+        value = index[name]
+        if isinstance(value, list):
+            value = list(value)
+        setattr(obj, name, value)
+    return True
+
+
 class BinaryLayerFile(LayerFile):
     """
     The BinaryLayerFile class is the super class from which specific derived
@@ -279,10 +523,29 @@ class BinaryLayerFile(LayerFile):
 
     """
 
+    # record index attributes written to the index cache file
+    _index_names = (
+        "nrow",
+        "ncol",
+        "nlay",
+        "totalbytes",
+        "times",
+        "kstpkper",
+        "recordarray",
+        "iposarray",
+    )
+
     def __init__(self, filename, precision, verbose, kwargs):
+        mmap = kwargs.pop("mmap", False)
+        self._cache_index = kwargs.pop("cache_index", False)
+        self._index = kwargs.pop("index", None)
+        self._mmap = None
+        self._mmapdata = None
         super(BinaryLayerFile, self).__init__(
             filename, precision, verbose, kwargs
         )
+        if mmap:
+            self._init_mmap()
         return
 
     def __enter__(self):
@@ -291,12 +554,31 @@ class BinaryLayerFile(LayerFile):
     def __exit__(self, *exc):
         self.close()
 
-    def _build_index(self):
+    def close(self):
         """
-        Build the recordarray and iposarray, which maps the header information
-        to the position in the binary file.
+        Close the file handle and release the memory map.
+
+        """
+        self._mmap = None
+        self._mmapdata = None
+        super(BinaryLayerFile, self).close()
+        return
 
+    def _build_index(self):
         """
+        Build the recordarray and iposarray, which maps the header information
+        to the position in the binary file.  If index is set, the record
+        index of a file with identical structure is reused.  If cache_index
+        is True, the index is read from or written to the index cache file.
+
+        """
+        if self._index is not None:
+            if not _copy_index(self, self._index, self._index_names):
+                msg = "record index does not match the precision of {}"
+                raise Exception(msg.format(self.filename))
+            return
+        if self._cache_index and _read_index_cache(self, self._index_names):
+            return
         header = self._get_header()
         self.nrow = header["nrow"]
         self.ncol = header["ncol"]
@@ -306,36 +588,126 @@ class BinaryLayerFile(LayerFile):
             s = "Possible error. ncol ({}) * nrow ({}) > 10,000,000 "
             s = s.format(self.ncol, self.nrow)
             warnings.warn(s)
+        headers, iposarray = self._index_records(0)
+
+        # self.recordarray contains a recordarray of all the headers.
+        self.recordarray = np.array(headers, dtype=self.header_dtype)
+        self.iposarray = np.array(iposarray, dtype=np.int64)
+        self.nlay = np.max(self.recordarray["ilay"])
+        if self._cache_index:
+            _write_index_cache(self, self._index_names)
+        return
+
+    def _index_records(self, ipos):
+        """
+        Read the headers of the records from byte position ipos to the end
+        of the file and add new times and kstpkper values.  Records that
+        have not been completely written to the file are not indexed.
+
+        Parameters
+        ----------
+        ipos : int
+            byte position of the first header to read
+
+        Returns
+        -------
+        headers : list
+            list of headers
+        iposarray : list
+            list of byte positions of the data following each header
+
+        """
         self.file.seek(0, 2)
-        self.totalbytes = self.file.tell()
-        self.file.seek(0, 0)
-        ipos = 0
-        while ipos < self.totalbytes:
+        filesize = self.file.tell()
+        self.file.seek(ipos, 0)
+        headerbytes = self.header_dtype.itemsize
+        headers = []
+        iposarray = []
+        while ipos + headerbytes <= filesize:
             header = self._get_header()
-            self.recordarray.append(header)
+            databytes = self.get_databytes(header)
+            if ipos + headerbytes + databytes > filesize:
+                break
+            headers.append(header)
             if self.text.upper() not in header["text"]:
+                ipos = self.file.tell()
                 continue
-            if ipos == 0:
-                self.times.append(header["totim"])
+            totim = header["totim"]
+            if len(self.times) == 0 or totim != self.times[-1]:
+                self.times.append(totim)
                 kstpkper = (header["kstp"], header["kper"])
                 self.kstpkper.append(kstpkper)
-            else:
-                totim = header["totim"]
-                if totim != self.times[-1]:
-                    self.times.append(totim)
-                    kstpkper = (header["kstp"], header["kper"])
-                    self.kstpkper.append(kstpkper)
             ipos = self.file.tell()
-            self.iposarray.append(ipos)
-            databytes = self.get_databytes(header)
+            iposarray.append(ipos)
             self.file.seek(databytes, 1)
             ipos = self.file.tell()
+        self.totalbytes = ipos
+        return headers, iposarray
 
-        # self.recordarray contains a recordarray of all the headers.
-        self.recordarray = np.array(self.recordarray, dtype=self.header_dtype)
-        self.iposarray = np.array(self.iposarray)
-        self.nlay = np.max(self.recordarray["ilay"])
-        return
+    def refresh(self):
+        """
+        Index the records that have been added to the file since the
+        index was built or last refreshed, for example, while a model is
+        running.  Only records that have been completely written to the
+        file are indexed.
+
+        Returns
+        -------
+        times : list of floats
+            List of simulation times (totim) added to the index.
+
+        """
+        ntimes = len(self.times)
+        headers, iposarray = self._index_records(self.totalbytes)
+        if len(headers) > 0:
+            self.recordarray = np.concatenate(
+                (self.recordarray, np.array(headers, dtype=self.header_dtype))
+            )
+            self.iposarray = np.concatenate(
+                (self.iposarray, np.array(iposarray, dtype=np.int64))
+            )
+            self.nlay = np.max(self.recordarray["ilay"])
+            if self._mmap is not None:
+                self._init_mmap()
+        return self.times[ntimes:]
+
+    def follow(self, interval=1.0, timeout=None):
+        """
+        Generator that yields simulation times as the data for them are
+        written to the file by a running model.  The times that are already
+        in the file are yielded first.
+
+        Parameters
+        ----------
+        interval : float
+            Number of seconds to wait between checks for new records.
+            (default is 1.)
+        timeout : float
+            Stop if no new records are written to the file within timeout
+            seconds.  If timeout is None, wait for new records
+            indefinitely. (default is None)
+
+        Yields
+        ------
+        totim : float
+            Simulation time with data for all of the layers written to
+            the file.
+
+        Examples
+        --------
+
+        >>> import flopy.utils.binaryfile as bf
+        >>> hdobj = bf.HeadFile('model.hds')
+        >>> for totim in hdobj.follow(interval=5., timeout=600.):
+        ...     head = hdobj.get_data(totim=totim)
+
+        """
+
+        def complete(totim):
+            nrecords = np.count_nonzero(self.recordarray["totim"] == totim)
+            return nrecords >= self.nlay
+
+        return _follow(self, self.get_times, complete, interval, timeout)
 
     def get_databytes(self, header):
         """
@@ -357,9 +729,187 @@ class BinaryLayerFile(LayerFile):
             * np.int64(self.realtype(1).nbytes)
         )
 
+    def _get_data_shape(self, header):
+        """
+
+        Parameters
+        ----------
+        header : datafile.Header
+            header object
+
+        Returns
+        -------
+         shape : tuple
+            shape of the data array following the header
+
+        """
+        return (header["nrow"], header["ncol"])
+
     def _read_data(self, shp):
         return binaryread(self.file, self.realtype, shape=shp)
 
+    def _read_record(self, idx):
+        """
+        Read the data array for a record.  If the file is memory mapped a
+        read-only view of the file is returned instead of a copy.
+
+        """
+        if self._mmapdata is not None:
+            return self._mmapdata[idx]
+        shp = self._get_data_shape(self.recordarray[idx])
+        if self._mmap is not None:
+            return np.frombuffer(
+                self._mmap,
+                dtype=self.realtype,
+                count=int(np.prod(shp)),
+                offset=int(self.iposarray[idx]),
+            ).reshape(shp)
+        self.file.seek(self.iposarray[idx], 0)
+        return self._read_data(shp)
+
+    def _init_mmap(self):
+        """
+        Memory map the file.  If every record has the same size, a
+        structured view of the header and data of all records is also
+        created so that data can be sliced without reading each record.
+
+        """
+        self._mmap = np.memmap(self.filename, dtype=np.uint8, mode="r")
+        nrecords = self.recordarray.shape[0]
+        if nrecords == 0 or self.iposarray.shape[0] != nrecords:
+            return
+        shp = self._get_data_shape(self.recordarray[0])
+        dtype = np.dtype(
+            self.header_dtype.descr + [("data", self.realtype, shp)]
+        )
+        ipos = (
+            np.arange(nrecords, dtype=np.int64) * dtype.itemsize
+            + self.header_dtype.itemsize
+        )
+        if self.totalbytes != nrecords * dtype.itemsize or not np.array_equal(
+            self.iposarray, ipos
+        ):
+            return
+        for name in ("nrow", "ncol"):
+            if not np.all(self.recordarray[name] == self.recordarray[name][0]):
+                return
+        records = np.memmap(
+            self.filename, dtype=dtype, mode="r", shape=(nrecords,)
+        )
+        self._mmapdata = records["data"]
+        return
+
+    def _get_record_time_index(self):
+        """
+        Get the zero-based position in times of each record in the file.
+
+        """
+        times = np.array(self.times)
+        sorter = np.argsort(times)
+        itim = np.searchsorted(times, self.recordarray["totim"], sorter=sorter)
+        return sorter[np.minimum(itim, times.shape[0] - 1)]
+
+    def _get_data_array(self, totim=0):
+        """
+        Get the three dimensional data array for the specified totim value.
+        If the file is memory mapped and all of the layers for totim are
+        stored consecutively, a read-only view of the file is returned.
+
+        """
+        if self._mmap is None:
+            return super(BinaryLayerFile, self)._get_data_array(totim)
+
+        if totim >= 0.0:
+            keyindices = np.where((self.recordarray["totim"] == totim))[0]
+            if len(keyindices) == 0:
+                msg = "totim value ({}) not found in file...".format(totim)
+                raise Exception(msg)
+        else:
+            raise Exception("Data not found...")
+
+        ilay = self.recordarray["ilay"][keyindices]
+        if self._mmapdata is not None:
+            i0 = keyindices[0]
+            layers = np.arange(1, self.nlay + 1)
+            if np.array_equal(ilay, layers) and np.array_equal(
+                keyindices, i0 + layers - 1
+            ):
+                return self._mmapdata[i0 : i0 + self.nlay]
+
+        shp = self._get_data_shape(self.recordarray[keyindices[0]])
+        data = np.empty((self.nlay,) + shp, dtype=self.realtype)
+        data[:] = np.nan
+        for idx, k in zip(keyindices, ilay):
+            if self.verbose:
+                msg = "Byte position in file: {} for ".format(
+                    self.iposarray[idx]
+                ) + "layer {}".format(k)
+                print(msg)
+            data[k - 1] = self._read_record(idx)
+        return data
+
+    def _get_layer_array(self, totim, mflay):
+        """
+        Get the data array for a single zero-based layer at the specified
+        totim value.  Only the record for the layer is read from the file.
+
+        """
+        idx = np.where(
+            (self.recordarray["totim"] == totim)
+            & (self.recordarray["ilay"] == mflay + 1)
+        )[0]
+        if len(idx) == 0:
+            return super(BinaryLayerFile, self)._get_layer_array(totim, mflay)
+        return self._read_record(idx[-1])
+
+    def get_alldata(self, mflay=None, nodata=-9999):
+        """
+        Get all of the data from the file.
+
+        Parameters
+        ----------
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+
+        nodata : float
+           The nodata value in the data array.  All array values that have the
+           nodata value will be assigned np.nan.
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (ntimes, nlay, nrow, ncol) if mflay is None or it
+            has size (ntimes, nrow, ncol) if mlay is specified.
+
+        Notes
+        -----
+        If the file is memory mapped, the data for all of the times are
+        gathered from the file with a single indexing operation.
+
+        """
+        if self._mmapdata is None:
+            return super(BinaryLayerFile, self).get_alldata(
+                mflay=mflay, nodata=nodata
+            )
+
+        # map every (time, layer) combination to a record number
+        ntimes = len(self.times)
+        irec = np.full((ntimes, self.nlay), -1, dtype=np.int64)
+        itim = self._get_record_time_index()
+        irec[itim, self.recordarray["ilay"] - 1] = np.arange(
+            self.recordarray.shape[0]
+        )
+        if mflay is not None:
+            irec = irec[:, mflay]
+        if np.any(irec < 0):
+            return super(BinaryLayerFile, self).get_alldata(
+                mflay=mflay, nodata=nodata
+            )
+        rv = self._mmapdata[irec]
+        rv[rv == nodata] = np.nan
+        return rv
+
     def _get_header(self):
         """
         Read the file header
@@ -394,6 +944,10 @@ class BinaryLayerFile(LayerFile):
         The layer, row, and column values must be zero-based, and must be
         within the following ranges: 0 <= k < nlay; 0 <= i < nrow; 0 <= j < ncol
 
+        Cells are grouped by layer and each record for a layer is read once,
+        so extracting time series for many cells is not much slower than
+        extracting a time series for a single cell.
+
         Examples
         --------
 
@@ -404,25 +958,33 @@ class BinaryLayerFile(LayerFile):
         # Initialize result array and put times in first column
         result = self._init_result(nstation)
 
-        istat = 1
-        for k, i, j in kijlist:
-            ioffset = (i * self.ncol + j) * self.realtype(1).nbytes
-            for irec, header in enumerate(self.recordarray):
-                ilay = (
-                    header["ilay"] - 1
-                )  # change ilay from header to zero-based
-                if ilay != k:
-                    continue
-                ipos = np.long(self.iposarray[irec])
-
-                # Calculate offset necessary to reach intended cell
-                self.file.seek(ipos + np.long(ioffset), 0)
-
-                # Find the time index and then put value into result in the
-                # correct location.
-                itim = np.where(result[:, 0] == header["totim"])[0]
-                result[itim, istat] = binaryread(self.file, self.realtype)
-            istat += 1
+        # group the cells by layer so that each record is only read once
+        kij = np.array(kijlist, dtype=np.int64).reshape(-1, 3)
+        itim = self._get_record_time_index()
+        ilay = self.recordarray["ilay"] - 1
+        nbytes = self.realtype(1).nbytes
+        for k in np.unique(kij[:, 0]):
+            istat = np.where(kij[:, 0] == k)[0]
+            irec = np.where(ilay == k)[0]
+            if irec.shape[0] == 0:
+                continue
+            i, j = kij[istat, 1], kij[istat, 2]
+            if self._mmapdata is not None:
+                result[itim[irec, None], istat + 1] = self._mmapdata[
+                    irec[:, None], i, j
+                ]
+                continue
+
+            # read the block of values spanning the cells in the layer
+            offsets = i * self.ncol + j
+            i0 = offsets.min()
+            count = offsets.max() - i0 + 1
+            for n in irec:
+                self.file.seek(
+                    np.int64(self.iposarray[n]) + np.int64(i0 * nbytes), 0
+                )
+                v = binaryread(self.file, self.realtype, shape=(count,))
+                result[itim[n], istat + 1] = v[offsets - i0]
         return result
 
 
@@ -440,6 +1002,19 @@ class HeadFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    mmap : bool
+        Memory map the file instead of reading each record.  Data returned
+        by get_data are read-only views of the file.  Default is False.
+    cache_index : bool
+        Read the record index from, or write it to, an index cache file
+        (<filename>.flopyidx) so that the file does not need to be scanned
+        again the next time it is opened.  The cache is rebuilt if the size
+        or modification time of the file changes.  Default is False.
+    index : object
+        Binary output file object of the same type for a file with
+        identical structure (for example, another realization of the same
+        model).  The record index of index is reused instead of scanning
+        the file.  Default is None.
 
     Attributes
     ----------
@@ -510,6 +1085,19 @@ class UcnFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    mmap : bool
+        Memory map the file instead of reading each record.  Data returned
+        by get_data are read-only views of the file.  Default is False.
+    cache_index : bool
+        Read the record index from, or write it to, an index cache file
+        (<filename>.flopyidx) so that the file does not need to be scanned
+        again the next time it is opened.  The cache is rebuilt if the size
+        or modification time of the file changes.  Default is False.
+    index : object
+        Binary output file object of the same type for a file with
+        identical structure (for example, another realization of the same
+        model).  The record index of index is reused instead of scanning
+        the file.  Default is None.
 
     Attributes
     ----------
@@ -582,6 +1170,16 @@ class CellBudgetFile(object):
         'single' or 'double'.  Default is 'single'.
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_index : bool
+        Read the record index from, or write it to, an index cache file
+        (<filename>.flopyidx) so that the file does not need to be scanned
+        again the next time it is opened.  The cache is rebuilt if the size
+        or modification time of the file changes.  Default is False.
+    index : object
+        Binary output file object of the same type for a file with
+        identical structure (for example, another realization of the same
+        model).  The record index of index is reused instead of scanning
+        the file.  Default is None.
 
     Attributes
     ----------
@@ -605,6 +1203,24 @@ class CellBudgetFile(object):
 
     """
 
+    # record index attributes written to the index cache file
+    _index_names = (
+        "nrow",
+        "ncol",
+        "nlay",
+        "nper",
+        "nrecords",
+        "totalbytes",
+        "times",
+        "kstpkper",
+        "textlist",
+        "imethlist",
+        "paknamlist",
+        "recordarray",
+        "iposheader",
+        "iposarray",
+    )
+
     def __init__(self, filename, precision="auto", verbose=False, **kwargs):
         self.filename = filename
         self.precision = precision
@@ -663,6 +1279,8 @@ class CellBudgetFile(object):
                 )
         if "modelgrid" in kwargs.keys():
             self.modelgrid = kwargs.pop("modelgrid")
+        self._cache_index = kwargs.pop("cache_index", False)
+        self._index = kwargs.pop("index", None)
         if len(kwargs.keys()) > 0:
             args = ",".join(kwargs.keys())
             raise Exception("LayerFile error: unrecognized kwargs: " + args)
@@ -721,42 +1339,15 @@ class CellBudgetFile(object):
             budget file precision (accepts 'single' or 'double')
         """
         success = True
-        h1dt = [
-            ("kstp", "i4"),
-            ("kper", "i4"),
-            ("text", "a16"),
-            ("ncol", "i4"),
-            ("nrow", "i4"),
-            ("nlay", "i4"),
-        ]
         if precision == "single":
             self.realtype = np.float32
-            ffmt = "f4"
         else:
             self.realtype = np.float64
-            ffmt = "f8"
-
-        h2dt0 = [
-            ("imeth", "i4"),
-            ("delt", ffmt),
-            ("pertim", ffmt),
-            ("totim", ffmt),
-        ]
-        h2dt = [
-            ("imeth", "i4"),
-            ("delt", ffmt),
-            ("pertim", ffmt),
-            ("totim", ffmt),
-            ("modelnam", "a16"),
-            ("paknam", "a16"),
-            ("modelnam2", "a16"),
-            ("paknam2", "a16"),
-        ]
-        self.header1_dtype = np.dtype(h1dt)
-        self.header2_dtype0 = np.dtype(h2dt0)
-        self.header2_dtype = np.dtype(h2dt)
-        hdt = h1dt + h2dt
-        self.header_dtype = np.dtype(hdt)
+        dtypes = _get_budget_header_dtypes(precision)
+        self.header1_dtype, self.header2_dtype0, self.header2_dtype = dtypes
+        self.header_dtype = np.dtype(
+            self.header1_dtype.descr + self.header2_dtype.descr
+        )
 
         try:
             self._build_index()
@@ -790,13 +1381,29 @@ class CellBudgetFile(object):
     def _build_index(self):
         """
         Build the ordered dictionary, which maps the header information
-        to the position in the binary file.
-        """
-        asciiset = " "
-        for i in range(33, 127):
-            asciiset += chr(i)
+        to the position in the binary file.  If index is set, the record
+        index of a file with identical structure is reused.  If cache_index
+        is True, the index is read from or written to the index cache file.
+        """
+        if self._index is not None:
+            if not _copy_index(self, self._index, self._index_names):
+                raise BudgetIndexError("Record index precision mismatch")
+            self.recorddict = OrderedDict(
+                zip(self.recordarray.tolist(), self.iposarray.tolist())
+            )
+            self._build_record_lookups()
+            return
+        if self._cache_index and _read_index_cache(self, self._index_names):
+            self.recorddict = OrderedDict(
+                zip(self.recordarray.tolist(), self.iposarray.tolist())
+            )
+            self._build_record_lookups()
+            return
 
-        header = self._get_header()
+        try:
+            header = self._get_header()
+        except EOFError:
+            raise BudgetIndexError("Incomplete header")
         self.nrow = header["nrow"]
         self.ncol = header["ncol"]
         self.nlay = np.abs(header["nlay"])
@@ -805,27 +1412,93 @@ class CellBudgetFile(object):
             text = text.decode()
         if self.nrow < 0 or self.ncol < 0:
             raise Exception("negative nrow, ncol")
+        headers, iposheader, iposarray = self._index_records(0)
+        if len(headers) == 0:
+            raise BudgetIndexError("No complete records")
+
+        # convert to numpy arrays
+        self.recordarray = np.array(headers, dtype=self.header_dtype)
+        self.iposheader = np.array(iposheader, dtype=np.int64)
+        self.iposarray = np.array(iposarray, dtype=np.int64)
+        self.nper = self.recordarray["kper"].max()
+
+        # map the header information to the position in the binary file
+        self.recorddict = OrderedDict(
+            zip(self.recordarray.tolist(), self.iposarray.tolist())
+        )
+        self._build_record_lookups()
+        if self._cache_index:
+            _write_index_cache(self, self._index_names)
+        return
+
+    def _build_record_lookups(self):
+        """
+        Build the dictionaries that map text, paknam, and one-based
+        (kstp, kper) values to arrays of the zero-based numbers of the
+        records with those values, so that records can be selected without
+        scanning the recordarray.
+
+        """
+        self._textindex = _group_records(self.recordarray["text"])
+        self._paknamindex = _group_records(self.recordarray["paknam"])
+        keys = self.recordarray["kper"].astype(np.int64) * 2 ** 31
+        keys += self.recordarray["kstp"]
+        self._kstpkperindex = {
+            (key % 2 ** 31, key // 2 ** 31): records
+            for key, records in _group_records(keys).items()
+        }
+        return
+
+    def _index_records(self, ipos):
+        """
+        Read the headers of the records from byte position ipos to the end
+        of the file and add new times, kstpkper, text, and package names.
+        Records that have not been completely written to the file are not
+        indexed.
+
+        Parameters
+        ----------
+        ipos : int
+            byte position of the first header to read
+
+        Returns
+        -------
+        headers : list
+            list of headers
+        iposheader : list
+            list of byte positions of each header
+        iposarray : list
+            list of byte positions of the data following each header
+
+        """
+        asciiset = " "
+        for i in range(33, 127):
+            asciiset += chr(i)
+
         self.file.seek(0, 2)
-        self.totalbytes = self.file.tell()
-        self.file.seek(0, 0)
-        self.recorddict = OrderedDict()
-        ipos = 0
-        while ipos < self.totalbytes:
-            self.iposheader.append(ipos)
-            header = self._get_header()
-            self.nrecords += 1
+        filesize = self.file.tell()
+        self.file.seek(ipos, 0)
+        # sets are used to check for unique values so that the time needed
+        # to build the index increases linearly with the number of records
+        times = set(self.times)
+        kstpkpers = set(self.kstpkper)
+        texts = set(self.textlist)
+        paknams = set(self.paknamlist)
+        headers = []
+        iposheader = []
+        iposarray = []
+        while ipos < filesize:
+            try:
+                header = self._get_header()
+            except EOFError:
+                break
             totim = header["totim"]
             if totim == 0:
                 totim = self._totim_from_kstpkper(
                     (header["kstp"] - 1, header["kper"] - 1)
                 )
                 header["totim"] = totim
-            if totim >= 0 and totim not in self.times:
-                self.times.append(totim)
-            kstpkper = (header["kstp"], header["kper"])
-            if kstpkper not in self.kstpkper:
-                self.kstpkper.append(kstpkper)
-            if header["text"] not in self.textlist:
+            if header["text"] not in texts:
                 # check the precision of the file using text records
                 try:
                     tlist = [header["text"], header["modelnam"]]
@@ -838,11 +1511,7 @@ class CellBudgetFile(object):
 
                 except:
                     raise BudgetIndexError("Improper precision")
-                self.textlist.append(header["text"])
-                self.imethlist.append(header["imeth"])
-            if header["paknam"] not in self.paknamlist:
-                self.paknamlist.append(header["paknam"])
-            ipos = self.file.tell()
+            iposdata = self.file.tell()
 
             if self.verbose:
                 for itxt in [
@@ -865,7 +1534,7 @@ class CellBudgetFile(object):
                     if isinstance(s, bytes):
                         s = s.decode()
                     print(itxt + ": " + str(s))
-                print("file position: ", ipos)
+                print("file position: ", iposdata)
                 if (
                     int(header["imeth"]) != 5
                     and int(header["imeth"]) != 6
@@ -873,26 +1542,106 @@ class CellBudgetFile(object):
                 ):
                     print("")
 
-            # store record and byte position mapping
-            self.recorddict[
-                tuple(header)
-            ] = ipos  # store the position right after header2
-            self.recordarray.append(header)
-            self.iposarray.append(
-                ipos
-            )  # store the position right after header2
-
-            # skip over the data to the next record and set ipos
-            self._skip_record(header)
-            ipos = self.file.tell()
-
-        # convert to numpy arrays
-        self.recordarray = np.array(self.recordarray, dtype=self.header_dtype)
-        self.iposheader = np.array(self.iposheader, dtype=np.int64)
-        self.iposarray = np.array(self.iposarray, dtype=np.int64)
-        self.nper = self.recordarray["kper"].max()
-        return
-
+            # skip over the data to the next record and make sure that the
+            # record has been completely written to the file
+            try:
+                self._skip_record(header)
+            except IndexError:
+                break
+            if self.file.tell() > filesize:
+                break
+
+            if totim >= 0 and totim not in times:
+                times.add(totim)
+                self.times.append(totim)
+            kstpkper = (header["kstp"], header["kper"])
+            if kstpkper not in kstpkpers:
+                kstpkpers.add(kstpkper)
+                self.kstpkper.append(kstpkper)
+            if header["text"] not in texts:
+                texts.add(header["text"])
+                self.textlist.append(header["text"])
+                self.imethlist.append(header["imeth"])
+            if header["paknam"] not in paknams:
+                paknams.add(header["paknam"])
+                self.paknamlist.append(header["paknam"])
+
+            # store the record, the position of the header, and the
+            # position right after header2
+            headers.append(header)
+            iposheader.append(ipos)
+            iposarray.append(iposdata)
+            ipos = self.file.tell()
+
+        self.totalbytes = ipos
+        self.nrecords += len(headers)
+        return headers, iposheader, iposarray
+
+    def refresh(self):
+        """
+        Index the records that have been added to the file since the
+        index was built or last refreshed, for example, while a model is
+        running.  Only records that have been completely written to the
+        file are indexed.
+
+        Returns
+        -------
+        kstpkper : list of (kstp, kper) tuples
+            List of zero-based kstp, kper combinations added to the index.
+
+        """
+        nkstpkper = len(self.kstpkper)
+        headers, iposheader, iposarray = self._index_records(self.totalbytes)
+        if len(headers) > 0:
+            recordarray = np.array(headers, dtype=self.header_dtype)
+            self.recordarray = np.concatenate((self.recordarray, recordarray))
+            self.iposheader = np.concatenate(
+                (self.iposheader, np.array(iposheader, dtype=np.int64))
+            )
+            self.iposarray = np.concatenate(
+                (self.iposarray, np.array(iposarray, dtype=np.int64))
+            )
+            self.nper = self.recordarray["kper"].max()
+            self.recorddict.update(zip(recordarray.tolist(), iposarray))
+            self._build_record_lookups()
+        return self.get_kstpkper()[nkstpkper:]
+
+    def follow(self, interval=1.0, timeout=None):
+        """
+        Generator that yields time steps as the budget records for them are
+        written to the file by a running model.  The time steps that are
+        already in the file are yielded first.  The last time step in the
+        file is yielded once a later time step is written to the file or
+        when timeout is reached.
+
+        Parameters
+        ----------
+        interval : float
+            Number of seconds to wait between checks for new records.
+            (default is 1.)
+        timeout : float
+            Stop if no new records are written to the file within timeout
+            seconds.  If timeout is None, wait for new records
+            indefinitely. (default is None)
+
+        Yields
+        ------
+        kstpkper : tuple of ints
+            Zero-based kstp, kper of a time step.
+
+        Examples
+        --------
+
+        >>> import flopy.utils.binaryfile as bf
+        >>> cbb = bf.CellBudgetFile('model.cbc')
+        >>> for kstpkper in cbb.follow(interval=5., timeout=600.):
+        ...     rec = cbb.get_data(kstpkper=kstpkper, text='STORAGE')
+
+        """
+        return _follow(
+            self, self.get_kstpkper, lambda k: False, interval, timeout
+        )
+
     def _skip_record(self, header):
         """
         Skip over this record, not counting header and header2.
@@ -959,27 +1708,26 @@ class CellBudgetFile(object):
 
         """
         header1 = binaryread(self.file, self.header1_dtype, (1,))
-        nlay = header1["nlay"]
-        if nlay < 0:
+        if header1.shape[0] < 1:
+            raise EOFError("Incomplete header")
+        values = header1.item()
+        if values[-1] < 0:
             # fill header2 by first reading imeth, delt, pertim and totim
             # and then adding modelnames and paknames if imeth = 6
-            temp = binaryread(self.file, self.header2_dtype0, (1,))
-            header2 = np.array(
-                [(0, 0.0, 0.0, 0.0, "", "", "", "")], dtype=self.header2_dtype
-            )
-            for name in temp.dtype.names:
-                header2[name] = temp[name]
-            if int(header2["imeth"]) == 6:
-                header2["modelnam"] = binaryread(self.file, str, charlen=16)
-                header2["paknam"] = binaryread(self.file, str, charlen=16)
-                header2["modelnam2"] = binaryread(self.file, str, charlen=16)
-                header2["paknam2"] = binaryread(self.file, str, charlen=16)
+            header2 = binaryread(self.file, self.header2_dtype0, (1,))
+            if header2.shape[0] < 1:
+                raise EOFError("Incomplete header")
+            values += header2.item()
+            if values[-4] == 6:
+                names = binaryread(self.file, str, charlen=64)
+                if len(names) < 64:
+                    raise EOFError("Incomplete header")
+                values += tuple(names[i : i + 16] for i in range(0, 64, 16))
+            else:
+                values += ("", "", "", "")
         else:
-            header2 = np.array(
-                [(0, 0.0, 0.0, 0.0, "", "", "", "")], dtype=self.header2_dtype
-            )
-        fullheader = join_struct_arrays([header1, header2])
-        return fullheader[0]
+            values += (0, 0.0, 0.0, 0.0, "", "", "", "")
+        return np.array([values], dtype=self.header_dtype)[0]
 
     def _find_text(self, text):
         """
@@ -1155,9 +1903,7 @@ class CellBudgetFile(object):
         # check and make sure that text is in file
         if text is not None:
             text16 = self._find_text(text)
-            select_indices = np.where((self.recordarray["text"] == text16))
-            if isinstance(select_indices, tuple):
-                select_indices = select_indices[0]
+            select_indices = self._textindex[text16].copy()
         else:
             select_indices = None
         return select_indices
@@ -1256,55 +2002,12 @@ class CellBudgetFile(object):
         if paknam is not None:
             paknam16 = self._find_paknam(paknam)
 
+        # select the records from the record lookups
         if kstpkper is not None:
-            kstp1 = kstpkper[0] + 1
-            kper1 = kstpkper[1] + 1
-            if text is None and paknam is None:
-                select_indices = np.where(
-                    (self.recordarray["kstp"] == kstp1)
-                    & (self.recordarray["kper"] == kper1)
-                )
-            else:
-                if paknam is None and text is not None:
-                    select_indices = np.where(
-                        (self.recordarray["kstp"] == kstp1)
-                        & (self.recordarray["kper"] == kper1)
-                        & (self.recordarray["text"] == text16)
-                    )
-                elif text is None and paknam is not None:
-                    select_indices = np.where(
-                        (self.recordarray["kstp"] == kstp1)
-                        & (self.recordarray["kper"] == kper1)
-                        & (self.recordarray["paknam"] == paknam16)
-                    )
-                else:
-                    select_indices = np.where(
-                        (self.recordarray["kstp"] == kstp1)
-                        & (self.recordarray["kper"] == kper1)
-                        & (self.recordarray["text"] == text16)
-                        & (self.recordarray["paknam"] == paknam16)
-                    )
-
+            key = (kstpkper[0] + 1, kstpkper[1] + 1)
+            select_indices = self._kstpkperindex.get(key, [])
         elif totim is not None:
-            if text is None and paknam is None:
-                select_indices = np.where((self.recordarray["totim"] == totim))
-            else:
-                if paknam is None and text is not None:
-                    select_indices = np.where(
-                        (self.recordarray["totim"] == totim)
-                        & (self.recordarray["text"] == text16)
-                    )
-                elif text is None and paknam is not None:
-                    select_indices = np.where(
-                        (self.recordarray["totim"] == totim)
-                        & (self.recordarray["paknam"] == paknam16)
-                    )
-                else:
-                    select_indices = np.where(
-                        (self.recordarray["totim"] == totim)
-                        & (self.recordarray["text"] == text16)
-                        & (self.recordarray["paknam"] == paknam16)
-                    )
+            select_indices = np.where(self.recordarray["totim"] == totim)[0]
 
         # allow for idx to be a list or a scalar
         elif idx is not None:
@@ -1315,7 +2018,7 @@ class CellBudgetFile(object):
 
         # case where only text is entered
         elif text is not None:
-            select_indices = np.where((self.recordarray["text"] == text16))
+            select_indices = self._textindex[text16]
 
         else:
             raise TypeError(
@@ -1323,6 +2026,18 @@ class CellBudgetFile(object):
                 "'idx', or 'text'"
             )
 
+        # keep only the records for text and paknam; records selected by
+        # number are not filtered
+        if kstpkper is not None or totim is not None or idx is None:
+            if text16 is not None:
+                select_indices = np.intersect1d(
+                    select_indices, self._textindex[text16]
+                )
+            if paknam16 is not None:
+                select_indices = np.intersect1d(
+                    select_indices, self._paknamindex[paknam16]
+                )
+
         # build and return the record list
         if isinstance(select_indices, tuple):
             select_indices = select_indices[0]
@@ -1401,6 +2116,32 @@ class CellBudgetFile(object):
         for idx, t in enumerate(timesint):
             result[idx, 0] = t
 
+        # list-style records with node numbers (imeth = 6) are extracted
+        # for all of the cells at once
+        text16 = self._find_text(text)
+        imeth = self.recordarray["imeth"][self._textindex[text16]]
+        if len(imeth) > 0 and np.all(imeth == 6):
+            if self.modelgrid is None:
+                s = (
+                    "A modelgrid instance must be provided during "
+                    "instantiation to get IMETH=6 timeseries data"
+                )
+                raise AssertionError(s)
+            if self.modelgrid.grid_type == "structured":
+                ndx = [
+                    lrc[0] * (self.modelgrid.nrow * self.modelgrid.ncol)
+                    + lrc[1] * self.modelgrid.ncol
+                    + (lrc[2] + 1)
+                    for lrc in kijlist
+                ]
+            else:
+                ndx = [
+                    lrc[0] * self.modelgrid.ncpl + (lrc[-1] + 1)
+                    for lrc in kijlist
+                ]
+            result[:, 1:] = self._get_node_values(ndx, text16)
+            return result
+
         for itim, k in enumerate(kk):
             try:
                 v = self.get_data(kstpkper=k, text=text, full3D=True)
@@ -1444,6 +2185,124 @@ class CellBudgetFile(object):
 
         return result
 
+    def get_node_ts(self, nodes, text, paknam=None, node2=False, field="q"):
+        """
+        Get time series for node numbers from list-style budget records
+        written with node numbers (imeth = 6), such as the records for
+        MODFLOW 6 stress and advanced packages.
+
+        Parameters
+        ----------
+        nodes : int or list of ints
+            One-based node numbers.  For records in a model budget file
+            these are model cell numbers; for records in an advanced package
+            budget file these are feature numbers (for example, SFR reach
+            or MAW well numbers).
+        text : str
+            The text identifier for the record (for example, 'WEL', 'SFR',
+            or 'FLOW-JA-FACE').
+        paknam : str
+            The package name of the records.  If None, the values of all of
+            the packages with records for text are added together.
+            (Default is None.)
+        node2 : bool
+            Select records using the node2 column instead of the node
+            column.  (Default is False.)
+        field : str
+            Name of the field with the values to return.  (Default is 'q'.)
+
+        Returns
+        ----------
+        out : numpy array
+            Array has size (ntimes, nnodes + 1).  The first column in the
+            data array will contain time (totim).  The values of records
+            with the same node number are added together.  Nodes without a
+            record at a time are assigned np.nan.
+
+        Notes
+        -----
+        All of the records for text are read once, regardless of the number
+        of nodes.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> cbc = flopy.utils.CellBudgetFile('model.sfr.cbc')
+        >>> ts = cbc.get_node_ts(list(range(1, 1001)), text='GWF')
+
+        """
+        if np.isscalar(nodes):
+            nodes = [nodes]
+        text16 = self._find_text(text)
+        paknam16 = self._find_paknam(paknam)
+        result = self._init_result(len(nodes))
+        column = "node"
+        if node2:
+            column = "node2"
+        result[:, 1:] = self._get_node_values(
+            nodes, text16, paknam16, column, field
+        )
+        return result
+
+    def _get_node_values(
+        self, nodes, text16, paknam16=None, column="node", field=None
+    ):
+        """
+        Get the values of one-based node numbers from the imeth = 6 records
+        for text16 (and paknam16) for every kstpkper.  The mapping of the
+        node numbers in a record to the requested nodes is reused for
+        records that have the same node numbers as the previous record of
+        the same package, which is usually the case for every time step.
+
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        unodes, inverse = np.unique(nodes, return_inverse=True)
+        values = np.zeros((len(self.kstpkper), len(unodes)), dtype=np.float64)
+        counts = np.zeros(values.shape, dtype=np.int64)
+
+        select = self._textindex[text16]
+        if paknam16 is not None:
+            select = np.intersect1d(select, self._paknamindex[paknam16])
+        itim = self._get_record_kstpkper_index()[select]
+
+        nodemap = {}
+        for n, irec in enumerate(select):
+            data = self.get_record(irec)
+            key = self.recordarray["paknam"][irec]
+            ids = data[column]
+            if key in nodemap and np.array_equal(nodemap[key][0], ids):
+                cols, valid = nodemap[key][1:]
+            else:
+                cols = np.searchsorted(unodes, ids)
+                cols[cols == len(unodes)] = 0
+                valid = unodes[cols] == ids
+                cols = cols[valid]
+                nodemap[key] = (ids, cols, valid)
+            if field is None:
+                field = data.dtype.names[2]
+            values[itim[n]] += np.bincount(
+                cols, weights=data[field][valid], minlength=len(unodes)
+            )
+            counts[itim[n]] += np.bincount(cols, minlength=len(unodes))
+        values[counts == 0] = np.nan
+        return values[:, inverse]
+
+    def _get_record_kstpkper_index(self):
+        """
+        Get the zero-based position in kstpkper of the time step of each
+        record.
+
+        """
+        kstpkper = np.array(self.kstpkper, dtype=np.int64).reshape(-1, 2)
+        keys = kstpkper[:, 1] * 2 ** 31 + kstpkper[:, 0]
+        reckeys = (
+            self.recordarray["kper"].astype(np.int64) * 2 ** 31
+            + self.recordarray["kstp"]
+        )
+        sorter = np.argsort(keys)
+        return sorter[np.searchsorted(keys, reckeys, sorter=sorter)]
+
     def _build_kijlist(self, idx):
         if isinstance(idx, list):
             kijlist = idx
@@ -1831,6 +2690,19 @@ class HeadUFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    mmap : bool
+        Memory map the file instead of reading each record.  Data returned
+        by get_data are read-only views of the file.  Default is False.
+    cache_index : bool
+        Read the record index from, or write it to, an index cache file
+        (<filename>.flopyidx) so that the file does not need to be scanned
+        again the next time it is opened.  The cache is rebuilt if the size
+        or modification time of the file changes.  Default is False.
+    index : object
+        Binary output file object of the same type for a file with
+        identical structure (for example, another realization of the same
+        model).  The record index of index is reused instead of scanning
+        the file.  Default is None.
 
     Attributes
     ----------
@@ -1913,18 +2785,78 @@ class HeadUFile(BinaryLayerFile):
         for idx in keyindices:
             ipos = self.iposarray[idx]
             ilay = self.recordarray["ilay"][idx]
-            nstrt = self.recordarray["ncol"][idx]
-            nend = self.recordarray["nrow"][idx]
-            npl = nend - nstrt + 1
             if self.verbose:
                 msg = "Byte position in file: {} for ".format(
                     ipos
                 ) + "layer {}".format(ilay)
                 print(msg)
-            self.file.seek(ipos, 0)
-            data[ilay - 1] = binaryread(self.file, self.realtype, shape=(npl,))
+            data[ilay - 1] = self._read_record(idx)
         return data
 
+    def _get_layer_array(self, totim, mflay):
+        """
+        Get the 1D data array for a single zero-based layer at the
+        specified totim value.
+
+        """
+        idx = np.where(
+            (self.recordarray["totim"] == totim)
+            & (self.recordarray["ilay"] == mflay + 1)
+        )[0]
+        if len(idx) == 0:
+            return None
+        return self._read_record(idx[-1])
+
+    def _stack_data(self, data):
+        """
+        Stack a list of data for consecutive times.  If the data for each
+        time is a list of 1D arrays for each layer, a list of 2D arrays of
+        size (ntimes, ncpl) for each layer is returned.
+
+        """
+        if isinstance(data[0], list):
+            return [np.array(d) for d in zip(*data)]
+        return np.array(data)
+
+    def _set_nodata(self, data, nodata):
+        if isinstance(data, list):
+            return [
+                super(HeadUFile, self)._set_nodata(d, nodata) for d in data
+            ]
+        return super(HeadUFile, self)._set_nodata(data, nodata)
+
+    def _flatten_data(self, data):
+        if isinstance(data, list):
+            return np.concatenate(data, axis=1)
+        return data
+
+    def _unflatten_data(self, flat, data):
+        if isinstance(data, list):
+            sections = np.cumsum([d.shape[1] for d in data])[:-1]
+            return np.split(flat, sections, axis=-1)
+        return flat
+
+    def _stack_layers(self, data, axis):
+        return data
+
+    def _get_data_shape(self, header):
+        """
+
+        Parameters
+        ----------
+        header : datafile.Header
+            header object
+
+        Returns
+        -------
+         shape : tuple
+            shape of the data array following the header
+
+        """
+        # unstructured head files contain node starting and ending indices
+        # for each layer
+        return (header["nrow"] - header["ncol"] + 1,)
+
     def get_databytes(self, header):
         """
 
@@ -1975,3 +2907,883 @@ class HeadUFile(BinaryLayerFile):
         """
         msg = "HeadUFile: get_ts() is not implemented"
         raise NotImplementedError(msg)
+
+
+# maximum number of files read by each task of a process pool
+_ENSEMBLE_CHUNKSIZE = 4
+
+
+def _ensemble_read(
+    filetype, filenames, precision, index, kwargs, method, method_kwargs
+):
+    """
+    Open binary output files with a shared record index and return the
+    results of calling method on each of them.  This is a module level
+    function so that it can be used with a process pool.
+
+    """
+    results = []
+    for filename in filenames:
+        with filetype(
+            filename, precision=precision, index=index, **kwargs
+        ) as fobj:
+            results.append(getattr(fobj, method)(**method_kwargs))
+    return results
+
+
+class EnsembleFile(object):
+    """
+    EnsembleFile Class.
+
+    Read the same records, time series, or statistics from the binary
+    output files of an ensemble of model realizations.  The files must have
+    identical structure (same grid, output times, and records).  The record
+    index is built once for the first file and reused for all of the other
+    files, which are read using a pool of threads or processes.
+
+    Parameters
+    ----------
+    filenames : list of strings
+        Names of the binary output files of the realizations.
+    filetype : class
+        HeadFile, UcnFile, HeadUFile, or CellBudgetFile.  Default is
+        HeadFile.
+    precision : string
+        'auto', 'single' or 'double'.  Default is 'auto'.
+    max_workers : int
+        Maximum number of threads or processes used to read the files.
+        Default is None, which uses the number of processors.
+    pool : string
+        'thread' or 'process'.  Threads work well when reading is limited
+        by disk access; processes may be faster when many small records are
+        read.  Default is 'thread'.
+    **kwargs : dict
+        Keyword arguments passed to filetype for each file (for example,
+        text or mmap).  With a process pool, the keyword arguments must be
+        picklable.
+
+    Attributes
+    ----------
+    filenames : list of strings
+        Names of the binary output files of the realizations.
+    nmembers : int
+        Number of realizations.
+
+    Notes
+    -----
+    Each file is only open while its data are being read, so ensembles
+    with more realizations than the number of files that can be open at
+    once are supported.  Files are read about max_workers at a time as the
+    results are used, so get_mean and get_std only hold the data of a few
+    files in memory at once.
+
+    Examples
+    --------
+
+    >>> import flopy.utils.binaryfile as bf
+    >>> files = ['real{}/model.hds'.format(i) for i in range(500)]
+    >>> ens = bf.EnsembleFile(files, filetype=bf.HeadFile)
+    >>> heads = ens.get_data(kstpkper=(0, 0))
+    >>> mean = ens.get_mean(kstpkper=(0, 0))
+    >>> p90 = ens.get_percentile(90, method='get_ts', idx=(0, 10, 10))
+
+    """
+
+    def __init__(
+        self,
+        filenames,
+        filetype=None,
+        precision="auto",
+        max_workers=None,
+        pool="thread",
+        **kwargs
+    ):
+        if filetype is None:
+            filetype = HeadFile
+        if pool not in ("thread", "process"):
+            raise Exception("Unknown pool specified: " + str(pool))
+        self.filenames = list(filenames)
+        self.nmembers = len(self.filenames)
+        if self.nmembers == 0:
+            raise Exception("EnsembleFile error: no files specified")
+        self.filetype = filetype
+        self.max_workers = max_workers
+        self.pool = pool
+        self.kwargs = kwargs
+
+        # build the record index for the first file
+        with filetype(self.filenames[0], precision=precision, **kwargs) as f:
+            if f.realtype == np.float64:
+                self.precision = "double"
+            else:
+                self.precision = "single"
+            self.index = {name: getattr(f, name) for name in f._index_names}
+            self.times = f.get_times()
+            self.kstpkper = f.get_kstpkper()
+            self.recordarray = f.recordarray
+        return
+
+    def get_times(self):
+        """
+        Get a list of unique times in the files.
+
+        Returns
+        ----------
+        out : list of floats
+            List contains unique simulation times (totim) in the files.
+
+        """
+        return list(self.times)
+
+    def get_kstpkper(self):
+        """
+        Get a list of unique stress periods and time steps in the files.
+
+        Returns
+        ----------
+        out : list of (kstp, kper) tuples
+            List of unique kstp, kper combinations in the files.  kstp and
+            kper values are zero-based.
+
+        """
+        return list(self.kstpkper)
+
+    def _iter_results(self, method, method_kwargs):
+        """
+        Generator that yields the result of calling method on each file,
+        in the order of filenames.  At most about max_workers tasks are
+        submitted at once, so that only the results of these tasks are
+        held in memory, and each result is released once it is yielded.
+
+        """
+        nworkers = self.max_workers
+        if nworkers is None:
+            nworkers = os.cpu_count() or 1
+        if self.pool == "thread":
+            executor = ThreadPoolExecutor
+            chunks = [[filename] for filename in self.filenames]
+        else:
+            # a few files are read by each process to reduce the overhead
+            # of sending the record index to the processes
+            executor = ProcessPoolExecutor
+            chunksize = -(-self.nmembers // (4 * nworkers))
+            chunksize = min(chunksize, _ENSEMBLE_CHUNKSIZE)
+            chunks = [
+                self.filenames[i : i + chunksize]
+                for i in range(0, self.nmembers, chunksize)
+            ]
+        chunks = iter(chunks)
+        with executor(max_workers=nworkers) as pool:
+            pending = deque()
+
+            def submit():
+                for chunk in chunks:
+                    pending.append(
+                        pool.submit(
+                            _ensemble_read,
+                            self.filetype,
+                            chunk,
+                            self.precision,
+                            self.index,
+                            self.kwargs,
+                            method,
+                            method_kwargs,
+                        )
+                    )
+                    if len(pending) >= nworkers:
+                        break
+
+            submit()
+            while pending:
+                results = pending.popleft().result()
+                submit()
+                results.reverse()
+                while results:
+                    yield results.pop()
+
+    def _stack(self, method, method_kwargs):
+        return np.array(list(self._iter_results(method, method_kwargs)))
+
+    def get_data(self, **kwargs):
+        """
+        Get data from each file.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Keyword arguments passed to get_data() of filetype (for example,
+            kstpkper, totim, idx, mflay, text, or full3D).
+
+        Returns
+        ----------
+        data : numpy array
+            Array with the data for each file stacked along the first
+            dimension.
+
+        """
+        return self._stack("get_data", kwargs)
+
+    def get_alldata(self, **kwargs):
+        """
+        Get all of the data from each file.
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Keyword arguments passed to get_alldata() of filetype.
+
+        Returns
+        ----------
+        data : numpy array
+            Array with the data for each file stacked along the first
+            dimension.
+
+        """
+        return self._stack("get_alldata", kwargs)
+
+    def get_ts(self, idx, **kwargs):
+        """
+        Get a time series from each file.
+
+        Parameters
+        ----------
+        idx : tuple of ints, or a list of a tuple of ints
+            Zero-based cells passed to get_ts() of filetype.
+        **kwargs : dict
+            Other keyword arguments passed to get_ts() of filetype (for
+            example, text for a CellBudgetFile).
+
+        Returns
+        ----------
+        out : numpy array
+            Array has size (nmembers, ntimes, ncells + 1).  The first column
+            in the data array for each file will contain time (totim).
+
+        """
+        kwargs["idx"] = idx
+        return self._stack("get_ts", kwargs)
+
+    def get_mean(self, method="get_data", **kwargs):
+        """
+        Get the mean of the data across the files.  The data for each file
+        are added to the mean as they are read, so that only the data of
+        about max_workers files are held in memory at once.  NaN values are
+        ignored.
+
+        Parameters
+        ----------
+        method : string
+            Name of the method used to get the data from each file
+            ('get_data', 'get_alldata', or 'get_ts').  Default is 'get_data'.
+        **kwargs : dict
+            Keyword arguments passed to method.  For a CellBudgetFile,
+            full3D=True should be used with get_data.
+
+        Returns
+        ----------
+        mean : numpy array
+
+        """
+        mean, count, _ = self._accumulate(method, kwargs)
+        return np.where(count > 0, mean, np.nan)
+
+    def get_std(self, method="get_data", **kwargs):
+        """
+        Get the (population) standard deviation of the data across the
+        files.  NaN values are ignored.
+
+        Parameters
+        ----------
+        method : string
+            Name of the method used to get the data from each file
+            ('get_data', 'get_alldata', or 'get_ts').  Default is 'get_data'.
+        **kwargs : dict
+            Keyword arguments passed to method.
+
+        Returns
+        ----------
+        std : numpy array
+
+        """
+        _, count, m2 = self._accumulate(method, kwargs)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 0, np.sqrt(m2 / count), np.nan)
+
+    def get_percentile(self, q, method="get_data", **kwargs):
+        """
+        Get percentiles of the data across the files.  NaN values are
+        ignored.
+
+        Parameters
+        ----------
+        q : float or sequence of floats
+            Percentile or sequence of percentiles to compute, which must be
+            between 0 and 100 inclusive.
+        method : string
+            Name of the method used to get the data from each file
+            ('get_data', 'get_alldata', or 'get_ts').  Default is 'get_data'.
+        **kwargs : dict
+            Keyword arguments passed to method.
+
+        Returns
+        ----------
+        percentile : numpy array
+            If q is a sequence, the first dimension of the array
+            corresponds to the percentiles.
+
+        """
+        data = np.asarray(self._stack(method, kwargs), dtype=np.float64)
+        return np.nanpercentile(data, q, axis=0)
+
+    def _accumulate(self, method, method_kwargs):
+        """
+        Accumulate the mean, the number of values that are not NaN, and the
+        sum of squared differences from the mean of the data across the
+        files using Welford's algorithm.
+
+        """
+        mean, count, m2 = None, None, None
+        for data in self._iter_results(method, method_kwargs):
+            data = np.asarray(data, dtype=np.float64)
+            valid = ~np.isnan(data)
+            if mean is None:
+                mean = np.zeros(data.shape, dtype=np.float64)
+                count = np.zeros(data.shape, dtype=np.int64)
+                m2 = np.zeros(data.shape, dtype=np.float64)
+            count += valid
+            delta = np.where(valid, data - mean, 0.0)
+            mean += delta / np.maximum(count, 1)
+            m2 += np.where(valid, delta * (data - mean), 0.0)
+            # release the data of the file before the next file is read
+            del data, valid, delta
+        return mean, count, m2
+
+
+class HeadFileWriter(object):
+    """
+    HeadFileWriter Class.
+
+    Write arrays to a MODFLOW binary head, drawdown, or MT3DMS
+    concentration file that can be read with HeadFile or UcnFile.  Each
+    record is written to the file as soon as it is passed to the writer.
+    HeadFile and UcnFile identify time steps by their total simulation
+    time, so totim must increase from one time step to the next.
+
+    Parameters
+    ----------
+    filename : string
+        Name of the binary file to write.
+    text : string
+        Text string written to the header of each record.  Default is
+        'head'.
+    precision : string
+        'single' or 'double'.  Default is 'single'.
+    bintype : string
+        Type of header ('head', 'drawdown', or 'ucn').  Default is 'head'.
+
+    Examples
+    --------
+
+    >>> import flopy.utils.binaryfile as bf
+    >>> hds1 = bf.HeadFile('base.hds')
+    >>> hds2 = bf.HeadFile('scenario.hds')
+    >>> times = hds1.get_times()
+    >>> with bf.HeadFileWriter('difference.hds') as f:
+    ...     for t, (kstp, kper) in zip(times, hds1.get_kstpkper()):
+    ...         d = hds2.get_data(totim=t) - hds1.get_data(totim=t)
+    ...         f.write_data(d, kstp + 1, kper + 1, totim=t)
+
+    """
+
+    def __init__(
+        self, filename, text="head", precision="single", bintype="head"
+    ):
+        if precision not in ("single", "double"):
+            raise Exception("Unknown precision specified: " + precision)
+        self.filename = filename
+        self.text = text
+        self.precision = precision
+        self.bintype = bintype
+        if precision == "single":
+            self.realtype = np.float32
+        else:
+            self.realtype = np.float64
+        if BinaryHeader.set_dtype(bintype, precision) is None:
+            raise Exception("Unknown bintype specified: " + str(bintype))
+        self._lasttime = None
+        self.file = open(filename, "wb")
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Close the file handle.
+
+        """
+        self.file.close()
+        return
+
+    def write_record(
+        self,
+        data,
+        kstp=1,
+        kper=1,
+        pertim=0.0,
+        totim=0.0,
+        ilay=1,
+        text=None,
+        ntrans=1,
+    ):
+        """
+        Write a two-dimensional array for a single layer to the file.
+
+        Parameters
+        ----------
+        data : numpy array
+            Array of size (nrow, ncol).
+        kstp, kper : int
+            One-based time step and stress period, as written by MODFLOW.
+        pertim, totim : float
+            Time in the stress period and total simulation time.  An
+            exception is raised if totim is less than the totim of the
+            previous record, or equal to it for a different time step.
+        ilay : int
+            One-based layer number.
+        text : string
+            Text string written to the header.  If None, the text of the
+            writer is used.
+        ntrans : int
+            Transport step written to the header of 'ucn' files.
+
+        """
+        data = np.asarray(data, dtype=self.realtype)
+        if data.ndim == 1:
+            data = data.reshape(1, -1)
+        if data.ndim != 2:
+            raise Exception("write_record() data must be a 2D array")
+        if text is None:
+            text = self.text
+        self._check_time(kstp, kper, totim)
+        nrow, ncol = data.shape
+        values = {
+            "text": text,
+            "nrow": nrow,
+            "ncol": ncol,
+            "ilay": ilay,
+            "pertim": pertim,
+            "totim": totim,
+            "kstp": kstp,
+            "kper": kper,
+            "ntrans": ntrans,
+        }
+        names = BinaryHeader.set_dtype(self.bintype, self.precision).names
+        header = BinaryHeader.create(
+            bintype=self.bintype,
+            precision=self.precision,
+            **{k: v for k, v in values.items() if k in names}
+        )
+        header.tofile(self.file)
+        data.tofile(self.file)
+        return
+
+    def write_data(
+        self, data, kstp=1, kper=1, pertim=0.0, totim=0.0, text=None, ntrans=1
+    ):
+        """
+        Write a three-dimensional array to the file as one record for each
+        layer.
+
+        Parameters
+        ----------
+        data : numpy array
+            Array of size (nlay, nrow, ncol) or (nrow, ncol).
+        kstp, kper : int
+            One-based time step and stress period, as written by MODFLOW.
+        pertim, totim : float
+            Time in the stress period and total simulation time.  Each
+            time step must be written with a different totim.
+        text : string
+            Text string written to the header.  If None, the text of the
+            writer is used.
+        ntrans : int
+            Transport step written to the header of 'ucn' files.
+
+        """
+        data = np.asarray(data)
+        if data.ndim == 2:
+            data = data.reshape((1,) + data.shape)
+        self._check_time(kstp, kper, totim)
+        for k in range(data.shape[0]):
+            self.write_record(
+                data[k], kstp, kper, pertim, totim, k + 1, text, ntrans
+            )
+        return
+
+    def write_alldata(self, data, kstpkper, pertim, totim, text=None):
+        """
+        Write arrays for a sequence of times to the file.
+
+        Parameters
+        ----------
+        data : numpy array or iterable of numpy arrays
+            Array of size (ntimes, nlay, nrow, ncol), or any iterable of
+            (nlay, nrow, ncol) arrays (for example, a generator), so that
+            all of the data do not need to be held in memory.
+        kstpkper : list of (kstp, kper) tuples
+            Zero-based time step and stress period of each time, as returned
+            by get_kstpkper().
+        pertim, totim : list of floats
+            Time in the stress period and total simulation time of each
+            time.
+        text : string
+            Text string written to the header.  If None, the text of the
+            writer is used.
+
+        """
+        for a, (kstp, kper), t0, t1 in zip(data, kstpkper, pertim, totim):
+            self.write_data(a, kstp + 1, kper + 1, t0, t1, text)
+        return
+
+    def _check_time(self, kstp, kper, totim):
+        """
+        Check that a record does not go back in time, and that it does not
+        repeat the totim of a different time step, which HeadFile and
+        UcnFile would read as a single time.
+
+        """
+        totim = self.realtype(totim)
+        if self._lasttime is not None:
+            kstpkper0, totim0 = self._lasttime
+            if totim < totim0 or (
+                totim == totim0 and (kstp, kper) != kstpkper0
+            ):
+                raise Exception(
+                    "totim {} of kstp {} kper {} ".format(totim, kstp, kper)
+                    + "must be greater than totim {} ".format(totim0)
+                    + "of kstp {} kper {}".format(*kstpkper0)
+                )
+        self._lasttime = ((kstp, kper), totim)
+        return
+
+
+class CellBudgetFileWriter(object):
+    """
+    CellBudgetFileWriter Class.
+
+    Write arrays and lists to a MODFLOW binary cell-by-cell budget file
+    that can be read with CellBudgetFile.  Each record is written to the
+    file as soon as it is passed to the writer.
+
+    Parameters
+    ----------
+    filename : string
+        Name of the binary file to write.
+    shape : tuple of ints
+        Shape of the model grid (nlay, nrow, ncol) written to the record
+        headers.  For MODFLOW 6 DISV and DISU grids use (nlay, 1, ncpl)
+        and (1, 1, nodes).  The headers of array records are written with
+        the shape of the array instead (see write_array and write_layer).
+    precision : string
+        'single' or 'double'.  Default is 'single'.
+
+    Examples
+    --------
+
+    >>> import flopy.utils.binaryfile as bf
+    >>> cbc = bf.CellBudgetFile('model.cbc')
+    >>> with bf.CellBudgetFileWriter('riv.cbc', (3, 40, 20)) as f:
+    ...     for kstp, kper in cbc.get_kstpkper():
+    ...         q = cbc.get_data(kstpkper=(kstp, kper), text='RIV')[0]
+    ...         f.write_list(q, 'RIV', kstp + 1, kper + 1)
+
+    """
+
+    def __init__(self, filename, shape, precision="single"):
+        if precision not in ("single", "double"):
+            raise Exception("Unknown precision specified: " + precision)
+        if len(shape) != 3:
+            raise Exception("shape must be (nlay, nrow, ncol)")
+        self.filename = filename
+        self.nlay, self.nrow, self.ncol = [int(n) for n in shape]
+        self.precision = precision
+        if precision == "single":
+            self.realtype = np.float32
+        else:
+            self.realtype = np.float64
+        dtypes = _get_budget_header_dtypes(precision)
+        self.header1_dtype, self.header2_dtype0, self.header2_dtype = dtypes
+        self.file = open(filename, "wb")
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Close the file handle.
+
+        """
+        self.file.close()
+        return
+
+    def _write_header(
+        self,
+        text,
+        kstp,
+        kper,
+        imeth,
+        delt,
+        pertim,
+        totim,
+        names=None,
+        shape=None,
+    ):
+        """
+        Write the header of a record.  Full arrays written with imeth = 0
+        only have the first header.  The dimensions (nlay, nrow, ncol) of
+        the record are given by shape, or by the writer if shape is None.
+
+        """
+        if shape is None:
+            shape = (self.nlay, self.nrow, self.ncol)
+        nlay, nrow, ncol = shape
+        if imeth != 0:
+            nlay = -nlay
+        header1 = np.array(
+            [(kstp, kper, _pad_text(text), ncol, nrow, nlay)],
+            dtype=self.header1_dtype,
+        )
+        header1.tofile(self.file)
+        if imeth == 0:
+            return
+        header2 = np.array(
+            [(imeth, delt, pertim, totim)], dtype=self.header2_dtype0
+        )
+        header2.tofile(self.file)
+        if imeth == 6:
+            names = "".join("{:<16}".format(name)[:16] for name in names)
+            self.file.write(names.encode())
+        return
+
+    def write_array(
+        self,
+        data,
+        text,
+        kstp=1,
+        kper=1,
+        delt=0.0,
+        pertim=0.0,
+        totim=0.0,
+        compact=True,
+    ):
+        """
+        Write a full three-dimensional array to the file.
+
+        Parameters
+        ----------
+        data : numpy array
+            Array of size (nlay, nrow, ncol).  The shape of a
+            three-dimensional array is written to the header, so records
+            with other dimensions than the model grid, like the MODFLOW 6
+            FLOW-JA-FACE record of shape (1, 1, nja), can be written.
+            Other arrays must have the size of the model grid and are
+            written with the shape of the writer.
+        text : string
+            Text identifier of the record (for example, 'STORAGE' or
+            'FLOW RIGHT FACE').
+        kstp, kper : int
+            One-based time step and stress period, as written by MODFLOW.
+        delt, pertim, totim : float
+            Time step length, time in the stress period, and total
+            simulation time.  Only written to compact budget records.
+        compact : bool
+            Write the record in the compact budget format (imeth = 1) with
+            the time information instead of the original format
+            (imeth = 0).  Default is True.
+
+        """
+        data = np.asarray(data, dtype=self.realtype)
+        if data.ndim == 3:
+            shape = data.shape
+        elif data.size == self.nlay * self.nrow * self.ncol:
+            shape = None
+        else:
+            raise Exception(
+                "data must be a 3D array or have size nlay * nrow * ncol "
+                + "({})".format(self.nlay * self.nrow * self.ncol)
+            )
+        if compact:
+            imeth = 1
+        else:
+            imeth = 0
+        self._write_header(
+            text, kstp, kper, imeth, delt, pertim, totim, shape=shape
+        )
+        data.tofile(self.file)
+        return
+
+    def write_layer(
+        self,
+        data,
+        text,
+        kstp=1,
+        kper=1,
+        delt=0.0,
+        pertim=0.0,
+        totim=0.0,
+        layer=None,
+    ):
+        """
+        Write a two-dimensional array of values for a single layer, like
+        the recharge and evapotranspiration records written by MODFLOW.
+
+        Parameters
+        ----------
+        data : numpy array
+            Array of size (nrow, ncol).  The shape of a two-dimensional
+            array is written to the header with the number of layers of
+            the writer.  Other arrays must have size nrow * ncol of the
+            writer.
+        text : string
+            Text identifier of the record (for example, 'RECHARGE' or 'ET').
+        kstp, kper : int
+            One-based time step and stress period, as written by MODFLOW.
+        delt, pertim, totim : float
+            Time step length, time in the stress period, and total
+            simulation time.
+        layer : numpy array of ints
+            Array of size (nrow, ncol) with the one-based layer of each
+            value.  If layer is None the values are written for layer 1
+            (imeth = 4), otherwise the layer array is written with the
+            values (imeth = 3).  Default is None.
+
+        """
+        data = np.asarray(data, dtype=self.realtype)
+        if data.ndim == 2:
+            shape = (self.nlay,) + data.shape
+        elif data.size == self.nrow * self.ncol:
+            shape = None
+        else:
+            raise Exception(
+                "data must be a 2D array or have size nrow * ncol "
+                + "({})".format(self.nrow * self.ncol)
+            )
+        if layer is None:
+            imeth = 4
+        else:
+            layer = np.asarray(layer, dtype=np.int32)
+            if layer.size != data.size:
+                raise Exception("layer must have the same size as data")
+            imeth = 3
+        self._write_header(
+            text, kstp, kper, imeth, delt, pertim, totim, shape=shape
+        )
+        if layer is not None:
+            layer.tofile(self.file)
+        data.tofile(self.file)
+        return
+
+    def write_list(
+        self,
+        data,
+        text,
+        kstp=1,
+        kper=1,
+        delt=0.0,
+        pertim=0.0,
+        totim=0.0,
+        modelnam="",
+        paknam="",
+        modelnam2="",
+        paknam2="",
+        imeth=None,
+    ):
+        """
+        Write a list of one-based node numbers and values to the file.
+
+        Parameters
+        ----------
+        data : numpy recarray
+            Record array with 'node' and 'q' fields and, optionally, a
+            'node2' field and auxiliary variable fields, like the arrays
+            returned by CellBudgetFile.get_data().  Records with a 'node2'
+            field are written with the model and package names
+            (imeth = 6), records with auxiliary variables are written with
+            imeth = 5, and other records are written with imeth = 2.
+        text : string
+            Text identifier of the record (for example, 'WELLS' or 'WEL').
+        kstp, kper : int
+            One-based time step and stress period, as written by MODFLOW.
+        delt, pertim, totim : float
+            Time step length, time in the stress period, and total
+            simulation time.
+        modelnam, paknam, modelnam2, paknam2 : string
+            Model and package names written to imeth = 6 records.
+        imeth : int
+            Budget record format (2, 5 or 6).  Use imeth = 5 to write a
+            list without auxiliary variables in the auxiliary list format.
+            If imeth is None the format is determined from the fields of
+            data.  Default is None.
+
+        """
+        data = np.asarray(data)
+        names = list(data.dtype.names)
+        if "node2" in names:
+            ids = ["node", "node2"]
+        else:
+            ids = ["node"]
+        aux = [name for name in names if name not in ids + ["q"]]
+        if imeth is None:
+            if len(ids) == 2:
+                imeth = 6
+            elif len(aux) > 0:
+                imeth = 5
+            else:
+                imeth = 2
+        if imeth not in (2, 5, 6):
+            raise Exception("imeth must be 2, 5 or 6")
+        if (imeth == 6) != (len(ids) == 2):
+            raise Exception("imeth = 6 records require a 'node2' field")
+        if imeth == 2 and len(aux) > 0:
+            raise Exception("imeth = 2 records cannot have auxiliary data")
+        dtype = [(name, np.int32) for name in ids]
+        dtype += [(name, self.realtype) for name in ["q"] + aux]
+        records = np.empty(data.shape[0], dtype=dtype)
+        for name in records.dtype.names:
+            records[name] = data[name]
+        self._write_header(
+            text,
+            kstp,
+            kper,
+            imeth,
+            delt,
+            pertim,
+            totim,
+            (modelnam, paknam, modelnam2, paknam2),
+        )
+        if imeth != 2:
+            np.array([len(aux) + 1], dtype=np.int32).tofile(self.file)
+            for name in aux:
+                self.file.write("{:<16}".format(name)[:16].encode())
+        np.array([records.shape[0]], dtype=np.int32).tofile(self.file)
+        records.tofile(self.file)
+        return
+
+
+def _pad_text(text):
+    """
+    Return text as an upper case 16 character string.  Shorter strings are
+    right-justified, as written by MODFLOW.
+
+    """
+    if isinstance(text, bytes):
+        text = text.decode()
+    return "{:>16}".format(text.upper())[:16]
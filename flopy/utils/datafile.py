@@ -4,6 +4,7 @@ abstract classes that should not be directly accessed.
 
 """
 from __future__ import print_function
+import warnings
 import numpy as np
 import flopy.utils
 from ..discretization.structuredgrid import StructuredGrid
@@ -536,11 +537,10 @@ class LayerFile(object):
         else:
             totim1 = self.times[-1]
 
-        data = self._get_data_array(totim1)
         if mflay is None:
-            return data
+            return self._get_data_array(totim1)
         else:
-            return data[mflay, :, :]
+            return self._get_layer_array(totim1, mflay)
 
     def get_alldata(self, mflay=None, nodata=-9999):
         """
@@ -580,6 +580,329 @@ class LayerFile(object):
         rv[rv == nodata] = np.nan
         return rv
 
+    def _get_layer_array(self, totim, mflay):
+        """
+        Get the data array for a single zero-based layer at the specified
+        totim value.
+
+        """
+        return self._get_data_array(totim)[mflay, :, :]
+
+    def iter_data(self, chunk=1, mflay=None, nodata=-9999):
+        """
+        Generator that yields the data in the file for chunks of
+        consecutive times, so that all of the data in the file do not need
+        to be held in memory at once.
+
+        Parameters
+        ----------
+        chunk : int
+            Number of times in each chunk. (Default is 1.)
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+        nodata : float
+           The nodata value in the data array.  All array values that have
+           the nodata value will be assigned np.nan.
+
+        Yields
+        ------
+        times : numpy array
+            Simulation times (totim) in the chunk.
+        data : numpy array
+            Array has size (ntimes, nlay, nrow, ncol) if mflay is None or it
+            has size (ntimes, nrow, ncol) if mflay is specified, where
+            ntimes is the number of times in the chunk.
+
+        Examples
+        --------
+
+        >>> import flopy.utils.binaryfile as bf
+        >>> hdobj = bf.HeadFile('model.hds')
+        >>> for times, data in hdobj.iter_data(chunk=10, mflay=0):
+        ...     print(times[-1], np.nanmax(data))
+
+        """
+        chunk = max(int(chunk), 1)
+        times = np.array(self.times)
+        for i0 in range(0, len(times), chunk):
+            tchunk = times[i0 : i0 + chunk]
+            data = self._stack_data(
+                [self.get_data(totim=totim, mflay=mflay) for totim in tchunk]
+            )
+            yield tchunk, self._set_nodata(data, nodata)
+
+    def _stack_data(self, data):
+        """
+        Stack a list of data arrays for consecutive times.
+
+        """
+        return np.array(data)
+
+    def _set_nodata(self, data, nodata):
+        """
+        Assign np.nan to the values of stacked data equal to nodata.
+
+        """
+        data[data == nodata] = np.nan
+        return data
+
+    def _flatten_data(self, data):
+        """
+        Reshape stacked data to an array of size (ntimes, ncells).
+
+        """
+        return data.reshape(data.shape[0], -1)
+
+    def _unflatten_data(self, flat, data):
+        """
+        Reshape an array of size (ncells,) or (n, ncells) to the shape of
+        the data for a single time in stacked data.
+
+        """
+        return flat.reshape(flat.shape[:-1] + data.shape[1:])
+
+    def _stack_layers(self, data, axis):
+        """
+        Stack a list of results for each layer along axis.
+
+        """
+        return np.stack(data, axis=axis)
+
+    def _check_times(self):
+        """
+        Raise an error if there are no times to reduce in the file.
+
+        """
+        if len(self.times) == 0:
+            raise Exception(
+                "LayerFile error: no times found in " + str(self.filename)
+            )
+
+    def _reduce_data(self, ufunc, chunk, mflay, nodata):
+        """
+        Reduce the data in the file over time with a numpy ufunc that
+        ignores np.nan (np.fmin or np.fmax).
+
+        """
+        self._check_times()
+        result = None
+        for _, data in self.iter_data(chunk, mflay, nodata):
+            values = ufunc.reduce(self._flatten_data(data), axis=0)
+            if result is None:
+                result = values
+            else:
+                result = ufunc(result, values)
+        return self._unflatten_data(result, data)
+
+    def get_min(self, mflay=None, nodata=-9999, chunk=1):
+        """
+        Get the minimum value of each cell over all of the times in the
+        file, reading chunk times at a time.  np.nan values are ignored.
+
+        Parameters
+        ----------
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+        nodata : float
+           The nodata value in the data array, which is ignored.
+        chunk : int
+            Number of times read at once. (Default is 1.)
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (nlay, nrow, ncol) if mflay is None or it has size
+            (nrow, ncol) if mflay is specified.
+
+        """
+        return self._reduce_data(np.fmin, chunk, mflay, nodata)
+
+    def get_max(self, mflay=None, nodata=-9999, chunk=1):
+        """
+        Get the maximum value of each cell over all of the times in the
+        file, reading chunk times at a time.  np.nan values are ignored.
+
+        Parameters
+        ----------
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+        nodata : float
+           The nodata value in the data array, which is ignored.
+        chunk : int
+            Number of times read at once. (Default is 1.)
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (nlay, nrow, ncol) if mflay is None or it has size
+            (nrow, ncol) if mflay is specified.
+
+        """
+        return self._reduce_data(np.fmax, chunk, mflay, nodata)
+
+    def get_mean(self, mflay=None, nodata=-9999, chunk=1):
+        """
+        Get the mean value of each cell over all of the times in the file,
+        reading chunk times at a time.  np.nan values are ignored.
+
+        Parameters
+        ----------
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+        nodata : float
+           The nodata value in the data array, which is ignored.
+        chunk : int
+            Number of times read at once. (Default is 1.)
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (nlay, nrow, ncol) if mflay is None or it has size
+            (nrow, ncol) if mflay is specified.
+
+        """
+        self._check_times()
+        total, count = 0.0, 0
+        for _, data in self.iter_data(chunk, mflay, nodata):
+            flat = self._flatten_data(data)
+            valid = ~np.isnan(flat)
+            total = total + np.where(valid, flat, 0.0).sum(axis=0)
+            count = count + valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+        return self._unflatten_data(mean, data)
+
+    def get_percentile(self, q, mflay=None, nodata=-9999):
+        """
+        Get percentiles of the values of each cell over all of the times in
+        the file.  np.nan values are ignored.  The data for all of the
+        times are only held in memory for one layer at a time.
+
+        Parameters
+        ----------
+        q : float or sequence of floats
+            Percentile or sequence of percentiles to compute, which must be
+            between 0 and 100 inclusive.
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+        nodata : float
+           The nodata value in the data array, which is ignored.
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (nlay, nrow, ncol) if mflay is None or it has size
+            (nrow, ncol) if mflay is specified.  If q is a sequence, the
+            first dimension of the array corresponds to the percentiles.
+
+        """
+        self._check_times()
+        if mflay is None:
+            layers = range(self.nlay)
+        else:
+            layers = [mflay]
+        result = []
+        for k in layers:
+            data = np.array(
+                [self._get_layer_array(totim, k) for totim in self.times],
+                dtype=np.float64,
+            )
+            data[data == nodata] = np.nan
+            with warnings.catch_warnings():
+                # cells without data return np.nan
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                result.append(np.nanpercentile(data, q, axis=0))
+        if mflay is not None:
+            return result[0]
+        return self._stack_layers(result, np.ndim(q))
+
+    def get_time_of_max(self, mflay=None, nodata=-9999, chunk=1):
+        """
+        Get the simulation time (totim) of the maximum value of each cell,
+        reading chunk times at a time.  The first time is returned if the
+        maximum value occurs more than once.
+
+        Parameters
+        ----------
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+        nodata : float
+           The nodata value in the data array, which is ignored.
+        chunk : int
+            Number of times read at once. (Default is 1.)
+
+        Returns
+        ----------
+        totim : numpy array
+            Array has size (nlay, nrow, ncol) if mflay is None or it has size
+            (nrow, ncol) if mflay is specified.  Cells without data are
+            assigned np.nan.
+
+        """
+        self._check_times()
+        vmax, tmax = None, None
+        for times, data in self.iter_data(chunk, mflay, nodata):
+            flat = self._flatten_data(data)
+            imax = np.argmax(np.where(np.isnan(flat), -np.inf, flat), axis=0)
+            values = flat[imax, np.arange(flat.shape[1])]
+            if vmax is None:
+                vmax, tmax = values, times[imax]
+            else:
+                update = (values > vmax) | (np.isnan(vmax) & ~np.isnan(values))
+                vmax[update] = values[update]
+                tmax[update] = times[imax[update]]
+        tmax[np.isnan(vmax)] = np.nan
+        return self._unflatten_data(tmax, data)
+
+    def get_first_exceedance(self, value, mflay=None, nodata=-9999, chunk=1):
+        """
+        Get the first simulation time (totim) that the value of each cell
+        is greater than value, reading chunk times at a time.
+
+        Parameters
+        ----------
+        value : float
+            Threshold value.
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+        nodata : float
+           The nodata value in the data array, which is ignored.
+        chunk : int
+            Number of times read at once. (Default is 1.)
+
+        Returns
+        ----------
+        totim : numpy array
+            Array has size (nlay, nrow, ncol) if mflay is None or it has size
+            (nrow, ncol) if mflay is specified.  Cells that never exceed
+            value are assigned np.nan.
+
+        Examples
+        --------
+
+        >>> import flopy.utils.binaryfile as bf
+        >>> ucnobj = bf.UcnFile('MT3D001.UCN')
+        >>> arrival = ucnobj.get_first_exceedance(0.01, chunk=20)
+
+        """
+        self._check_times()
+        tfirst = None
+        for times, data in self.iter_data(chunk, mflay, nodata):
+            with np.errstate(invalid="ignore"):
+                exceeds = self._flatten_data(data) > value
+            if tfirst is None:
+                tfirst = np.full(exceeds.shape[1], np.nan)
+            update = np.isnan(tfirst) & exceeds.any(axis=0)
+            tfirst[update] = times[np.argmax(exceeds, axis=0)[update]]
+        return self._unflatten_data(tfirst, data)
+
     def _read_data(self, shp):
         """
         Read data from file
@@ -3,6 +3,7 @@ Module for input/output utilities
 """
 import os
 import sys
+import warnings
 import numpy as np
 
 try:
@@ -366,6 +367,44 @@ def loadtxt(
         return np.loadtxt(file, dtype=dtype, skiprows=skiprows, **kwargs)
 
 
+def read_csv_values(text, ncol):
+    """
+    Parse a block of comma separated numeric values with a single
+    vectorized call.
+
+    Parameters
+    ----------
+    text : str
+        Comma separated values without a header, one row per line.
+    ncol : int
+        Number of values on each row.
+
+    Returns
+    -------
+    values : np.ndarray
+        float64 array with shape (nrow, ncol).
+
+    Raises
+    ------
+    ValueError
+        If a value can not be parsed or a row does not have ncol values.
+    """
+    text = text.strip()
+    if len(text) == 0:
+        return np.zeros((0, ncol), dtype=np.float64)
+    nrow = text.count("\n") + 1
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        values = np.fromstring(
+            text.replace("\n", ","), dtype=np.float64, sep=","
+        )
+    if values.size != nrow * ncol:
+        raise ValueError(
+            "could not parse {} rows of {} values".format(nrow, ncol)
+        )
+    return values.reshape(nrow, ncol)
+
+
 def get_url_text(url, error_msg=None):
     """
     Get text from a url.
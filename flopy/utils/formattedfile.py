@@ -6,6 +6,7 @@ important classes that can be accessed by the user.
 
 """
 
+import warnings
 import numpy as np
 from ..utils.datafile import Header, LayerFile
 
@@ -142,6 +143,7 @@ class FormattedLayerFile(LayerFile):
         # Process enough data to calculate seek distance between headers
         self._col_data_size = self._get_data_size(header_info)
         self._data_size = self._col_data_size * self.nrow
+        self._build_line_index(ipos)
 
         # While more data in file
         while ipos + self._data_size < self.totalbytes:
@@ -157,6 +159,28 @@ class FormattedLayerFile(LayerFile):
         self.nlay = np.max(self.recordarray["ilay"])
         return
 
+    def _build_line_index(self, ipos):
+        """
+        Build the index of the lines in a row of data.  Every row of data in
+        the file has the same format, so the byte offset of each line from
+        the start of a row (self._line_offsets) and the zero-based column of
+        the first value on each line (self._line_cols) are determined from
+        the first row of the first record, which starts at ipos.
+
+        """
+        self.file.seek(ipos, 0)
+        offsets = []
+        cols = []
+        ncol = 0
+        while ncol < self.ncol:
+            offsets.append(self.file.tell() - ipos)
+            cols.append(ncol)
+            ncol += len(self.file.readline().split())
+        self._line_offsets = np.array(offsets, dtype=np.int64)
+        self._line_cols = np.array(cols, dtype=np.int64)
+        self.file.seek(ipos, 0)
+        return
+
     def _store_record(self, header, ipos):
         """
         Store file header information in various formats for quick retrieval
@@ -183,68 +207,48 @@ class FormattedLayerFile(LayerFile):
 
     def _read_data(self, shp):
         """
-        Read 2-D data from file
+        Read 2-D data from file.  The block of text with the data for all of
+        the rows is read at once and converted to floats with numpy.
 
         """
-
         nrow, ncol = shp
-        current_row = 0
-        current_col = 0
-        result = np.empty((nrow, ncol), self.realtype)
-        # Loop until all data retrieved or eof
-        while (
-            current_row < nrow or current_col < ncol
-        ) and self.file.tell() != self.totalbytes:
-            line = self.file.readline()
-
-            # Read data into 2-D array
-            arrline = line.split()
-            for val in arrline:
+        block = self.file.read(nrow * self._col_data_size)
+        with warnings.catch_warnings():
+            # np.fromstring warns if the text can not be read to its end
+            warnings.simplefilter("ignore", DeprecationWarning)
+            result = np.fromstring(block, dtype=self.realtype, sep=" ")
+        if result.size != nrow * ncol:
+            for val in block.split():
                 if not is_float(val):
                     raise Exception(
                         "Invalid data encountered while reading data file."
                         + " Unable to convert data to float."
                     )
-                result[current_row, current_col] = float(val)
-                current_col += 1
-                if current_col >= ncol:
-                    current_row += 1
-                    if current_row < nrow:
-                        current_col = 0
-
-        if current_row < nrow - 1 or current_col < ncol - 1:
             raise Exception("Unexpected end of file while reading data.")
+        return result.reshape(nrow, ncol)
 
-        return result
-
-    def _read_val(self, i):
+    def _read_line(self, ipos, j):
         """
-        Read ith data value from file
+        Read the values on the line of the row starting at ipos that
+        contains zero-based column j.
 
         """
-        current_col = 0
-        result = None
-        # Loop until data retrieved or eof
-        while (
-            current_col < self.ncol - 1 or self.file.tell() == self.totalbytes
-        ) and current_col <= i:
-            line = self.file.readline()
-            arrline = line.split()
-            for val in arrline:
-                if not is_float(val):
-                    raise Exception(
-                        "Invalid data encountered while reading data file."
-                        + " Unable to convert data to float."
-                    )
-                result = float(val)
-                current_col = current_col + 1
-                if current_col > i:
-                    break
-
-        if (current_col < self.ncol - 1) and (current_col < i):
-            raise Exception("Unexpected end of file while reading data.")
-
-        return result
+        iline = np.searchsorted(self._line_cols, j, side="right") - 1
+        self.file.seek(ipos + self._line_offsets[iline], 0)
+        line = self.file.readline()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            values = np.fromstring(line, dtype=self.realtype, sep=" ")
+        if iline + 1 < len(self._line_cols):
+            nval = self._line_cols[iline + 1] - self._line_cols[iline]
+        else:
+            nval = self.ncol - self._line_cols[iline]
+        if values.size != nval:
+            raise Exception(
+                "Invalid data encountered while reading data file."
+                + " Unable to convert data to float."
+            )
+        return self._line_cols[iline], values
 
     def get_ts(self, idx):
         """
@@ -282,24 +286,39 @@ class FormattedLayerFile(LayerFile):
         # Initialize result array and put times in first column
         result = self._init_result(nstation)
 
-        istat = 1
-        for k, i, j in kijlist:
-            ioffset_col = i * self._col_data_size
-            for irec, header in enumerate(self.recordarray):
-                # change ilay from header to zero-based
-                ilay = header["ilay"] - 1
-                if ilay != k:
-                    continue
-                ipos = self.iposarray[irec]
-
-                # Calculate offset necessary to reach intended column
-                self.file.seek(ipos + ioffset_col, 0)
-
-                # Find the time index and then put value into result in the
-                # correct location.
-                itim = np.where(result[:, 0] == header["totim"])[0]
-                result[itim, istat] = self._read_val(j)
-            istat += 1
+        # map the simulation times to the rows of the result
+        itims = {totim: itim for itim, totim in enumerate(result[:, 0])}
+
+        # group the cells by layer and by the line of the row with the data
+        layers = {}
+        for istat, (k, i, j) in enumerate(kijlist, 1):
+            iline = np.searchsorted(self._line_cols, j, side="right") - 1
+            layer = layers.setdefault(k, {})
+            layer.setdefault((i, iline), []).append((istat, j))
+
+        # read each line with data for one or more of the cells once for
+        # each record, using the byte offsets of the rows and lines.  The
+        # whole record is read if data are needed from many lines.
+        for irec, header in enumerate(self.recordarray):
+            itim = itims.get(header["totim"])
+            # change ilay from header to zero-based
+            layer = layers.get(header["ilay"] - 1)
+            if itim is None or layer is None:
+                continue
+            ipos = self.iposarray[irec]
+            if len(layer) > self.nrow:
+                self.file.seek(ipos, 0)
+                data = self._read_data((self.nrow, self.ncol))
+                for (i, _), stations in layer.items():
+                    for istat, j in stations:
+                        result[itim, istat] = data[i, j]
+                continue
+            for (i, _), stations in layer.items():
+                j0, values = self._read_line(
+                    ipos + i * self._col_data_size, stations[0][1]
+                )
+                for istat, j in stations:
+                    result[itim, istat] = values[j - j0]
         return result
 
     def close(self):
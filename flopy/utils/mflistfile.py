@@ -8,6 +8,8 @@ recarrays, which can then be easily plotted.
 import collections
 import os
 import re
+import time
+import warnings
 from datetime import timedelta
 import numpy as np
 import errno
@@ -15,6 +17,108 @@ import errno
 from ..utils.utils_def import totim_to_datetime
 
 
+def _get_budget_cache_name(file_name):
+    """
+    Return the name of the budget cache file for a list file.
+
+    """
+    return "{}.flopynpz".format(file_name)
+
+
+def _write_budget_cache(obj):
+    """
+    Write the incremental and cumulative budget recarrays of a ListBudget
+    object to a sidecar budget cache file (<file_name>.flopynpz).  The size
+    and modification time of the list file, the budget key and the time
+    unit are stored with the recarrays so that the cache can be invalidated
+    when any of them change.
+
+    Parameters
+    ----------
+    obj : ListBudget
+        ListBudget object with loaded budget recarrays.
+
+    Returns
+    -------
+    success : bool
+        True if the budget cache file was written.
+
+    """
+    stat = os.stat(obj.file_name)
+    try:
+        with open(_get_budget_cache_name(obj.file_name), "wb") as f:
+            np.savez(
+                f,
+                inc=obj.inc,
+                cum=obj.cum,
+                idx_map=np.array(obj.idx_map, dtype=np.int64),
+                filesize=np.int64(stat.st_size),
+                mtime=np.int64(stat.st_mtime_ns),
+                ipos=np.int64(obj._ipos),
+                npending=np.int64(obj._npending),
+                budgetkey=obj.budgetkey,
+                timeunit=obj.timeunit,
+            )
+    except (IOError, OSError) as e:
+        msg = "could not write budget cache for {}: {}".format(
+            obj.file_name, e
+        )
+        warnings.warn(msg)
+        return False
+    return True
+
+
+def _read_budget_cache(obj):
+    """
+    Set the incremental and cumulative budget recarrays of a ListBudget
+    object from a sidecar budget cache file (<file_name>.flopynpz), if it
+    exists and is valid for the current size and modification time of the
+    list file.
+
+    Parameters
+    ----------
+    obj : ListBudget
+        ListBudget object.
+
+    Returns
+    -------
+    success : bool
+        True if the budget recarrays were set from the budget cache file.
+
+    """
+    fname = _get_budget_cache_name(obj.file_name)
+    if not os.path.isfile(fname):
+        return False
+    stat = os.stat(obj.file_name)
+    try:
+        with np.load(fname, allow_pickle=False) as cache:
+            if (
+                cache["filesize"] != stat.st_size
+                or cache["mtime"] != stat.st_mtime_ns
+                or str(cache["budgetkey"]) != obj.budgetkey
+                or str(cache["timeunit"]) != obj.timeunit
+            ):
+                return False
+            inc = cache["inc"].view(np.recarray)
+            cum = cache["cum"].view(np.recarray)
+            idx_map = cache["idx_map"].tolist()
+            ipos = int(cache["ipos"])
+            npending = int(cache["npending"])
+    except Exception:
+        return False
+    obj.inc = inc
+    obj.cum = cum
+    obj.idx_map = idx_map
+    obj._ipos = ipos
+    obj._npending = npending
+    obj.entries = list(inc.dtype.names[3:])
+    null_entries = collections.OrderedDict()
+    for entry in obj.entries:
+        null_entries[entry] = np.NaN
+    obj.null_entries = [null_entries, null_entries]
+    return True
+
+
 class ListBudget(object):
     """
     MODFLOW family list file handling
@@ -27,6 +131,12 @@ class ListBudget(object):
         the text string identifying the budget table. (default is None)
     timeunit : str
         the time unit to return in the recarray. (default is 'days')
+    cache_data : bool
+        Read the budget recarrays from, or write them to, a cache file
+        (<file_name>.flopynpz) so that the list file does not need to be
+        parsed again the next time it is opened.  The cache is rebuilt if
+        the size or modification time of the list file changes.
+        (default is False)
 
     Notes
     -----
@@ -42,7 +152,9 @@ class ListBudget(object):
 
     """
 
-    def __init__(self, file_name, budgetkey=None, timeunit="days"):
+    def __init__(
+        self, file_name, budgetkey=None, timeunit="days", cache_data=False
+    ):
 
         # Set up file reading
         assert os.path.exists(file_name), "file_name {0} not found".format(
@@ -89,6 +201,7 @@ class ListBudget(object):
             )
 
         # Fill budget recarrays
+        self._cache_data = cache_data
         self._load()
         self._isvalid = False
         if len(self.idx_map) > 0:
@@ -655,40 +768,96 @@ class ListBudget(object):
 
         return np.rec.fromrecords([tuple(x) for x in lsData], dtype=dtype)
 
-    def _build_index(self, maxentries):
-        self.idx_map = self._get_index(maxentries)
-        return
+    def _read_budgets(self, maxentries=None, ipos=0):
+        """
+        Read the budget tables and times in a single pass through the list
+        file.  The list file is read as bytes and only the lines of the
+        budget tables and time summaries are decoded.
 
-    def _get_index(self, maxentries):
-        # --parse through the file looking for matches and parsing ts and sp
-        idxs = []
-        l_count = 1
-        while True:
-            seekpoint = self.f.tell()
-            line = self.f.readline()
-            if line == "":
-                break
-            if self.budgetkey in line:
-                for l in range(self.tssp_lines):
-                    line = self.f.readline()
-                try:
-                    ts, sp = self._get_ts_sp(line)
-                except:
-                    print(
-                        "unable to cast ts,sp on line number",
-                        l_count,
-                        " line: ",
-                        line,
-                    )
-                    break
-                # print('info found for timestep stress period',ts,sp)
+        Parameters
+        ----------
+        maxentries : int
+            Maximum number of budget tables to read.  (default is None)
+        ipos : int
+            Byte position in the list file to start reading from.
+            (default is 0)
 
-                idxs.append([ts, sp, seekpoint])
+        Returns
+        -------
+        idx_map : list
+            [ts, sp, seekpoint] of each budget table.
+        incs, cums : lists of dicts
+            Incremental and cumulative budget entries of each budget table.
+        totim : list
+            Simulation time of each budget table.
+        npending : int
+            Number of budget tables at the end of the list file that are
+            not followed by a time summary.  Their totim is nan.
+        ipos : int
+            Byte position to continue reading from when the list file
+            grows.  This is the position of the first pending budget table,
+            or of the end of the last complete line.
 
-                if maxentries and len(idxs) >= maxentries:
+        """
+        bkey = self.budgetkey.encode("ascii")
+        tkey = b"TIME SUMMARY AT END"
+        idx_map, incs, cums, totim = [], [], [], []
+
+        # budget tables that are waiting for a time summary
+        pending = []
+
+        with open(self.file_name, "rb") as f:
+            lastline = [b""]
+
+            def readline():
+                lastline[0] = f.readline()
+                return lastline[0].decode("ascii", "replace")
+
+            f.seek(ipos)
+            while True:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    # end of file or a line that is still being written
+                    ipos = f.tell() - len(line)
                     break
+                if bkey in line:
+                    if maxentries and len(idx_map) >= maxentries:
+                        continue
+                    seekpoint = f.tell() - len(line)
+                    line = line.decode("ascii", "replace")
+                    for l in range(self.tssp_lines):
+                        line = readline()
+                    try:
+                        ts, sp = self._get_ts_sp(line)
+                    except:
+                        print("unable to cast ts,sp on line: ", line)
+                        ipos = f.tell()
+                        break
+                    tinc, tcum = self._read_sp(ts, sp, readline)
+                    idx_map.append([ts, sp, seekpoint])
+                    incs.append(tinc)
+                    cums.append(tcum)
+                    totim.append(np.NaN)
+                    pending.append(len(totim) - 1)
+                elif tkey in line:
+                    if pending:
+                        ts, sp = idx_map[pending[-1]][:2]
+                        tslen, sptim, tt = self._read_totim(
+                            ts, sp, readline, ihead=1
+                        )
+                        if not lastline[0].endswith(b"\n"):
+                            # time summary is still being written
+                            break
+                        for idx in pending:
+                            totim[idx] = tt
+                        pending = []
+                    if maxentries and len(idx_map) >= maxentries:
+                        ipos = f.tell()
+                        break
 
-        return idxs
+        if pending:
+            ipos = idx_map[pending[0]][2]
+        return idx_map, incs, cums, totim, len(pending), ipos
 
     def _seek_to_string(self, s):
         """
@@ -738,52 +907,63 @@ class ListBudget(object):
 
         return ts, sp
 
-    def _set_entries(self):
-        if len(self.idx_map) < 1:
-            return None, None
-        if len(self.entries) > 0:
-            raise Exception("entries already set:" + str(self.entries))
-        if not self.idx_map:
-            raise Exception("must call build_index before call set_entries")
-        try:
-            incdict, cumdict = self._get_sp(
-                self.idx_map[0][0], self.idx_map[0][1], self.idx_map[0][2]
-            )
-        except:
-            raise Exception(
-                "unable to read budget information from first "
-                "entry in list file"
-            )
-        self.entries = incdict.keys()
-        null_entries = collections.OrderedDict()
-        incdict = collections.OrderedDict()
-        cumdict = collections.OrderedDict()
-        for entry in self.entries:
-            incdict[entry] = []
-            cumdict[entry] = []
-            null_entries[entry] = np.NaN
-        self.null_entries = [null_entries, null_entries]
-        return incdict, cumdict
-
     def _load(self, maxentries=None):
-        self._build_index(maxentries)
-        incdict, cumdict = self._set_entries()
-        if incdict is None and cumdict is None:
+        self._ipos = 0
+        self._npending = 0
+        if self._cache_data and _read_budget_cache(self):
             return
-        totim = []
-        for ts, sp, seekpoint in self.idx_map:
-            tinc, tcum = self._get_sp(ts, sp, seekpoint)
-            for entry in self.entries:
-                incdict[entry].append(tinc[entry])
-                cumdict[entry].append(tcum[entry])
 
-            # Get the time for this record
-            seekpoint = self._seek_to_string("TIME SUMMARY AT END")
-            tslen, sptim, tt = self._get_totim(ts, sp, seekpoint)
-            totim.append(tt)
+        # entries of budget tables that could not be read are set to nan
+        self.null_entries = [{}, {}]
+        self._update(maxentries)
+
+        if self._cache_data and len(self.idx_map) > 0:
+            _write_budget_cache(self)
+        return
+
+    def _update(self, maxentries=None):
+        """
+        Read the budget tables from the last read position in the list file
+        and add them to the incremental and cumulative recarrays.  Budget
+        tables that were not followed by a time summary when the list file
+        was last read are read again and replaced.
+
+        Returns
+        -------
+        nkeep : int
+            Number of budget tables that were kept from the last read.
+
+        """
+        nkeep = len(self.idx_map) - self._npending
+        (
+            idx_map,
+            incs,
+            cums,
+            totim,
+            npending,
+            ipos,
+        ) = self._read_budgets(maxentries, self._ipos)
+
+        if len(self.entries) < 1:
+            if len(incs) < 1 or len(incs[0]) < 1:
+                if len(incs) > npending:
+                    raise Exception(
+                        "unable to read budget information from first "
+                        "entry in list file"
+                    )
+                # the first budget table has not been completely written
+                self._ipos = ipos
+                return nkeep
+            self.entries = list(incs[0].keys())
+            null_entries = collections.OrderedDict()
+            for entry in self.entries:
+                null_entries[entry] = np.NaN
+            self.null_entries = [null_entries, null_entries]
+        self._ipos = ipos
+        self._npending = npending
 
         # get kstp and kper
-        idx_array = np.array(self.idx_map)
+        idx_array = np.array(idx_map, dtype=np.int64).reshape(-1, 3)
 
         # build dtype for recarray
         dtype_tups = [
@@ -796,32 +976,121 @@ class ListBudget(object):
         dtype = np.dtype(dtype_tups)
 
         # create recarray
-        nentries = len(incdict[entry])
-        self.inc = np.recarray(shape=(nentries,), dtype=dtype)
-        self.cum = np.recarray(shape=(nentries,), dtype=dtype)
+        nentries = len(idx_map)
+        inc = np.recarray(shape=(nentries,), dtype=dtype)
+        cum = np.recarray(shape=(nentries,), dtype=dtype)
 
         # fill each column of the recarray
         for entry in self.entries:
-            self.inc[entry] = incdict[entry]
-            self.cum[entry] = cumdict[entry]
+            inc[entry] = [tinc.get(entry, np.NaN) for tinc in incs]
+            cum[entry] = [tcum.get(entry, np.NaN) for tcum in cums]
 
         # file the totim, time_step, and stress_period columns for the
         # incremental and cumulative recarrays (zero-based kstp,kper)
-        self.inc["totim"] = np.array(totim)[:]
-        self.inc["time_step"] = idx_array[:, 0] - 1
-        self.inc["stress_period"] = idx_array[:, 1] - 1
+        inc["totim"] = np.array(totim)[:]
+        inc["time_step"] = idx_array[:, 0] - 1
+        inc["stress_period"] = idx_array[:, 1] - 1
+
+        cum["totim"] = np.array(totim)[:]
+        cum["time_step"] = idx_array[:, 0] - 1
+        cum["stress_period"] = idx_array[:, 1] - 1
+
+        # add to the budget tables that were kept
+        if nkeep > 0:
+            inc = np.concatenate((self.inc[:nkeep], inc)).view(np.recarray)
+            cum = np.concatenate((self.cum[:nkeep], cum)).view(np.recarray)
+        self.inc = inc
+        self.cum = cum
+        self.idx_map = self.idx_map[:nkeep] + idx_map
+        return nkeep
+
+    def refresh(self):
+        """
+        Read the budget tables that have been added to the list file since
+        it was loaded or last refreshed, for example, while a model is
+        running.  Only the part of the list file after the last complete
+        budget table is read.  A budget table is complete once the time
+        summary that follows it has been written.
 
-        self.cum["totim"] = np.array(totim)[:]
-        self.cum["time_step"] = idx_array[:, 0] - 1
-        self.cum["stress_period"] = idx_array[:, 1] - 1
+        Returns
+        -------
+        kstpkper : list of (kstp, kper) tuples
+            List of zero-based time steps and stress periods of the budget
+            tables that were added, or replaced because they were not
+            complete when the list file was last read.
 
-        return
+        Examples
+        --------
+        >>> mf_list = MfListBudget("my_model.list")
+        >>> kstpkper = mf_list.refresh()
+        >>> cum = mf_list.get_cumulative("PERCENT_DISCREPANCY")
+
+        """
+        nkeep = self._update()
+        self._isvalid = len(self.idx_map) > 0
+        if not self._isvalid:
+            return []
+        return self.get_kstpkper()[nkeep:]
+
+    def follow(self, interval=1.0, timeout=None):
+        """
+        Generator that yields time steps and stress periods as their budget
+        tables are written to the list file by a running model.  The budget
+        tables that are already in the list file are yielded first.
+
+        Parameters
+        ----------
+        interval : float
+            Number of seconds to wait between checks for new budget tables.
+            (default is 1.)
+        timeout : float
+            Stop if the list file does not grow within timeout seconds.  If
+            timeout is None, wait for new budget tables indefinitely.
+            (default is None)
+
+        Yields
+        ------
+        kstpkper : tuple
+            Zero-based time step and stress period of a complete budget
+            table.
+
+        Examples
+        --------
+        >>> mf_list = MfListBudget("my_model.list")
+        >>> for kstpkper in mf_list.follow(interval=5., timeout=600.):
+        ...     inc = mf_list.get_data(kstpkper=kstpkper, incremental=True)
+
+        """
+        nyield = 0
+        filesize = None
+        tlast = time.time()
+        while True:
+            size = os.path.getsize(self.file_name)
+            if size != filesize:
+                filesize = size
+                tlast = time.time()
+            self.refresh()
+            stop = timeout is not None and time.time() - tlast >= timeout
+            ncomplete = len(self.idx_map)
+            if not stop:
+                ncomplete -= self._npending
+            if ncomplete > nyield:
+                kstpkper = self.get_kstpkper()
+                while nyield < ncomplete:
+                    yield kstpkper[nyield]
+                    nyield += 1
+            if stop:
+                return
+            time.sleep(interval)
 
     def _get_sp(self, ts, sp, seekpoint):
         self.f.seek(seekpoint)
+        return self._read_sp(ts, sp, self.f.readline)
+
+    def _read_sp(self, ts, sp, readline):
         # --read to the start of the "in" budget information
         while True:
-            line = self.f.readline()
+            line = readline()
             if line == "":
                 print(
                     "end of file found while seeking budget information for ts,sp",
@@ -831,7 +1100,7 @@ class ListBudget(object):
                 return self.null_entries
 
             # --if there are two '=' in this line, then it is a budget line
-            if len(re.findall("=", line)) == 2:
+            if line.count("=") == 2:
                 break
 
         tag = "IN"
@@ -848,7 +1117,7 @@ class ListBudget(object):
                     sp,
                 )
                 return self.null_entries
-            if len(re.findall("=", line)) == 2:
+            if line.count("=") == 2:
                 try:
                     entry, flux, cumu = self._parse_budget_line(line)
                 except Exception:
@@ -894,7 +1163,7 @@ class ListBudget(object):
                 if "OUT:" in line.upper():
                     tag = "OUT"
                     entrydict = {}
-            line = self.f.readline()
+            line = readline()
             if entry.upper() == "PERCENT DISCREPANCY":
                 break
 
@@ -902,17 +1171,11 @@ class ListBudget(object):
 
     def _parse_budget_line(self, line):
 
-        # get the budget item name
-        entry = line.strip().split("=")[0].strip()
-
-        # get the cumulative string
-        idx = line.index("=") + 1
-        line2 = line[idx:]
-        ll = line2.strip().split()
-        cu_str = ll[0]
-
-        idx = line2.index("=") + 1
-        fx_str = line2[idx:].split()[0].strip()
+        # get the budget item name and the cumulative and flux strings
+        entry, line2, line3 = line.split("=", 2)
+        entry = entry.strip()
+        cu_str = line2.split()[0]
+        fx_str = line3.split()[0]
 
         #
         # cu_str = line[self.cumu_idxs[0]:self.cumu_idxs[1]]
@@ -933,10 +1196,13 @@ class ListBudget(object):
 
     def _get_totim(self, ts, sp, seekpoint):
         self.f.seek(seekpoint)
-        # --read header lines
-        ihead = 0
+        return self._read_totim(ts, sp, self.f.readline)
+
+    def _read_totim(self, ts, sp, readline, ihead=0):
+        # --read header lines, ihead is the number of lines of the time
+        #   summary that have already been read
         while True:
-            line = self.f.readline()
+            line = readline()
             ihead += 1
             if line == "":
                 print(
@@ -955,12 +1221,12 @@ class ListBudget(object):
                 "-----------------------------------------------------------"
                 in line
             ):
-                line = self.f.readline()
+                line = readline()
                 break
 
         if isinstance(self, SwtListBudget):
             translen = self._parse_time_line(line)
-            line = self.f.readline()
+            line = readline()
             if translen is None:
                 print("error parsing translen for ts,sp", ts, sp)
                 return np.NaN, np.NaN, np.NaN
@@ -970,12 +1236,12 @@ class ListBudget(object):
             print("error parsing tslen for ts,sp", ts, sp)
             return np.NaN, np.NaN, np.NaN
 
-        sptim = self._parse_time_line(self.f.readline())
+        sptim = self._parse_time_line(readline())
         if sptim is None:
             print("error parsing sptim for ts,sp", ts, sp)
             return np.NaN, np.NaN, np.NaN
 
-        totim = self._parse_time_line(self.f.readline())
+        totim = self._parse_time_line(readline())
         if totim is None:
             print("error parsing totim for ts,sp", ts, sp)
             return np.NaN, np.NaN, np.NaN
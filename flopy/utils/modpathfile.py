@@ -7,8 +7,7 @@ important classes that can be accessed by the user.
 
 """
 
-import itertools
-import collections
+import os
 import warnings
 import numpy as np
 
@@ -18,6 +17,378 @@ from ..utils.flopy_io import loadtxt
 from ..utils.recarray_utils import ra_slice
 
 
+def _read_mp7_pathlines(fname, skiprows, dtype, chunksize=2 ** 26):
+    """
+    Read the particle headers and pathline points of a MODPATH 7 pathline
+    file in a single pass.  The file is read in blocks of whole lines and
+    each block is parsed with numpy, using the number of values on each
+    line to separate particle headers (4 values) from pathline points
+    (one value for each field in dtype).
+
+    Returns
+    -------
+    headers : numpy array
+        Array of size (nparticles, 4) with the sequence number, particle
+        group, particle id and number of points of each pathline.
+    points : numpy array
+        Array of size (npoints, len(dtype)) with the pathline points.
+    start : numpy array
+        Index of the first point of each pathline.
+
+    """
+    npts = len(dtype.names)
+    headers, points, start = [], [], []
+    ipos = 0
+    remainder = b""
+    with open(fname, "rb") as f:
+        for n in range(skiprows):
+            f.readline()
+        while True:
+            block = f.read(chunksize)
+            if block:
+                block = remainder + block
+                idx = block.rfind(b"\n") + 1
+                if idx == 0:
+                    remainder = block
+                    continue
+                block, remainder = block[:idx], block[idx:]
+            else:
+                block, remainder = remainder, b""
+                if len(block.strip()) == 0:
+                    break
+
+            # count the values on each line
+            b = np.frombuffer(block, dtype=np.uint8)
+            space = b <= 32
+            first = ~space
+            first[1:] &= space[:-1]
+            newline = np.flatnonzero(b == 10)
+            line = np.searchsorted(newline, np.flatnonzero(first))
+            nval = np.bincount(line, minlength=newline.shape[0] + 1)
+            ishead = nval == 4
+            ispoint = nval == npts
+            if np.any(nval[~ishead & ~ispoint] != 0):
+                raise Exception(
+                    "{} is not a valid pathline file".format(fname)
+                )
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                values = np.fromstring(block, dtype=np.float64, sep=" ")
+            if values.size != nval.sum():
+                raise Exception(
+                    "{} is not a valid pathline file".format(fname)
+                )
+            kind = np.repeat(ishead, nval)
+            headers.append(values[kind].reshape(-1, 4))
+            points.append(values[~kind].reshape(-1, npts))
+            start.append(np.cumsum(ispoint)[ishead] + ipos)
+            ipos += points[-1].shape[0]
+
+    if len(headers) == 0:
+        return np.zeros((0, 4), np.int64), np.zeros((0, npts)), []
+    headers = np.concatenate(headers).astype(np.int64)
+    points = np.concatenate(points)
+    start = np.concatenate(start)
+    count = np.diff(np.append(start, points.shape[0]))
+    if not np.array_equal(count, headers[:, 3]):
+        raise Exception(
+            "{} is not a valid pathline file".format(fname)
+            + " - the number of points does not match the pathline "
+            + "headers"
+        )
+    return headers, points, start
+
+
+# tag and key written after the array in a MODPATH data cache file
+_cache_key_dtype = np.dtype(
+    [("tag", "S8"), ("filesize", "<i8"), ("mtime", "<i8")]
+)
+_cache_tag = b"FLOPYMPC"
+
+
+def _get_data_cache_name(fname):
+    """
+    Return the name of the data cache file for a MODPATH output file.
+
+    """
+    return "{}.flopynpy".format(fname)
+
+
+def _write_data_cache(fname, data):
+    """
+    Write the parsed records of a MODPATH output file to a sidecar data
+    cache file (<fname>.flopynpy).  The records are written in the numpy
+    .npy format, followed by the size and modification time of the MODPATH
+    output file so that the cache can be invalidated when it changes.
+
+    Parameters
+    ----------
+    fname : str
+        Name of the MODPATH output file.
+    data : numpy structured array
+        Parsed records of the MODPATH output file.
+
+    Returns
+    -------
+    success : bool
+        True if the data cache file was written.
+
+    """
+    stat = os.stat(fname)
+    key = np.array(
+        [(_cache_tag, stat.st_size, stat.st_mtime_ns)], dtype=_cache_key_dtype
+    )
+    cname = _get_data_cache_name(fname)
+    tname = cname + ".tmp"
+    try:
+        with open(tname, "wb") as f:
+            np.lib.format.write_array(
+                f, np.ascontiguousarray(data), allow_pickle=False
+            )
+            f.write(key.tobytes())
+        os.replace(tname, cname)
+    except (IOError, OSError) as e:
+        msg = "could not write data cache for {}: {}".format(fname, e)
+        warnings.warn(msg)
+        if os.path.isfile(tname):
+            os.remove(tname)
+        return False
+    return True
+
+
+def _read_data_cache(fname):
+    """
+    Memory map the parsed records of a MODPATH output file from a sidecar
+    data cache file (<fname>.flopynpy), if it exists and is valid for the
+    current size and modification time of the MODPATH output file.
+
+    Parameters
+    ----------
+    fname : str
+        Name of the MODPATH output file.
+
+    Returns
+    -------
+    data : numpy structured array or None
+        Read-only memory-mapped records, or None if there is no valid
+        data cache file.
+
+    """
+    cname = _get_data_cache_name(fname)
+    if not os.path.isfile(cname):
+        return None
+    stat = os.stat(fname)
+    try:
+        with open(cname, "rb") as f:
+            f.seek(-_cache_key_dtype.itemsize, os.SEEK_END)
+            key = np.frombuffer(f.read(), dtype=_cache_key_dtype)[0]
+        if (
+            key["tag"] != _cache_tag
+            or key["filesize"] != stat.st_size
+            or key["mtime"] != stat.st_mtime_ns
+        ):
+            return None
+        data = np.load(cname, mmap_mode="r", allow_pickle=False)
+        if data.dtype.names is None or "particleid" not in data.dtype.names:
+            return None
+    except Exception:
+        return None
+    return data
+
+
+def _build_particle_index(particleid):
+    """
+    Build an index to the records of each particle.
+
+    Returns
+    -------
+    ids : numpy array
+        Sorted unique particle ids.
+    start, count : numpy arrays
+        Position of the first record and number of records of each
+        particle in the record order.
+    order : numpy array or None
+        Record order that groups the records of each particle.  None if
+        the records of each particle are already contiguous and sorted by
+        particle id, in which case start and count refer to the records
+        themselves.
+
+    """
+    particleid = np.asarray(particleid)
+    if particleid.shape[0] == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return particleid.copy(), empty, empty, None
+    start = np.flatnonzero(particleid[1:] != particleid[:-1]) + 1
+    start = np.concatenate(([0], start))
+    ids = particleid[start]
+    if np.all(ids[1:] > ids[:-1]):
+        order = None
+    else:
+        order = np.argsort(particleid, kind="stable")
+        ids, start = np.unique(particleid[order], return_index=True)
+    count = np.diff(np.append(start, particleid.shape[0]))
+    return ids, start, count, order
+
+
+def _get_particle_records(obj, partid, totim=None, ge=True):
+    """
+    Get the records of particle partid from obj._data, using the particle
+    index of obj.  Records are returned in file order.
+
+    """
+    i = np.searchsorted(obj._partids, partid)
+    if i < obj._partids.shape[0] and obj._partids[i] == partid:
+        i0 = obj._partstart[i]
+        i1 = i0 + obj._partcount[i]
+    else:
+        i0 = i1 = 0
+    if obj._partorder is None:
+        ra = obj._data[i0:i1]
+    else:
+        ra = obj._data[obj._partorder[i0:i1]]
+    if totim is not None:
+        if ge:
+            ra = ra[ra["time"] >= totim]
+        else:
+            ra = ra[ra["time"] <= totim]
+    return ra
+
+
+def _get_particle_selection(obj, partids=None, totim=None, ge=True):
+    """
+    Get the records of all particles or a set of particles from obj._data,
+    grouped by particle id, using the particle index of obj.
+
+    Returns
+    -------
+    ra : numpy structured array
+        Records of the particles, sorted by particle id.  The records of
+        each particle are in file order.
+    count : numpy array
+        Number of records of each particle in ra.
+
+    """
+    if obj._partids.shape[0] == 0:
+        return obj._data[:0], obj._partcount
+    if obj._partorder is None:
+        ra = obj._data
+    else:
+        ra = obj._data[obj._partorder]
+    count = obj._partcount
+    keep = None
+    if partids is not None:
+        partids = np.unique(partids)
+        ipart = np.searchsorted(obj._partids, partids)
+        valid = ipart < obj._partids.shape[0]
+        valid[valid] = obj._partids[ipart[valid]] == partids[valid]
+        selected = np.zeros(obj._partids.shape[0], dtype=bool)
+        selected[ipart[valid]] = True
+        keep = np.repeat(selected, count)
+        count = count[selected]
+    if totim is not None:
+        if ge:
+            intime = ra["time"] >= totim
+        else:
+            intime = ra["time"] <= totim
+        if keep is None:
+            keep = np.ones(ra.shape[0], dtype=bool)
+            selected = keep[obj._partstart]
+        count = np.add.reduceat(
+            (intime & keep).astype(np.int64), obj._partstart
+        )[selected]
+        keep &= intime
+    if keep is not None:
+        ra = ra[keep]
+    return ra, count
+
+
+def _split_particles(ra, count, names, dtype):
+    """
+    Split grouped particle records into a list of record arrays with the
+    fields in names, one for each particle.  The record arrays are views
+    of a single array.
+
+    """
+    if count.shape[0] == 0:
+        return []
+    ra = np.rec.fromarrays((ra[name] for name in names), dtype=dtype)
+    return np.split(ra, np.cumsum(count)[:-1])
+
+
+def _points_in_polygon(x, y, vx, vy):
+    """
+    Determine which points are inside a polygon using the even-odd rule.
+
+    Parameters
+    ----------
+    x, y : numpy arrays
+        Point coordinates.
+    vx, vy : numpy arrays
+        Polygon vertex coordinates.  The polygon does not need to be closed.
+
+    Returns
+    -------
+    inside : numpy array
+        Boolean array that is True for points inside the polygon.
+
+    """
+    inside = np.zeros(x.shape[0], dtype=bool)
+    for iv in range(len(vx)):
+        xa, ya = vx[iv - 1], vy[iv - 1]
+        xb, yb = vx[iv], vy[iv]
+        if ya == yb:
+            continue
+        crosses = (ya > y) != (yb > y)
+        xint = xa + (y - ya) * (xb - xa) / (yb - ya)
+        inside ^= crosses & (x < xint)
+    return inside
+
+
+def _segments_cross_polygon(xa, ya, xb, yb, vx, vy):
+    """
+    Determine which line segments cross the edges of a polygon.
+
+    Parameters
+    ----------
+    xa, ya, xb, yb : numpy arrays
+        Coordinates of the start and end points of the segments.
+    vx, vy : numpy arrays
+        Polygon vertex coordinates.  The polygon does not need to be closed.
+
+    Returns
+    -------
+    cross : numpy array
+        Boolean array that is True for segments that intersect or touch
+        an edge of the polygon.
+
+    """
+    cross = np.zeros(xa.shape[0], dtype=bool)
+    dx, dy = xb - xa, yb - ya
+    for iv in range(len(vx)):
+        xc, yc = vx[iv - 1], vy[iv - 1]
+        xd, yd = vx[iv], vy[iv]
+        # sides of the polygon edge on which the segment ends are, and
+        # sides of the segment on which the polygon edge ends are
+        d1 = (xd - xc) * (ya - yc) - (yd - yc) * (xa - xc)
+        d2 = (xd - xc) * (yb - yc) - (yd - yc) * (xb - xc)
+        d3 = dx * (yc - ya) - dy * (xc - xa)
+        d4 = dx * (yd - ya) - dy * (xd - xa)
+        crosses = (d1 * d2 <= 0.0) & (d3 * d4 <= 0.0)
+        # collinear segments only cross if their extents overlap
+        collinear = (d1 == 0.0) & (d2 == 0.0)
+        if collinear.any():
+            overlap = (
+                (np.minimum(xa, xb) <= max(xc, xd))
+                & (np.maximum(xa, xb) >= min(xc, xd))
+                & (np.minimum(ya, yb) <= max(yc, yd))
+                & (np.maximum(ya, yb) >= min(yc, yd))
+            )
+            crosses &= ~collinear | overlap
+        cross |= crosses
+    return cross
+
+
 class PathlineFile:
     """
     PathlineFile Class.
@@ -28,6 +399,12 @@ class PathlineFile:
         Name of the pathline file
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_data : bool
+        Read the parsed records from, or write them to, a data cache file
+        (<filename>.flopynpy) so that the file does not need to be parsed
+        again the next time it is opened.  Cached records are memory mapped
+        read-only.  The cache is rebuilt if the size or modification time
+        of the file changes.  Default is False.
 
     Examples
     --------
@@ -50,7 +427,7 @@ class PathlineFile:
         "sequencenumber",
     ]
 
-    def __init__(self, filename, verbose=False):
+    def __init__(self, filename, verbose=False, cache_data=False):
         """
         Class constructor.
 
@@ -64,23 +441,51 @@ class PathlineFile:
         # set output dtype
         self.outdtype = self._get_outdtype()
 
+        # read pathline data from the data cache file
+        self._data = None
+        if cache_data:
+            self._data = _read_data_cache(self.fname)
+
         # set data dtype and read pathline data
-        if self.version == 7:
-            self.dtype, self._data = self._get_mp7data()
+        if self._data is not None:
+            if self.version == 7:
+                self.dtype = self._data.dtype
+            else:
+                self.dtype = self._get_dtypes()
         else:
-            self.dtype = self._get_dtypes()
-            self._data = loadtxt(
-                self.file, dtype=self.dtype, skiprows=self.skiprows
-            )
+            if self.version == 7:
+                self.dtype, self._data = self._get_mp7data()
+            else:
+                self.dtype = self._get_dtypes()
+                self._data = loadtxt(
+                    self.file, dtype=self.dtype, skiprows=self.skiprows
+                )
 
-        # convert layer, row, and column indices; particle id and group; and
-        #  line segment indices to zero-based
-        for n in self.kijnames:
-            if n in self._data.dtype.names:
-                self._data[n] -= 1
+            # convert layer, row, and column indices; particle id and
+            #  group; and line segment indices to zero-based
+            for n in self.kijnames:
+                if n in self._data.dtype.names:
+                    self._data[n] -= 1
+
+            if cache_data:
+                _write_data_cache(self.fname, self._data)
+
+        # index the records of each particle
+        (
+            self._partids,
+            self._partstart,
+            self._partcount,
+            self._partorder,
+        ) = _build_particle_index(self._data["particleid"])
 
         # set number of particle ids
-        self.nid = np.unique(self._data["particleid"])
+        self.nid = self._partids
+
+        # cell, xy and segment indexes are built the first time they are
+        # needed
+        self._cellindex = None
+        self._xyindex = None
+        self._segindex = None
 
         # close the input file
         self.file.close()
@@ -217,54 +622,25 @@ class PathlineFile:
                 ("timestep", np.int32),
             ]
         )
-        idx = 0
-        part_dict = collections.OrderedDict()
-        ndata = 0
-        while True:
-            if idx == 0:
-                for n in range(self.skiprows):
-                    line = self.file.readline()
-            # read header line
-            try:
-                line = self.file.readline().strip()
-                if self.verbose:
-                    print(line)
-                if len(line) < 1:
-                    break
-            except:
-                break
-            t = [int(s) for j, s in enumerate(line.split()) if j < 4]
-            sequencenumber, group, particleid, pathlinecount = t[0:4]
-            ndata += pathlinecount
-            # read in the particle data
-            d = np.loadtxt(
-                itertools.islice(self.file, 0, pathlinecount), dtype=dtyper
-            )
-            key = (idx, sequencenumber, group, particleid, pathlinecount)
-            part_dict[key] = d.copy()
-            idx += 1
+        headers, points, start = _read_mp7_pathlines(
+            self.fname, self.skiprows, dtyper
+        )
 
         # create data array
-        data = np.zeros(ndata, dtype=dtype)
-
-        # fill data
-        ipos0 = 0
-        for key, value in part_dict.items():
-            idx, sequencenumber, group, particleid, pathlinecount = key[0:5]
-            ipos1 = ipos0 + pathlinecount
-            # fill constant items for particle
-            # particleid is not necessarily unique for all pathlines - use
-            # sequencenumber which is unique
-            data["particleid"][ipos0:ipos1] = sequencenumber
-            # set particlegroup and sequence number
-            data["particlegroup"][ipos0:ipos1] = group
-            data["sequencenumber"][ipos0:ipos1] = sequencenumber
-            # save particleidloc to particleid
-            data["particleidloc"][ipos0:ipos1] = particleid
-            # fill particle data
-            for name in value.dtype.names:
-                data[name][ipos0:ipos1] = value[name]
-            ipos0 = ipos1
+        data = np.zeros(points.shape[0], dtype=dtype)
+
+        # fill constant items for each particle - particleid is not
+        # necessarily unique for all pathlines - use sequencenumber which
+        # is unique and save particleid to particleidloc
+        ipart = np.repeat(np.arange(headers.shape[0]), headers[:, 3])
+        data["particleid"] = headers[ipart, 0]
+        data["particlegroup"] = headers[ipart, 1]
+        data["sequencenumber"] = headers[ipart, 0]
+        data["particleidloc"] = headers[ipart, 2]
+
+        # fill particle data
+        for idx, name in enumerate(dtyper.names):
+            data[name] = points[:, idx]
 
         return dtype, data
 
@@ -330,19 +706,7 @@ class PathlineFile:
         >>> p1 = pthobj.get_data(partid=1)
 
         """
-        # idx = self._data['particleid'] == partid
-        if totim is not None:
-            if ge:
-                idx = (self._data["time"] >= totim) & (
-                    self._data["particleid"] == partid
-                )
-            else:
-                idx = (self._data["time"] <= totim) & (
-                    self._data["particleid"] == partid
-                )
-        else:
-            idx = self._data["particleid"] == partid
-        self._ta = self._data[idx]
+        self._ta = _get_particle_records(self, partid, totim=totim, ge=ge)
         names = ["x", "y", "z", "time", "k", "particleid"]
         return np.rec.fromarrays(
             (self._ta[name] for name in names), dtype=self.outdtype
@@ -384,13 +748,9 @@ class PathlineFile:
         >>> p = pthobj.get_alldata()
 
         """
-        # plist = []
-        # for partid in self.nid:
-        #     plist.append(self.get_data(partid=partid, totim=totim, ge=ge))
-        return [
-            self.get_data(partid=partid, totim=totim, ge=ge)
-            for partid in self.nid
-        ]
+        ra, count = _get_particle_selection(self, totim=totim, ge=ge)
+        names = ["x", "y", "z", "time", "k", "particleid"]
+        return _split_particles(ra, count, names, self.outdtype)
 
     def get_destination_pathline_data(self, dest_cells, to_recarray=False):
         """
@@ -399,7 +759,9 @@ class PathlineFile:
         Parameters
         ----------
         dest_cells : list or array of tuples
-            (k, i, j) of each destination cell (zero-based)
+            (k, i, j) of each destination cell for MODPATH 3, 5 and 6
+            pathline files or node number of each destination cell for
+            MODPATH 7 pathline files (zero-based)
         to_recarray : bool
             Boolean that controls returned pthldest. If to_recarray is True,
             a single recarray with all of the pathlines that intersect
@@ -423,54 +785,376 @@ class PathlineFile:
 
         """
 
-        # create local copy of _data
-        ra = np.array(self._data)
+        # find the particles that pass through dest_cells
+        partids = self.particles_through_cells(dest_cells)
 
-        # find the intersection of pathlines and dest_cells
-        # convert dest_cells to same dtype for comparison
+        # use particle ids to get the rest of the paths
+        pthldes, count = _get_particle_selection(self, partids)
+        if to_recarray:
+            pthldes = pthldes.copy()
+            pthldes.sort(order=["particleid", "time"])
+            pthldes = pthldes.view(np.recarray)
+        else:
+            names = ["x", "y", "z", "time", "k", "particleid"]
+            pthldes = _split_particles(pthldes, count, names, self.outdtype)
+
+        return pthldes
+
+    def _get_cellids(self, cells):
+        """
+        Convert cells to integer cell ids.  cells are (k, i, j) tuples for
+        MODPATH 3, 5 and 6 pathline files and node numbers for MODPATH 7
+        pathline files (zero-based), or a structured array with the same
+        fields.  Cells outside of the cells in the pathline data are
+        set to -1.
+
+        """
+        cells = np.asarray(cells)
         if self.version < 7:
-            try:
-                raslice = ra[["k", "i", "j"]]
-            except:
-                msg = (
-                    "could not extract 'k', 'i', and 'j' keys "
-                    + "from pathline data"
+            if cells.dtype.names is not None:
+                kij = [cells[n] for n in ("k", "i", "j")]
+            else:
+                kij = cells.reshape(-1, 3).T
+            k, i, j = (np.asarray(v, dtype=np.int64).ravel() for v in kij)
+            nlay, nrow, ncol = self._cellshape
+            cellids = (k * nrow + i) * ncol + j
+            valid = (k >= 0) & (k < nlay) & (i >= 0) & (i < nrow)
+            valid &= (j >= 0) & (j < ncol)
+            cellids[~valid] = -1
+        else:
+            if cells.dtype.names is not None:
+                cells = cells["node"]
+            cellids = np.asarray(cells, dtype=np.int64).ravel()
+        return cellids
+
+    def _get_cell_index(self):
+        """
+        Build, or return, the cell index of the pathline data.  The index
+        maps each cell to the particles that pass through it in compressed
+        sparse row form, with the first time that each particle is in the
+        cell.
+
+        Returns
+        -------
+        cellids : numpy array
+            Sorted ids of the cells with pathline points.
+        indptr : numpy array
+            Position of the particles of each cell in ipart and time.
+        ipart : numpy array
+            Index of the particles in PathlineFile.nid.
+        time : numpy array
+            First time that each particle is in the cell.
+
+        """
+        if self._cellindex is not None:
+            return self._cellindex
+        ra = self._data
+        if self.version < 7:
+            if ra.shape[0] > 0:
+                self._cellshape = tuple(
+                    int(ra[n].max()) + 1 for n in ("k", "i", "j")
                 )
-                raise KeyError(msg)
+            else:
+                self._cellshape = (0, 0, 0)
+        npart = self._partids.shape[0]
+        if npart == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            indptr = np.zeros(1, dtype=np.int64)
+            self._cellindex = (empty, indptr, empty, ra["time"])
+            return self._cellindex
+
+        # sort unique cell and particle pairs by time
+        ipart = np.searchsorted(self._partids, ra["particleid"])
+        key = self._get_cellids(ra) * npart + ipart
+        order = np.lexsort((ra["time"], key))
+        key = key[order]
+        first = np.ones(key.shape[0], dtype=bool)
+        first[1:] = key[1:] != key[:-1]
+        key = key[first]
+        time = ra["time"][order[first]]
+        cellids, indptr = np.unique(key // npart, return_index=True)
+        indptr = np.append(indptr, key.shape[0])
+        self._cellindex = (cellids, indptr, key % npart, time)
+        return self._cellindex
+
+    def _get_cell_particles(self, cells):
+        """
+        Get the index of the particles that pass through cells and the
+        first time that each particle is in each of the cells.
+
+        """
+        cellids, indptr, ipart, time = self._get_cell_index()
+        query = np.unique(self._get_cellids(cells))
+        icell = np.searchsorted(cellids, query)
+        valid = icell < cellids.shape[0]
+        valid[valid] = cellids[icell[valid]] == query[valid]
+        icell = icell[valid]
+        start = indptr[icell]
+        count = indptr[icell + 1] - start
+        idx = np.arange(count.sum()) + np.repeat(
+            start - np.cumsum(count) + count, count
+        )
+        return ipart[idx], time[idx]
+
+    def _get_xy_index(self):
+        """
+        Build, or return, a uniform bucket grid over the x and y
+        coordinates of the pathline points.  Each bucket has about 16
+        points on average.
+
+        """
+        if self._xyindex is not None:
+            return self._xyindex
+        x = np.asarray(self._data["x"], dtype=np.float64)
+        y = np.asarray(self._data["y"], dtype=np.float64)
+        if x.shape[0] == 0:
+            order = np.zeros(0, dtype=np.int64)
+            indptr = np.zeros(2, dtype=np.int64)
+            self._xyindex = (0.0, 0.0, 1.0, 1.0, 1, order, indptr)
+            return self._xyindex
+        nbin = int(min(max(np.sqrt(x.shape[0] / 16.0), 1), 1024))
+        x0, y0 = x.min(), y.min()
+        dx = (x.max() - x0) / nbin
+        dy = (y.max() - y0) / nbin
+        if dx <= 0.0:
+            dx = 1.0
+        if dy <= 0.0:
+            dy = 1.0
+        ix = np.clip(((x - x0) / dx).astype(np.int64), 0, nbin - 1)
+        iy = np.clip(((y - y0) / dy).astype(np.int64), 0, nbin - 1)
+        bucket = ix * nbin + iy
+        order = np.argsort(bucket, kind="stable")
+        indptr = np.searchsorted(bucket[order], np.arange(nbin * nbin + 1))
+        self._xyindex = (x0, y0, dx, dy, nbin, order, indptr)
+        return self._xyindex
+
+    def _get_segment_index(self):
+        """
+        Build, or return, the segments of the pathlines and their
+        buckets in the bucket grid of the pathline points.  A segment is
+        in all the buckets that its bounding box overlaps.
+
+        Returns
+        -------
+        p0, p1 : numpy arrays
+            Index of the start and end points of each segment.
+        order : numpy array
+            Segments sorted by bucket.
+        indptr : numpy array
+            Position of the segments of each bucket in order.
+
+        """
+        if self._segindex is not None:
+            return self._segindex
+        x0, y0, dx, dy, nbin, _, _ = self._get_xy_index()
+
+        # consecutive points of each particle
+        npts = self._data.shape[0]
+        if self._partorder is None:
+            points = np.arange(npts)
         else:
-            try:
-                raslice = ra[["node"]]
-            except:
-                msg = "could not extract 'node' key from pathline data"
-                raise KeyError(msg)
-            if isinstance(dest_cells, (list, tuple)):
-                allint = all(isinstance(el, int) for el in dest_cells)
-                # convert to a list of tuples
-                if allint:
-                    t = []
-                    for el in dest_cells:
-                        t.append((el,))
-                        dest_cells = t
+            points = self._partorder
+        first = np.zeros(npts, dtype=bool)
+        first[self._partstart] = True
+        iseg = np.flatnonzero(~first[1:]) + 1
+        p0, p1 = points[iseg - 1], points[iseg]
+
+        # bucket ranges of the segment bounding boxes
+        x = np.asarray(self._data["x"], dtype=np.float64)
+        y = np.asarray(self._data["y"], dtype=np.float64)
+        ix = np.clip(((x - x0) / dx).astype(np.int64), 0, nbin - 1)
+        iy = np.clip(((y - y0) / dy).astype(np.int64), 0, nbin - 1)
+        ix0 = np.minimum(ix[p0], ix[p1])
+        iy0 = np.minimum(iy[p0], iy[p1])
+        nx = np.abs(ix[p0] - ix[p1]) + 1
+        ny = np.abs(iy[p0] - iy[p1]) + 1
+
+        # one entry for each segment and bucket pair
+        n = nx * ny
+        seg = np.repeat(np.arange(p0.shape[0]), n)
+        local = np.arange(seg.shape[0]) - np.repeat(np.cumsum(n) - n, n)
+        bucket = (ix0[seg] + local // ny[seg]) * nbin + (
+            iy0[seg] + local % ny[seg]
+        )
+        order = np.argsort(bucket, kind="stable")
+        indptr = np.searchsorted(bucket[order], np.arange(nbin * nbin + 1))
+        self._segindex = (p0, p1, seg[order], indptr)
+        return self._segindex
 
-        dest_cells = np.array(dest_cells, dtype=raslice.dtype)
-        inds = np.in1d(raslice, dest_cells)
-        epdest = ra[inds].copy().view(np.recarray)
+    def _get_xy_candidates(self, xmin, xmax, ymin, ymax, segments=False):
+        """
+        Get the index of the pathline points, or of the pathline segments
+        if segments is True, in the buckets that overlap a bounding box.
 
-        if to_recarray:
-            # use particle ids to get the rest of the paths
-            inds = np.in1d(ra["particleid"], epdest.particleid)
-            pthldes = ra[inds].copy()
-            pthldes.sort(order=["particleid", "time"])
-            pthldes = pthldes.view(np.recarray)
+        """
+        x0, y0, dx, dy, nbin, order, indptr = self._get_xy_index()
+        if segments:
+            order, indptr = self._get_segment_index()[2:]
+        ix0 = max(int(np.floor((xmin - x0) / dx)), 0)
+        ix1 = min(int(np.floor((xmax - x0) / dx)), nbin - 1)
+        iy0 = max(int(np.floor((ymin - y0) / dy)), 0)
+        iy1 = min(int(np.floor((ymax - y0) / dy)), nbin - 1)
+        if ix0 > ix1 or iy0 > iy1:
+            return order[:0]
+        idx = np.concatenate(
+            [
+                order[indptr[ix * nbin + iy0] : indptr[ix * nbin + iy1 + 1]]
+                for ix in range(ix0, ix1 + 1)
+            ]
+        )
+        if segments:
+            idx = np.unique(idx)
+        return idx
+
+    def particles_through_cells(self, cells):
+        """
+        Get the ids of the particles with pathline points in a set of
+        cells.
+
+        Parameters
+        ----------
+        cells : list or array
+            (k, i, j) of each cell for MODPATH 3, 5 and 6 pathline files or
+            node number of each cell for MODPATH 7 pathline files
+            (zero-based).
+
+        Returns
+        -------
+        partids : numpy array
+            Sorted ids of the particles that pass through cells.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> p = flopy.utils.PathlineFile('modpath.pathline')
+        >>> partids = p.particles_through_cells([(0, 0, 0), (1, 0, 0)])
+
+        """
+        ipart, time = self._get_cell_particles(cells)
+        return self._partids[np.unique(ipart)]
+
+    def travel_time_to_cells(self, cells):
+        """
+        Get the first time that each particle is in any of a set of cells
+        and the travel time from the first point of its pathline.
+
+        Parameters
+        ----------
+        cells : list or array
+            (k, i, j) of each cell for MODPATH 3, 5 and 6 pathline files or
+            node number of each cell for MODPATH 7 pathline files
+            (zero-based).
+
+        Returns
+        -------
+        ra : np.recarray
+            Record array with the particleid, the first time the particle
+            is in cells (time) and the travel time (traveltime) of the
+            particles that pass through cells, sorted by particleid.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> p = flopy.utils.PathlineFile('modpath.pathline')
+        >>> tt = p.travel_time_to_cells([(0, 0, 0), (1, 0, 0)])
+
+        """
+        ipart, time = self._get_cell_particles(cells)
+        order = np.lexsort((time, ipart))
+        ipart, time = ipart[order], time[order]
+        first = np.ones(ipart.shape[0], dtype=bool)
+        first[1:] = ipart[1:] != ipart[:-1]
+        ipart, time = ipart[first], time[first]
+
+        # time of the first point of the pathline of each particle
+        t = self._data["time"]
+        if self._partorder is not None:
+            t = t[self._partorder]
+        if ipart.shape[0] > 0:
+            t0 = np.minimum.reduceat(t, self._partstart)[ipart]
         else:
+            t0 = time
 
-            # get list of unique particleids in selection
-            partids = np.unique(epdest["particleid"])
+        dtype = np.dtype(
+            [
+                ("particleid", np.int32),
+                ("time", t.dtype),
+                ("traveltime", t.dtype),
+            ]
+        )
+        ra = np.zeros(ipart.shape[0], dtype=dtype)
+        ra["particleid"] = self._partids[ipart]
+        ra["time"] = time
+        ra["traveltime"] = time - t0
+        return ra.view(np.recarray)
 
-            # build list of unique particleids in selection
-            pthldes = [self.get_data(partid) for partid in partids]
+    def particles_in_polygon(self, polygon):
+        """
+        Get the ids of the particles with pathlines inside a polygon, that
+        is with pathline points inside the polygon or pathline segments
+        that cross its edges.  Polygon coordinates are in the same
+        coordinate system as the pathline x and y coordinates.
 
-        return pthldes
+        Parameters
+        ----------
+        polygon : list of tuples or flopy.utils.geometry.Polygon
+            (x, y) of each polygon vertex, or a Polygon; holes in
+            the Polygon (interiors) are excluded.
+
+        Returns
+        -------
+        partids : numpy array
+            Sorted ids of the particles with pathlines inside the polygon.
+
+        Examples
+        --------
+
+        >>> import flopy
+        >>> p = flopy.utils.PathlineFile('modpath.pathline')
+        >>> partids = p.particles_in_polygon([(0., 0.), (100., 0.),
+        ...                                   (100., 100.)])
+
+        """
+        if hasattr(polygon, "exterior"):
+            exterior = polygon.exterior
+            interiors = polygon.interiors
+        else:
+            exterior = polygon
+            interiors = ()
+        exterior = np.asarray(exterior, dtype=np.float64)[:, :2]
+        vx, vy = exterior[:, 0], exterior[:, 1]
+        idx = self._get_xy_candidates(vx.min(), vx.max(), vy.min(), vy.max())
+        x = np.asarray(self._data["x"][idx], dtype=np.float64)
+        y = np.asarray(self._data["y"][idx], dtype=np.float64)
+        inside = _points_in_polygon(x, y, vx, vy)
+        rings = [exterior]
+        for interior in interiors:
+            interior = np.asarray(interior, dtype=np.float64)[:, :2]
+            rings.append(interior)
+            sel = np.flatnonzero(inside)
+            inside[sel] = ~_points_in_polygon(
+                x[sel], y[sel], interior[:, 0], interior[:, 1]
+            )
+        points = idx[inside]
+
+        # segments that cross the exterior or the interiors
+        p0, p1 = self._get_segment_index()[:2]
+        iseg = self._get_xy_candidates(
+            vx.min(), vx.max(), vy.min(), vy.max(), segments=True
+        )
+        x = np.asarray(self._data["x"], dtype=np.float64)
+        y = np.asarray(self._data["y"], dtype=np.float64)
+        xa, ya = x[p0[iseg]], y[p0[iseg]]
+        xb, yb = x[p1[iseg]], y[p1[iseg]]
+        cross = np.zeros(iseg.shape[0], dtype=bool)
+        for ring in rings:
+            cross |= _segments_cross_polygon(
+                xa, ya, xb, yb, ring[:, 0], ring[:, 1]
+            )
+        points = np.concatenate((points, p0[iseg[cross]]))
+        return np.unique(self._data["particleid"][points])
 
     def write_shapefile(
         self,
@@ -649,6 +1333,12 @@ class EndpointFile:
         Name of the endpoint file
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_data : bool
+        Read the parsed records from, or write them to, a data cache file
+        (<filename>.flopynpy) so that the file does not need to be parsed
+        again the next time it is opened.  Cached records are memory mapped
+        read-only.  The cache is rebuilt if the size or modification time
+        of the file changes.  Default is False.
 
     Examples
     --------
@@ -676,7 +1366,7 @@ class EndpointFile:
         "zone",
     ]
 
-    def __init__(self, filename, verbose=False):
+    def __init__(self, filename, verbose=False, cache_data=False):
         """
         Class constructor.
 
@@ -685,20 +1375,35 @@ class EndpointFile:
         self.verbose = verbose
         self._build_index()
         self.dtype = self._get_dtypes()
-        self._data = loadtxt(
-            self.file, dtype=self.dtype, skiprows=self.skiprows
-        )
-        # add particleid if required
-        self._add_particleid()
-
-        # convert layer, row, and column indices; particle id and group; and
-        #  line segment indices to zero-based
-        for n in self.kijnames:
-            if n in self._data.dtype.names:
-                self._data[n] -= 1
+        self._data = None
+        if cache_data:
+            self._data = _read_data_cache(self.fname)
+        if self._data is None:
+            self._data = loadtxt(
+                self.file, dtype=self.dtype, skiprows=self.skiprows
+            )
+            # add particleid if required
+            self._add_particleid()
+
+            # convert layer, row, and column indices; particle id and
+            #  group; and line segment indices to zero-based
+            for n in self.kijnames:
+                if n in self._data.dtype.names:
+                    self._data[n] -= 1
+
+            if cache_data:
+                _write_data_cache(self.fname, self._data)
+
+        # index the records of each particle
+        (
+            self._partids,
+            self._partstart,
+            self._partcount,
+            self._partorder,
+        ) = _build_particle_index(self._data["particleid"])
 
         # set number of particle ids
-        self.nid = np.unique(self._data["particleid"]).shape[0]
+        self.nid = self._partids.shape[0]
 
         # close the input file
         self.file.close()
@@ -980,9 +1685,7 @@ class EndpointFile:
         >>> e1 = endobj.get_data(partid=1)
 
         """
-        idx = self._data["particleid"] == partid
-        ra = self._data[idx]
-        return ra
+        return _get_particle_records(self, partid).copy()
 
     def get_alldata(self):
         """
@@ -1193,6 +1896,12 @@ class TimeseriesFile:
         Name of the timeseries file
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_data : bool
+        Read the parsed records from, or write them to, a data cache file
+        (<filename>.flopynpy) so that the file does not need to be parsed
+        again the next time it is opened.  Cached records are memory mapped
+        read-only.  The cache is rebuilt if the size or modification time
+        of the file changes.  Default is False.
 
     Examples
     --------
@@ -1215,7 +1924,7 @@ class TimeseriesFile:
         "timepointindex",
     ]
 
-    def __init__(self, filename, verbose=False):
+    def __init__(self, filename, verbose=False, cache_data=False):
         """
         Class constructor.
 
@@ -1232,19 +1941,36 @@ class TimeseriesFile:
         # set dtype
         self.dtype = self._get_dtypes()
 
+        # read data from the data cache file
+        self._data = None
+        if cache_data:
+            self._data = _read_data_cache(self.fname)
+
         # read data
-        self._data = loadtxt(
-            self.file, dtype=self.dtype, skiprows=self.skiprows
-        )
+        if self._data is None:
+            self._data = loadtxt(
+                self.file, dtype=self.dtype, skiprows=self.skiprows
+            )
 
-        # convert layer, row, and column indices; particle id and group; and
-        #  line segment indices to zero-based
-        for n in self.kijnames:
-            if n in self._data.dtype.names:
-                self._data[n] -= 1
+            # convert layer, row, and column indices; particle id and
+            #  group; and line segment indices to zero-based
+            for n in self.kijnames:
+                if n in self._data.dtype.names:
+                    self._data[n] -= 1
+
+            if cache_data:
+                _write_data_cache(self.fname, self._data)
+
+        # index the records of each particle
+        (
+            self._partids,
+            self._partstart,
+            self._partcount,
+            self._partorder,
+        ) = _build_particle_index(self._data["particleid"])
 
         # set number of particle ids
-        self.nid = np.unique(self._data["particleid"])
+        self.nid = self._partids
 
         # close the input file
         self.file.close()
@@ -1445,18 +2171,7 @@ class TimeseriesFile:
         >>> ts1 = tsobj.get_data(partid=1)
 
         """
-        if totim is not None:
-            if ge:
-                idx = (self._data["time"] >= totim) & (
-                    self._data["particleid"] == partid
-                )
-            else:
-                idx = (self._data["time"] <= totim) & (
-                    self._data["particleid"] == partid
-                )
-        else:
-            idx = self._data["particleid"] == partid
-        self._ta = self._data[idx]
+        self._ta = _get_particle_records(self, partid, totim=totim, ge=ge)
         names = ["x", "y", "z", "time", "k", "particleid"]
         return np.rec.fromarrays(
             (self._ta[name] for name in names), dtype=self.outdtype
@@ -1499,10 +2214,9 @@ class TimeseriesFile:
         >>> ts = tsobj.get_alldata()
 
         """
-        return [
-            self.get_data(partid=partid, totim=totim, ge=ge)
-            for partid in self.nid
-        ]
+        ra, count = _get_particle_selection(self, totim=totim, ge=ge)
+        names = ["x", "y", "z", "time", "k", "particleid"]
+        return _split_particles(ra, count, names, self.outdtype)
 
     def get_destination_timeseries_data(self, dest_cells):
         """
@@ -1563,7 +2277,7 @@ class TimeseriesFile:
         epdest = ra[inds].copy().view(np.recarray)
 
         # use particle ids to get the rest of the timeseries
-        inds = np.in1d(ra["particleid"], epdest.particleid)
-        tsdes = ra[inds].copy()
+        tsdes, count = _get_particle_selection(self, epdest.particleid)
+        tsdes = tsdes.copy()
         tsdes.sort(order=["particleid", "time"])
         return tsdes.view(np.recarray)
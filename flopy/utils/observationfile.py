@@ -1,11 +1,15 @@
+import io
+import os
 import numpy as np
 
 from ..utils.utils_def import FlopyBinaryData
+from ..utils.flopy_io import read_csv_values
 
 
 class ObsFiles(FlopyBinaryData):
     def __init__(self):
         super(ObsFiles, self).__init__()
+        self._mmap = False
         return
 
     def get_times(self):
@@ -59,7 +63,7 @@ class ObsFiles(FlopyBinaryData):
         """
         return list(self.data.dtype.names[1:])
 
-    def get_data(self, idx=None, obsname=None, totim=None):
+    def get_data(self, idx=None, obsname=None, totim=None, totim_range=None):
         """
         Get data from the observation file.
 
@@ -69,18 +73,22 @@ class ObsFiles(FlopyBinaryData):
             The zero-based record number.  The first record is record 0.
             If idx is None and totim are None, data for all simulation times
             are returned. (default is None)
-        obsname : string
-            The name of the observation to return. If obsname is None, all
-            observation data are returned. (default is None)
+        obsname : string or list of strings
+            The name(s) of the observation(s) to return. If obsname is None,
+            all observation data are returned. (default is None)
         totim : float
             The simulation time to return. If idx is None and totim are None,
             data for all simulation times are returned. (default is None)
+        totim_range : tuple of floats
+            Minimum and maximum simulation times to return, used if idx and
+            totim are None.  Either value can be None. (default is None)
 
         Returns
         ----------
         data : numpy record array
             Array has size (ntimes, nitems). totim is always returned. nitems
-            is 2 if idx or obsname is not None or nobs+1.
+            is 2 if idx or obsname is not None or nobs+1.  If the file is
+            memory mapped, data is a read-only view of the file.
 
         See Also
         --------
@@ -96,30 +104,11 @@ class ObsFiles(FlopyBinaryData):
         >>> ts = hyd.get_data()
 
         """
-        i0 = 0
-        i1 = self.data.shape[0]
-        if totim is not None:
-            idx = np.where(self.data["totim"] == totim)[0][0]
-            i0 = idx
-            i1 = idx + 1
-        elif idx is not None:
-            if idx < i1:
-                i0 = idx
-            i1 = i0 + 1
-        r = None
+        i0, i1 = self._get_record_range(idx, totim, totim_range)
+        obsname = self._get_obsname_list(obsname)
         if obsname is None:
-            obsname = self.get_obsnames()
-        else:
-            if obsname is not None:
-                if obsname not in self.data.dtype.names:
-                    obsname = None
-                else:
-                    if not isinstance(obsname, list):
-                        obsname = [obsname]
-        if obsname is not None:
-            obsname.insert(0, "totim")
-            r = get_selection(self.data, obsname)[i0:i1]
-        return r
+            return None
+        return get_selection(self.data, ["totim"] + obsname)[i0:i1]
 
     def get_dataframe(
         self,
@@ -128,6 +117,7 @@ class ObsFiles(FlopyBinaryData):
         obsname=None,
         totim=None,
         timeunit="D",
+        totim_range=None,
     ):
         """
         Get pandas dataframe with the incremental and cumulative water budget
@@ -142,9 +132,11 @@ class ObsFiles(FlopyBinaryData):
             The zero-based record number.  The first record is record 0.
             If idx is None and totim are None, a dataframe with all simulation
             times is  returned. (default is None)
-        obsname : string
-            The name of the observation to return. If obsname is None, all
-            observation data are returned. (default is None)
+        obsname : string or list of strings
+            The name(s) of the observation(s) to return. If obsname is None,
+            all observation data are returned. Only the columns of the
+            selected observations are copied to the dataframe.
+            (default is None)
         totim : float
             The simulation time to return. If idx is None and totim are None,
             a dataframe with all simulation times is returned.
@@ -152,6 +144,9 @@ class ObsFiles(FlopyBinaryData):
         timeunit : string
             time unit of the simulation time. Valid values are 'S'econds,
             'M'inutes, 'H'ours, 'D'ays, 'Y'ears. (default is 'D').
+        totim_range : tuple of floats
+            Minimum and maximum simulation times to return, used if idx and
+            totim are None.  Either value can be None. (default is None)
 
         Returns
         -------
@@ -180,6 +175,37 @@ class ObsFiles(FlopyBinaryData):
             msg = "ObsFiles.get_dataframe() error import pandas: " + str(e)
             raise ImportError(msg)
 
+        i0, i1 = self._get_record_range(idx, totim, totim_range)
+        obsname = self._get_obsname_list(obsname)
+        if obsname is None:
+            return None
+
+        # copy the selected columns one at a time
+        names = ["totim"] + obsname
+        data = get_selection(self.data, names)[i0:i1]
+
+        dti = data["totim"].tolist()
+        if start_datetime is not None:
+            dti = totim_to_datetime(
+                dti, start=pd.to_datetime(start_datetime), timeunit=timeunit
+            )
+
+        df = pd.DataFrame(
+            {name: data[name] for name in names}, index=dti, columns=names
+        )
+        return df
+
+    def _get_record_range(self, idx=None, totim=None, totim_range=None):
+        """
+        Get the range of records for a record number, a simulation time or
+        a range of simulation times.
+
+        Returns
+        -------
+        i0, i1 : int
+            First record and one past the last record.
+
+        """
         i0 = 0
         i1 = self.data.shape[0]
         if totim is not None:
@@ -190,47 +216,49 @@ class ObsFiles(FlopyBinaryData):
             if idx < i1:
                 i0 = idx
             i1 = i0 + 1
+        elif totim_range is not None:
+            tmin, tmax = totim_range
+            times = self.data["totim"]
+            if tmin is not None:
+                i0 = int(np.searchsorted(times, tmin, side="left"))
+            if tmax is not None:
+                i1 = int(np.searchsorted(times, tmax, side="right"))
+        return i0, i1
+
+    def _get_obsname_list(self, obsname):
+        """
+        Get a list of observation names.  Returns None if any of the names
+        is not in the file.
 
+        """
         if obsname is None:
-            obsname = self.get_obsnames()
-        else:
-            if obsname is not None:
-                if obsname not in self.data.dtype.names:
-                    obsname = None
-                else:
-                    if not isinstance(obsname, list):
-                        obsname = [obsname]
-        if obsname is None:
-            return None
-
-        obsname.insert(0, "totim")
-
-        dti = self.get_times()[i0:i1]
-        if start_datetime is not None:
-            dti = totim_to_datetime(
-                dti, start=pd.to_datetime(start_datetime), timeunit=timeunit
-            )
-
-        df = pd.DataFrame(self.data[i0:i1], index=dti, columns=obsname)
-        return df
+            return self.get_obsnames()
+        if not isinstance(obsname, (list, tuple)):
+            obsname = [obsname]
+        for name in obsname:
+            if name not in self.data.dtype.names:
+                return None
+        return list(obsname)
 
     def _read_data(self):
 
         if self.data is not None:
             return
 
-        while True:
-            try:
-                r = self.read_record(count=1)
-                if self.data is None:
-                    self.data = r.copy()
-                elif r.size == 0:
-                    break
-                else:
-                    # should be hstack based on (https://mail.scipy.org/pipermail/numpy-discussion/2010-June/051107.html)
-                    self.data = np.hstack((self.data, r))
-            except:
-                break
+        # read or memory map the complete records after the header
+        ipos = self.file.tell()
+        filesize = os.fstat(self.file.fileno()).st_size
+        nrecords = max(filesize - ipos, 0) // self.dtype.itemsize
+        if self._mmap and nrecords > 0:
+            self.data = np.memmap(
+                self.file.name,
+                dtype=self.dtype,
+                mode="r",
+                offset=ipos,
+                shape=(nrecords,),
+            )
+        else:
+            self.data = self.read_record(count=nrecords)
         return
 
     def _build_dtype(self):
@@ -263,8 +291,14 @@ class Mf6Obs(ObsFiles):
     verbose : boolean
         If true, print additional information to to the screen during the
         extraction.  (default is False)
-    hydlbl_len : int
-        Length of hydmod labels. (default is 20)
+    isBinary : boolean
+        If true, the observation output file is a binary file.
+        (default is True)
+    mmap : boolean
+        Memory map a binary observation file instead of reading it.  Only
+        the observations and times that are selected are read from the
+        file.  Data returned by get_data are read-only views of the file.
+        (default is False)
 
     Returns
     -------
@@ -272,7 +306,7 @@ class Mf6Obs(ObsFiles):
 
     """
 
-    def __init__(self, filename, verbose=False, isBinary=True):
+    def __init__(self, filename, verbose=False, isBinary=True, mmap=False):
         """
         Class constructor.
 
@@ -280,6 +314,7 @@ class Mf6Obs(ObsFiles):
         super(Mf6Obs, self).__init__()
         # initialize class information
         self.verbose = verbose
+        self._mmap = mmap
         if isBinary:
             # --open binary head file
             self.file = open(filename, "rb")
@@ -338,10 +373,17 @@ class Mf6Obs(ObsFiles):
             # build index
             self._build_index()
 
-            # read ascii data
-            self.data = np.loadtxt(
-                self.file, dtype=self.dtype, delimiter=",", ndmin=1
-            )
+            # read ascii data with a single vectorized parse and view the
+            # rows as records, use np.loadtxt if the values can not be
+            # parsed that way
+            text = self.file.read()
+            try:
+                values = read_csv_values(text, self.nobs + 1)
+                self.data = values.view(self.dtype).reshape(-1)
+            except ValueError:
+                self.data = np.loadtxt(
+                    io.StringIO(text), dtype=self.dtype, delimiter=",", ndmin=1
+                )
         return
 
     def _build_dtype(self):
@@ -374,6 +416,11 @@ class HydmodObs(ObsFiles):
         extraction.  (default is False)
     hydlbl_len : int
         Length of hydmod labels. (default is 20)
+    mmap : boolean
+        Memory map the hydmod output file instead of reading it.  Only the
+        observations and times that are selected are read from the file.
+        Data returned by get_data are read-only views of the file.
+        (default is False)
 
     Returns
     -------
@@ -381,7 +428,7 @@ class HydmodObs(ObsFiles):
 
     """
 
-    def __init__(self, filename, verbose=False, hydlbl_len=20):
+    def __init__(self, filename, verbose=False, hydlbl_len=20, mmap=False):
         """
         Class constructor.
 
@@ -389,6 +436,7 @@ class HydmodObs(ObsFiles):
         super(HydmodObs, self).__init__()
         # initialize class information
         self.verbose = verbose
+        self._mmap = mmap
         # --open binary head file
         self.file = open(filename, "rb")
         # NHYDTOT,ITMUNI
@@ -451,6 +499,11 @@ class SwrObs(ObsFiles):
         'single' or 'double'.  Default is 'double'.
     verbose : bool
         Write information to the screen.  Default is False.
+    mmap : bool
+        Memory map the observation file instead of reading it.  Only the
+        observations and times that are selected are read from the file.
+        Data returned by get_data are read-only views of the file.
+        Default is False.
 
     Attributes
     ----------
@@ -472,7 +525,9 @@ class SwrObs(ObsFiles):
 
     """
 
-    def __init__(self, filename, precision="double", verbose=False):
+    def __init__(
+        self, filename, precision="double", verbose=False, mmap=False
+    ):
         """
         Class constructor.
 
@@ -481,6 +536,7 @@ class SwrObs(ObsFiles):
         self.set_float(precision=precision)
         # initialize class information
         self.verbose = verbose
+        self._mmap = mmap
         # open binary head file
         self.file = open(filename, "rb")
 
@@ -198,6 +198,30 @@ def get_saturated_thickness(heads, m, nodata, per_idx=None):
     elif np.isscalar(per_idx):
         per_idx = [per_idx]
 
+    is_conf = _get_confined_cells(m)
+
+    # calculate saturated thickness
+    sat_thickness = []
+    for per in per_idx:
+        sat_thickness.append(
+            _get_saturated_thickness(heads[per], botm, thickness, is_conf)
+        )
+    return np.squeeze(sat_thickness)
+
+
+def _get_confined_cells(m):
+    """
+    Get a boolean array that is True for the cells of confined layers.
+
+    Parameters
+    ----------
+    m : flopy.modflow.Modflow object
+
+    Returns
+    -------
+    is_conf : np.ndarray
+        Boolean array of the model grid shape.
+    """
     # get confined or unconfined/convertible info
     if m.has_package("BCF6") or m.has_package("LPF") or m.has_package("UPW"):
         if m.has_package("BCF6"):
@@ -220,17 +244,20 @@ def get_saturated_thickness(heads, m, nodata, per_idx=None):
             "No flow package was found when trying to determine "
             "the layer type."
         )
+    return is_conf
 
-    # calculate saturated thickness
-    sat_thickness = []
-    for per in per_idx:
-        hds = heads[per]
-        perthickness = hds - botm
-        conf = np.logical_or(perthickness > thickness, is_conf)
-        perthickness[conf] = thickness[conf]
-        # convert to nan-filled array, as is expected(!?)
-        sat_thickness.append(perthickness.filled(np.nan))
-    return np.squeeze(sat_thickness)
+
+def _get_saturated_thickness(hds, botm, thickness, is_conf):
+    """
+    Calculates the saturated thickness of one time from a masked heads
+    array, the bottom elevations, the cell thicknesses and the confined
+    cells.  Masked heads are returned as NaN.
+    """
+    perthickness = hds - botm
+    conf = np.logical_or(perthickness > thickness, is_conf)
+    perthickness[conf] = thickness[conf]
+    # convert to nan-filled array, as is expected(!?)
+    return perthickness.filled(np.nan)
 
 
 def get_gradients(heads, m, nodata, per_idx=None):
@@ -348,11 +375,69 @@ def get_extended_budget(
     # define useful stuff
     cbf = bf.CellBudgetFile(cbcfile, precision=precision)
     nlay, nrow, ncol = cbf.nlay, cbf.nrow, cbf.ncol
+
+    # get flow across right, front and lower faces
+    Qx_ext = np.zeros((nlay, nrow, ncol + 1), dtype=np.float32)
+    Qy_ext = np.zeros((nlay, nrow + 1, ncol), dtype=np.float32)
+    Qz_ext = np.zeros((nlay + 1, nrow, ncol), dtype=np.float32)
+    _get_face_flows(cbf, idx, kstpkper, totim, Qx_ext, Qy_ext, Qz_ext)
+
+    # deal with boundary cells
+    if boundary_ifaces is not None:
+        # need calculated heads for some stresses and to check hnoflo and hdry
+        if hdsfile is None:
+            raise ValueError(
+                "hdsfile must be provided when using " "boundary_ifaces"
+            )
+        hds = bf.HeadFile(hdsfile, precision=precision)
+        head = hds.get_data(idx=idx, kstpkper=kstpkper, totim=totim)
+
+        # get hnoflo and hdry values
+        if model is None:
+            raise ValueError(
+                "model must be provided when using " "boundary_ifaces"
+            )
+        _add_boundary_flows(
+            cbf,
+            boundary_ifaces,
+            head,
+            model,
+            idx,
+            kstpkper,
+            totim,
+            Qx_ext,
+            Qy_ext,
+            Qz_ext,
+        )
+
+    return Qx_ext, Qy_ext, Qz_ext
+
+
+def _get_face_flows(cbf, idx, kstpkper, totim, Qx_ext, Qy_ext, Qz_ext):
+    """
+    Fill the arrays of flow rates across cell faces with the FLOW RIGHT
+    FACE, FLOW FRONT FACE and FLOW LOWER FACE arrays of a time step.
+
+    Parameters
+    ----------
+    cbf : CellBudgetFile object
+    idx : int or list
+        The zero-based record number.
+    kstpkper : tuple of ints
+    totim : float
+    Qx_ext, Qy_ext, Qz_ext : ndarray
+        Arrays of shape (nlay, nrow, ncol + 1), (nlay, nrow + 1, ncol) and
+        (nlay + 1, nrow, ncol) that are overwritten.
+
+    """
+    nlay, nrow, ncol = cbf.nlay, cbf.nrow, cbf.ncol
     rec_names = cbf.get_unique_record_names(decode=True)
     err_msg = " not found in the budget file."
+    Qx_ext[:] = 0.0
+    Qy_ext[:] = 0.0
+    Qz_ext[:] = 0.0
 
     # get flow across right face
-    Qx_ext = np.zeros((nlay, nrow, ncol + 1), dtype=np.float32)
     if ncol > 1:
         budget_term = "FLOW RIGHT FACE"
         matched_name = [s for s in rec_names if budget_term in s]
@@ -372,7 +457,6 @@ def get_extended_budget(
             Qx_ext[:, :, 1:] += frf_swi[0]
 
     # get flow across front face
-    Qy_ext = np.zeros((nlay, nrow + 1, ncol), dtype=np.float32)
     if nrow > 1:
         budget_term = "FLOW FRONT FACE"
         matched_name = [s for s in rec_names if budget_term in s]
@@ -381,7 +465,7 @@ def get_extended_budget(
         fff = cbf.get_data(
             idx=idx, kstpkper=kstpkper, totim=totim, text=budget_term
         )
-        Qy_ext[:, 1:, :] = -fff[0]
+        np.negative(fff[0], out=Qy_ext[:, 1:, :])
         # SWI2 package
         budget_term_swi = "SWIADDTOFFF"
         matched_name_swi = [s for s in rec_names if budget_term_swi in s]
@@ -392,7 +476,6 @@ def get_extended_budget(
             Qy_ext[:, 1:, :] -= fff_swi[0]
 
     # get flow across lower face
-    Qz_ext = np.zeros((nlay + 1, nrow, ncol), dtype=np.float32)
     if nlay > 1:
         budget_term = "FLOW LOWER FACE"
         matched_name = [s for s in rec_names if budget_term in s]
@@ -401,7 +484,7 @@ def get_extended_budget(
         flf = cbf.get_data(
             idx=idx, kstpkper=kstpkper, totim=totim, text=budget_term
         )
-        Qz_ext[1:, :, :] = -flf[0]
+        np.negative(flf[0], out=Qz_ext[1:, :, :])
         # SWI2 package
         budget_term_swi = "SWIADDTOFLF"
         matched_name_swi = [s for s in rec_names if budget_term_swi in s]
@@ -410,192 +493,208 @@ def get_extended_budget(
                 idx=idx, kstpkper=kstpkper, totim=totim, text=budget_term_swi
             )
             Qz_ext[1:, :, :] -= flf_swi[0]
+    return
 
-    # deal with boundary cells
-    if boundary_ifaces is not None:
-        # need calculated heads for some stresses and to check hnoflo and hdry
-        if hdsfile is None:
-            raise ValueError(
-                "hdsfile must be provided when using " "boundary_ifaces"
-            )
-        hds = bf.HeadFile(hdsfile, precision=precision)
-        head = hds.get_data(idx=idx, kstpkper=kstpkper, totim=totim)
 
-        # get hnoflo and hdry values
-        if model is None:
-            raise ValueError(
-                "model must be provided when using " "boundary_ifaces"
+def _add_boundary_flows(
+    cbf,
+    boundary_ifaces,
+    head,
+    model,
+    idx,
+    kstpkper,
+    totim,
+    Qx_ext,
+    Qy_ext,
+    Qz_ext,
+):
+    """
+    Add the stress flows at boundary cells of a time step to the flow rates
+    across cell faces.  See get_extended_budget for the definition of
+    boundary_ifaces.
+
+    Parameters
+    ----------
+    cbf : CellBudgetFile object
+    boundary_ifaces : dictionary {str: int or list}
+    head : ndarray
+        Heads of the time step.
+    model : flopy.modflow.Modflow object
+    idx : int or list
+        The zero-based record number.
+    kstpkper : tuple of ints
+    totim : float
+    Qx_ext, Qy_ext, Qz_ext : ndarray
+        Flow rates across cell faces that are updated.
+
+    """
+    rec_names = cbf.get_unique_record_names(decode=True)
+    noflo_or_dry = np.logical_or(head == model.hnoflo, head == model.hdry)
+
+    for budget_term, iface_info in boundary_ifaces.items():
+        # look for budget term in budget file
+        matched_name = [s for s in rec_names if budget_term in s]
+        if not matched_name:
+            raise RuntimeError(
+                "Budget term " + budget_term + " not found"
+                ' in "' + cbf.filename + '" file.'
             )
-        noflo_or_dry = np.logical_or(head == model.hnoflo, head == model.hdry)
+        if len(matched_name) > 1:
+            raise RuntimeError(
+                "Budget term " + budget_term + " found"
+                " in several record names. Use a more "
+                " precise name."
+            )
+        Q_stress = cbf.get_data(
+            idx=idx,
+            kstpkper=kstpkper,
+            totim=totim,
+            text=matched_name[0],
+            full3D=True,
+        )[0]
 
-        for budget_term, iface_info in boundary_ifaces.items():
-            # look for budget term in budget file
-            matched_name = [s for s in rec_names if budget_term in s]
-            if not matched_name:
-                raise RuntimeError(
-                    "Budget term " + budget_term + " not found"
-                    ' in "' + cbcfile + '" file.'
+        # remove potential leading and trailing spaces
+        budget_term = budget_term.strip()
+
+        # weirdly, MODFLOW puts recharge in all potential recharge cells
+        # and not only the actual cells; thus, correct this by putting 0
+        # away from water table cells
+        if budget_term == "RECHARGE":
+            # find the water table as the first active cell in each column
+            active = np.logical_not(noflo_or_dry)
+            water_table = np.logical_and(
+                active, np.cumsum(active, axis=0) == 1
+            )
+            Q_stress[np.logical_not(water_table)] = 0.0
+
+        # case where the same iface is assigned to all cells
+        if isinstance(iface_info, int):
+            if iface_info == 1:
+                Qx_ext[:, :, :-1] += Q_stress
+            elif iface_info == 2:
+                Qx_ext[:, :, 1:] -= Q_stress
+            elif iface_info == 3:
+                Qy_ext[:, 1:, :] += Q_stress
+            elif iface_info == 4:
+                Qy_ext[:, :-1, :] -= Q_stress
+            elif iface_info == 5:
+                Qz_ext[1:, :, :] += Q_stress
+            elif iface_info == 6:
+                Qz_ext[:-1, :, :] -= Q_stress
+
+        # case where iface is assigned individually per cell
+        elif isinstance(iface_info, list):
+            # impose a unique iface (normally = 6) for some stresses
+            # (note: UZF RECHARGE, GW ET and SURFACE LEAKAGE are all
+            # related to the UZF package)
+            if (
+                budget_term == "RECHARGE"
+                or budget_term == "ET"
+                or budget_term == "UZF RECHARGE"
+                or budget_term == "GW ET"
+                or budget_term == "SURFACE LEAKAGE"
+            ):
+                raise ValueError(
+                    "This function imposes the use of a "
+                    "unique iface (normally = 6) for the "
+                    + budget_term
+                    + " budget term."
                 )
-            if len(matched_name) > 1:
-                raise RuntimeError(
-                    "Budget term " + budget_term + " found"
-                    " in several record names. Use a more "
-                    " precise name."
+            if len(iface_info) == 0:
+                continue
+
+            # boundary cells that are not no-flow or dry
+            cell_info = np.array(iface_info, dtype=float)
+            lay, row, col = cell_info[:, :3].astype(int).T
+            iface = cell_info[:, -1].astype(int)
+            keep = np.logical_not(noflo_or_dry[lay, row, col])
+
+            # Here, where appropriate, we recalculate Q_stress_cell
+            # using package input. This gives more flexibility than
+            # directly taking the value saved by MODFLOW. Indeed, it
+            # allows for a same type of stress to be applied several
+            # times to the same cell but to different faces
+            # (whereas MODFLOW only saves one lumped  value per
+            # stress type per cell).
+            # Note: this flexibility is not supported for:
+            # - FHB package (we would need to interpolate inputs
+            #   across time steps as done in the package; complicated)
+            # - RES package (we would need to interpolate inputs
+            #   across time steps as done in the package; complicated)
+            # - STR package (we would need first to retrieve river
+            #   stage from model outputs; complicated)
+            # - SFR1 package (we would need to retrieve river
+            #   stage and conductance from model outputs; complicated)
+            # - SFR2 package (even more complicated than SFR1)
+            # - LAK3 package (we would need to retrieve lake
+            #   stage and conductance from model outputs; complicated)
+            # - MNW1 package (we would need to retrieve well head and
+            #   conductance from model outputs; complicated)
+            # - MNW2 package (even more complicated than MNW1)
+            if budget_term == "WELLS":
+                Q_stress_cell = cell_info[:, 3]
+            elif budget_term == "HEAD DEP BOUNDS":
+                ghb_head = cell_info[:, 3]
+                ghb_cond = cell_info[:, 4]
+                model_head = head[lay, row, col]
+                Q_stress_cell = ghb_cond * (ghb_head - model_head)
+            elif budget_term == "RIVER LEAKAGE":
+                riv_stage = cell_info[:, 3]
+                riv_cond = cell_info[:, 4]
+                riv_rbot = cell_info[:, 5]
+                model_head = head[lay, row, col]
+                Q_stress_cell = riv_cond * (
+                    riv_stage - np.maximum(model_head, riv_rbot)
                 )
-            Q_stress = cbf.get_data(
-                idx=idx,
-                kstpkper=kstpkper,
-                totim=totim,
-                text=matched_name[0],
-                full3D=True,
-            )[0]
-
-            # remove potential leading and trailing spaces
-            budget_term = budget_term.strip()
-
-            # weirdly, MODFLOW puts recharge in all potential recharge cells
-            # and not only the actual cells; thus, correct this by putting 0
-            # away from water table cells
-            if budget_term == "RECHARGE":
-                # find the water table as the first active cell in each column
-                water_table = np.full((nlay, nrow, ncol), False)
-                water_table[0, :, :] = np.logical_not(noflo_or_dry[0, :, :])
-                already_found = water_table[0, :, :]
-                for lay in range(1, nlay):
-                    if np.sum(already_found) == nrow * ncol:
-                        break
-                    water_table[lay, :, :] = np.logical_and(
-                        np.logical_not(noflo_or_dry[lay, :, :]),
-                        np.logical_not(already_found),
-                    )
-                    already_found = np.logical_or(
-                        already_found, water_table[lay, :, :]
-                    )
-                Q_stress[np.logical_not(water_table)] = 0.0
-
-            # case where the same iface is assigned to all cells
-            if isinstance(iface_info, int):
-                if iface_info == 1:
-                    Qx_ext[:, :, :-1] += Q_stress
-                elif iface_info == 2:
-                    Qx_ext[:, :, 1:] -= Q_stress
-                elif iface_info == 3:
-                    Qy_ext[:, 1:, :] += Q_stress
-                elif iface_info == 4:
-                    Qy_ext[:, :-1, :] -= Q_stress
-                elif iface_info == 5:
-                    Qz_ext[1:, :, :] += Q_stress
-                elif iface_info == 6:
-                    Qz_ext[:-1, :, :] -= Q_stress
-
-            # case where iface is assigned individually per cell
-            elif isinstance(iface_info, list):
-                # impose a unique iface (normally = 6) for some stresses
-                # (note: UZF RECHARGE, GW ET and SURFACE LEAKAGE are all
-                # related to the UZF package)
-                if (
-                    budget_term == "RECHARGE"
-                    or budget_term == "ET"
-                    or budget_term == "UZF RECHARGE"
-                    or budget_term == "GW ET"
-                    or budget_term == "SURFACE LEAKAGE"
-                ):
-                    raise ValueError(
-                        "This function imposes the use of a "
-                        "unique iface (normally = 6) for the "
-                        + budget_term
-                        + " budget term."
-                    )
-
-                # loop through boundary cells
-                for cell_info in iface_info:
-                    lay, row, col = cell_info[0], cell_info[1], cell_info[2]
-                    if noflo_or_dry[lay, row, col]:
-                        continue
-                    iface = cell_info[-1]
-                    # Here, where appropriate, we recalculate Q_stress_cell
-                    # using package input. This gives more flexibility than
-                    # directly taking the value saved by MODFLOW. Indeed, it
-                    # allows for a same type of stress to be applied several
-                    # times to the same cell but to different faces
-                    # (whereas MODFLOW only saves one lumped  value per
-                    # stress type per cell).
-                    # Note: this flexibility is not supported for:
-                    # - FHB package (we would need to interpolate inputs
-                    #   across time steps as done in the package; complicated)
-                    # - RES package (we would need to interpolate inputs
-                    #   across time steps as done in the package; complicated)
-                    # - STR package (we would need first to retrieve river
-                    #   stage from model outputs; complicated)
-                    # - SFR1 package (we would need to retrieve river
-                    #   stage and conductance from model outputs; complicated)
-                    # - SFR2 package (even more complicated than SFR1)
-                    # - LAK3 package (we would need to retrieve lake
-                    #   stage and conductance from model outputs; complicated)
-                    # - MNW1 package (we would need to retrieve well head and
-                    #   conductance from model outputs; complicated)
-                    # - MNW2 package (even more complicated than MNW1)
-                    if budget_term == "WELLS":
-                        Q_stress_cell = cell_info[3]
-                    elif budget_term == "HEAD DEP BOUNDS":
-                        ghb_head = cell_info[3]
-                        ghb_cond = cell_info[4]
-                        model_head = head[lay, row, col]
-                        Q_stress_cell = ghb_cond * (ghb_head - model_head)
-                    elif budget_term == "RIVER LEAKAGE":
-                        riv_stage = cell_info[3]
-                        riv_cond = cell_info[4]
-                        riv_rbot = cell_info[5]
-                        model_head = head[lay, row, col]
-                        if model_head > riv_rbot:
-                            Q_stress_cell = riv_cond * (riv_stage - model_head)
-                        else:
-                            Q_stress_cell = riv_cond * (riv_stage - riv_rbot)
-                    elif budget_term == "DRAINS":
-                        drn_stage = cell_info[3]
-                        drn_cond = cell_info[4]
-                        model_head = head[lay, row, col]
-                        if model_head > drn_stage:
-                            Q_stress_cell = drn_cond * (drn_stage - model_head)
-                        else:
-                            continue
-                    # Else, take the value saved by MODFLOW.
-                    # This includes the budget terms:
-                    # - 'CONSTANT HEAD' for:
-                    #      * head specified through -1 in IBOUND
-                    #      * head specified in CHD package
-                    #      * head specified in FHB package
-                    # - 'SPECIFIED FLOWS' for flow specified in FHB package
-                    # - 'RESERV. LEAKAGE' for RES package
-                    # - 'STREAM LEAKAGE' for:
-                    #      * STR package
-                    #      * SFR1 package
-                    #      * SFR2 package
-                    #  - 'LAKE SEEPAGE' for LAK3 package
-                    #  - 'MNW' for MNW1 package
-                    #  - 'MNW2' for MNW2 package
-                    #  - 'SWIADDTOCH' for SWI2 package
-                    else:
-                        Q_stress_cell = Q_stress[lay, row, col]
-
-                    if iface == 1:
-                        Qx_ext[lay, row, col] += Q_stress_cell
-                    elif iface == 2:
-                        Qx_ext[lay, row, col + 1] -= Q_stress_cell
-                    elif iface == 3:
-                        Qy_ext[lay, row + 1, col] += Q_stress_cell
-                    elif iface == 4:
-                        Qy_ext[lay, row, col] -= Q_stress_cell
-                    elif iface == 5:
-                        Qz_ext[lay + 1, row, col] += Q_stress_cell
-                    elif iface == 6:
-                        Qz_ext[lay, row, col] -= Q_stress_cell
+            elif budget_term == "DRAINS":
+                drn_stage = cell_info[:, 3]
+                drn_cond = cell_info[:, 4]
+                model_head = head[lay, row, col]
+                Q_stress_cell = drn_cond * (drn_stage - model_head)
+                keep &= model_head > drn_stage
+            # Else, take the value saved by MODFLOW.
+            # This includes the budget terms:
+            # - 'CONSTANT HEAD' for:
+            #      * head specified through -1 in IBOUND
+            #      * head specified in CHD package
+            #      * head specified in FHB package
+            # - 'SPECIFIED FLOWS' for flow specified in FHB package
+            # - 'RESERV. LEAKAGE' for RES package
+            # - 'STREAM LEAKAGE' for:
+            #      * STR package
+            #      * SFR1 package
+            #      * SFR2 package
+            #  - 'LAKE SEEPAGE' for LAK3 package
+            #  - 'MNW' for MNW1 package
+            #  - 'MNW2' for MNW2 package
+            #  - 'SWIADDTOCH' for SWI2 package
             else:
-                raise TypeError(
-                    "boundary_ifaces value must be either " "int or list."
-                )
-
-    return Qx_ext, Qy_ext, Qz_ext
+                Q_stress_cell = np.ma.filled(Q_stress, np.nan)[lay, row, col]
+
+            # add the stress flows to the faces, cells that are listed
+            # several times are all added
+            Q_stress_cell = Q_stress_cell[keep]
+            lay, row, col, iface = lay[keep], row[keep], col[keep], iface[keep]
+            for i, Q_ext, sign, cells in (
+                (1, Qx_ext, 1.0, (lay, row, col)),
+                (2, Qx_ext, -1.0, (lay, row, col + 1)),
+                (3, Qy_ext, 1.0, (lay, row + 1, col)),
+                (4, Qy_ext, -1.0, (lay, row, col)),
+                (5, Qz_ext, 1.0, (lay + 1, row, col)),
+                (6, Qz_ext, -1.0, (lay, row, col)),
+            ):
+                isface = iface == i
+                if isface.any():
+                    np.add.at(
+                        Q_ext,
+                        tuple(c[isface] for c in cells),
+                        sign * Q_stress_cell[isface],
+                    )
+        else:
+            raise TypeError(
+                "boundary_ifaces value must be either " "int or list."
+            )
+    return
 
 
 def get_specific_discharge(
@@ -812,3 +911,375 @@ def get_specific_discharge(
         qz[noflo_or_dry] = np.nan
 
     return qx, qy, qz
+
+
+def get_extended_budget_batch(
+    cbcfile,
+    precision="single",
+    kstpkper=None,
+    totim=None,
+    boundary_ifaces=None,
+    hdsfile=None,
+    model=None,
+    out=None,
+):
+    """
+    Get the flow rate across cell faces including potential stresses applied
+    along boundaries for several times in one pass. The budget and head files
+    are opened once and the results are written into preallocated arrays,
+    which can be memory-mapped arrays for long simulations. See
+    get_extended_budget for more information.
+
+    Parameters
+    ----------
+    cbcfile : str
+        Cell by cell file produced by Modflow.
+    precision : str
+        Binary file precision, default is 'single'.
+    kstpkper : list of tuples of ints
+        Time steps and stress periods (kstp, kper), zero based. If kstpkper
+        and totim are None (default), all times in the budget file are used.
+    totim : list of floats
+        Simulation times (only used if kstpkper is None).
+    boundary_ifaces : dictionary {str: int or list}
+        A dictionary defining how to treat stress flows at boundary cells
+        (see get_extended_budget).
+    hdsfile : str
+        Head file produced by MODFLOW (only required if boundary_ifaces is
+        used).
+    model : flopy.modflow.Modflow object
+        Modflow model instance (only required if boundary_ifaces is used).
+    out : tuple of three ndarrays
+        Arrays of shape (ntimes, nlay, nrow, ncol + 1),
+        (ntimes, nlay, nrow + 1, ncol) and (ntimes, nlay + 1, nrow, ncol)
+        in which the results are written. If None (default), float32
+        arrays are allocated.
+
+    Returns
+    -------
+    (Qx_ext, Qy_ext, Qz_ext) : tuple
+        Flow rates across cell faces with a leading time axis, in the same
+        order as kstpkper or totim.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from flopy.utils.postprocessing import get_extended_budget_batch
+    >>> shapes = [(3650, 1, 100, 101), (3650, 1, 101, 100),
+    ...           (3650, 2, 100, 100)]
+    >>> out = tuple(np.lib.format.open_memmap('Q{}.npy'.format(i), mode='w+',
+    ...             dtype=np.float32, shape=s) for i, s in enumerate(shapes))
+    >>> Qx, Qy, Qz = get_extended_budget_batch('model.cbc', out=out)
+    """
+    import flopy.utils.binaryfile as bf
+
+    cbf = bf.CellBudgetFile(cbcfile, precision=precision)
+    nlay, nrow, ncol = cbf.nlay, cbf.nrow, cbf.ncol
+    steps = _get_time_steps(cbf, kstpkper, totim)
+    if boundary_ifaces is not None:
+        if hdsfile is None:
+            raise ValueError(
+                "hdsfile must be provided when using " "boundary_ifaces"
+            )
+        if model is None:
+            raise ValueError(
+                "model must be provided when using " "boundary_ifaces"
+            )
+        hds = bf.HeadFile(hdsfile, precision=precision)
+
+    shapes = [
+        (nlay, nrow, ncol + 1),
+        (nlay, nrow + 1, ncol),
+        (nlay + 1, nrow, ncol),
+    ]
+    out = _get_batch_output(out, len(steps), shapes, np.float32)
+    Qx_ext, Qy_ext, Qz_ext = out
+    for n, (kk, t) in enumerate(steps):
+        _get_face_flows(cbf, None, kk, t, Qx_ext[n], Qy_ext[n], Qz_ext[n])
+        if boundary_ifaces is not None:
+            head = hds.get_data(kstpkper=kk, totim=t)
+            _add_boundary_flows(
+                cbf,
+                boundary_ifaces,
+                head,
+                model,
+                None,
+                kk,
+                t,
+                Qx_ext[n],
+                Qy_ext[n],
+                Qz_ext[n],
+            )
+    return out
+
+
+def get_specific_discharge_batch(
+    model,
+    cbcfile,
+    precision="single",
+    kstpkper=None,
+    totim=None,
+    boundary_ifaces=None,
+    hdsfile=None,
+    position="centers",
+    out=None,
+    dtype=np.float32,
+):
+    """
+    Get the discharge vector for several times in one pass. The budget and
+    head files are opened once, the cell geometry (face areas, layer
+    thicknesses and bottoms) is computed once and the results are written
+    into preallocated arrays, which can be memory-mapped arrays for long
+    simulations. See get_specific_discharge for more information.
+
+    Parameters
+    ----------
+    model : flopy.modflow.Modflow object
+        Modflow model instance.
+    cbcfile : str
+        Cell by cell file produced by Modflow.
+    precision : str
+        Binary file precision, default is 'single'.
+    kstpkper : list of tuples of ints
+        Time steps and stress periods (kstp, kper), zero based. If kstpkper
+        and totim are None (default), all times in the budget file are used.
+    totim : list of floats
+        Simulation times (only used if kstpkper is None).
+    boundary_ifaces : dictionary {str: int or list}
+        A dictionary defining how to treat stress flows at boundary cells
+        (see get_specific_discharge).
+    hdsfile : str
+        Head file produced by MODFLOW. Head is used to calculate saturated
+        thickness and to determine if a cell is inactive or dry. If not
+        provided, all cells are considered fully saturated.
+    position : str
+        Position at which the specific discharge will be calculated. Possible
+        values are "centers" (default), "faces" and "vertices".
+    out : tuple of three ndarrays
+        Arrays in which the results are written, with a leading time axis
+        followed by the shape of the arrays returned by
+        get_specific_discharge. If None (default), arrays are allocated.
+    dtype : numpy dtype
+        Data type of the allocated arrays, default is np.float32.
+
+    Returns
+    -------
+    (qx, qy, qz) : tuple
+        Discharge vector with a leading time axis, in the same order as
+        kstpkper or totim.
+        Note: if hdsfile is provided, inactive and dry cells are set to NaN.
+    """
+    import flopy.utils.binaryfile as bf
+
+    if position not in ("centers", "faces", "vertices"):
+        raise ValueError(
+            '"' + position + '" is not a valid value for ' "position"
+        )
+
+    # check if budget file has classical budget terms
+    cbf = bf.CellBudgetFile(cbcfile, precision=precision)
+    rec_names = cbf.get_unique_record_names(decode=True)
+    classical_budget = any(
+        budget_term in s
+        for budget_term in ("FLOW RIGHT FACE", "FLOW FRONT FACE")
+        for s in rec_names
+    )
+    steps = _get_time_steps(cbf, kstpkper, totim)
+    if hdsfile is not None:
+        hds = bf.HeadFile(hdsfile, precision=precision)
+
+    modelgrid = model.modelgrid
+    if not classical_budget:
+        # check valid options
+        if boundary_ifaces is not None:
+            import warnings
+
+            warnings.warn(
+                "the boundary_ifaces option is not implemented "
+                'for "non-classical" MODFLOW versions where the '
+                "budget is not recorded as FLOW RIGHT FACE, "
+                "FLOW FRONT FACE and FLOW LOWER FACE; it will be "
+                "ignored",
+                UserWarning,
+            )
+        if position != "centers":
+            raise NotImplementedError(
+                'position can only be "centers" for '
+                '"non-classical" MODFLOW versions where '
+                "the budget is not recorded as FLOW "
+                "RIGHT FACE, FLOW FRONT FACE and FLOW "
+                "LOWER FACE"
+            )
+        if not [s for s in rec_names if "DATA-SPDIS" in s]:
+            err_msg = (
+                "Could not find suitable records in the budget file "
+                "to construct the discharge vector."
+            )
+            raise RuntimeError(err_msg)
+        out = _get_batch_output(out, len(steps), [modelgrid.shape] * 3, dtype)
+        for n, (kk, t) in enumerate(steps):
+            spdis = cbf.get_data(text="DATA-SPDIS", kstpkper=kk, totim=t)[0]
+            idx = np.array(spdis["node"]) - 1
+            for q, name in zip(out, ("qx", "qy", "qz")):
+                q[n] = np.nan
+                q[n].flat[idx] = spdis[name]
+            if hdsfile is not None:
+                head = hds.get_data(kstpkper=kk, totim=t)
+                noflo_or_dry = np.logical_or(
+                    head == model.hnoflo, head == model.hdry
+                )
+                for q in out:
+                    q[n][noflo_or_dry] = np.nan
+        return out
+
+    nlay, nrow, ncol = modelgrid.nlay, modelgrid.nrow, modelgrid.ncol
+    ext_shapes = [
+        (nlay, nrow, ncol + 1),
+        (nlay, nrow + 1, ncol),
+        (nlay + 1, nrow, ncol),
+    ]
+    if position == "centers":
+        shapes = [modelgrid.shape] * 3
+    elif position == "faces":
+        shapes = ext_shapes
+    else:
+        shapes = [(nlay + 1, nrow + 1, ncol + 1)] * 3
+    out = _get_batch_output(out, len(steps), shapes, dtype)
+    if boundary_ifaces is not None and hdsfile is None:
+        raise ValueError(
+            "hdsfile must be provided when using " "boundary_ifaces"
+        )
+
+    # cell geometry that does not change with time
+    delc = np.reshape(modelgrid.delc, (1, nrow, 1))
+    delr = np.reshape(modelgrid.delr, (1, 1, ncol))
+    thickness = model.dis.thickness.array
+    cross_area_z = np.ones(modelgrid.shape) * delc * delr
+    if hdsfile is None:
+        cross_area_x = delc * thickness
+        cross_area_y = delr * thickness
+    else:
+        botm = model.dis.botm.array
+        is_conf = _get_confined_cells(model)
+        cross_area_x = np.empty(modelgrid.shape, dtype=float)
+        cross_area_y = np.empty(modelgrid.shape, dtype=float)
+
+    # inform modelgrid of no-flow and dry cells
+    if modelgrid._idomain is None:
+        modelgrid._idomain = model.dis.ibound
+    idomain = modelgrid._idomain
+    idomain0 = np.array(idomain, copy=True)
+    if position != "centers" and hdsfile is None:
+        cross_area_x = modelgrid.array_at_faces(cross_area_x, "x")
+        cross_area_y = modelgrid.array_at_faces(cross_area_y, "y")
+        cross_area_z = modelgrid.array_at_faces(cross_area_z, "z")
+
+    # flow rates across cell faces, reused between times
+    Q_ext = tuple(np.empty(s, dtype=np.float32) for s in ext_shapes)
+    if position == "vertices":
+        q_faces = tuple(np.empty(s, dtype=float) for s in ext_shapes)
+
+    try:
+        for n, (kk, t) in enumerate(steps):
+            Qx_ext, Qy_ext, Qz_ext = Q_ext
+            _get_face_flows(cbf, None, kk, t, Qx_ext, Qy_ext, Qz_ext)
+            if hdsfile is not None:
+                head = hds.get_data(kstpkper=kk, totim=t)
+                noflo_or_dry = np.logical_or(
+                    head == model.hnoflo, head == model.hdry
+                )
+            if boundary_ifaces is not None:
+                _add_boundary_flows(
+                    cbf,
+                    boundary_ifaces,
+                    head,
+                    model,
+                    None,
+                    kk,
+                    t,
+                    Qx_ext,
+                    Qy_ext,
+                    Qz_ext,
+                )
+
+            # get cross section areas from the saturated thickness
+            if hdsfile is not None:
+                hds_masked = np.ma.array(head, mask=head == model.hdry)
+                sat_thk = _get_saturated_thickness(
+                    hds_masked, botm, thickness, is_conf
+                )
+                np.multiply(delc, sat_thk, out=cross_area_x)
+                np.multiply(delr, sat_thk, out=cross_area_y)
+                if position != "centers":
+                    idomain[...] = idomain0
+                    idomain[noflo_or_dry] = 0
+
+            # calculate qx, qy, qz
+            if position == "centers":
+                for q, Q, area, axis in zip(
+                    out,
+                    Q_ext,
+                    (cross_area_x, cross_area_y, cross_area_z),
+                    (2, 1, 0),
+                ):
+                    q = q[n]
+                    lo = [slice(None)] * 3
+                    hi = [slice(None)] * 3
+                    lo[axis] = slice(None, -1)
+                    hi[axis] = slice(1, None)
+                    np.add(Q[tuple(hi)], Q[tuple(lo)], out=q)
+                    np.multiply(q, 0.5, out=q)
+                    np.divide(q, area, out=q)
+                    if hdsfile is not None:
+                        q[noflo_or_dry] = np.nan
+            else:
+                if hdsfile is None:
+                    areas = (cross_area_x, cross_area_y, cross_area_z)
+                else:
+                    areas = (
+                        modelgrid.array_at_faces(cross_area_x, "x"),
+                        modelgrid.array_at_faces(cross_area_y, "y"),
+                        modelgrid.array_at_faces(cross_area_z, "z"),
+                    )
+                if position == "faces":
+                    q_faces = tuple(q[n] for q in out)
+                for q, Q, area in zip(q_faces, Q_ext, areas):
+                    np.divide(Q, area, out=q)
+                if position == "vertices":
+                    for q, q_face in zip(out, q_faces):
+                        q[n] = modelgrid.array_at_verts(q_face)
+    finally:
+        idomain[...] = idomain0
+
+    return out
+
+
+def _get_time_steps(cbf, kstpkper=None, totim=None):
+    """
+    Get a list of (kstpkper, totim) tuples to pass to get_data of the
+    budget and head files, using all times of the budget file if kstpkper
+    and totim are None.
+    """
+    if kstpkper is not None:
+        return [(tuple(kk), None) for kk in kstpkper]
+    elif totim is not None:
+        return [(None, t) for t in totim]
+    return [(kk, None) for kk in cbf.get_kstpkper()]
+
+
+def _get_batch_output(out, ntimes, shapes, dtype):
+    """
+    Check or allocate the three output arrays of a batch calculation.
+    """
+    shapes = [(ntimes,) + tuple(shape) for shape in shapes]
+    if out is None:
+        return tuple(np.empty(shape, dtype=dtype) for shape in shapes)
+    if len(out) != 3:
+        raise ValueError("out must be a tuple of three arrays")
+    for a, shape in zip(out, shapes):
+        if a.shape != shape:
+            raise ValueError(
+                "out array shape {} does not match the expected shape "
+                "{}".format(a.shape, shape)
+            )
+    return tuple(out)
@@ -1,6 +1,90 @@
+import re
+import warnings
 import numpy as np
 
 
+def _read_sfr_results(fname, ncol, chunksize=2 ** 22):
+    """
+    Read the reach results and time step headers of a SFR output file in
+    a single pass.  The file is read in blocks of whole lines and each
+    block is parsed with numpy.  Lines that start with an integer and
+    have ncol values are reach results.
+
+    Returns
+    -------
+    values : numpy array
+        Array of size (nrows, ncol) with the reach results.
+    itime : numpy array
+        Zero-based index of the time step header that precedes each row.
+    kstpkper : list
+        List of (kstp, kper) tuples from the time step headers.
+
+    """
+    values, itime, kstpkper = [], [], []
+    remainder = b""
+    with open(fname, "rb") as f:
+        while True:
+            block = f.read(chunksize)
+            if block:
+                block = remainder + block
+                idx = block.rfind(b"\n") + 1
+                if idx == 0:
+                    remainder = block
+                    continue
+                block, remainder = block[:idx], block[idx:]
+            else:
+                block, remainder = remainder + b"\n", b""
+                if len(block.strip()) == 0:
+                    break
+
+            # time step headers
+            b = np.frombuffer(block, dtype=np.uint8)
+            newline = np.flatnonzero(b == 10)
+            ihead = []
+            for m in re.finditer(b"STEP", block):
+                iline = np.searchsorted(newline, m.start())
+                if len(ihead) > 0 and ihead[-1] == iline:
+                    continue
+                i0 = newline[iline - 1] + 1 if iline > 0 else 0
+                line = block[i0 : newline[iline]].decode().strip().split()
+                kper, kstp = int(line[3]) - 1, int(line[5]) - 1
+                kstpkper.append((kstp, kper))
+                ihead.append(iline)
+
+            # count the values on each line and check the first value
+            space = b <= 32
+            first = ~space
+            first[1:] &= space[:-1]
+            istart = np.flatnonzero(first)
+            line = np.searchsorted(newline, istart)
+            nval = np.bincount(line, minlength=newline.shape[0])
+            ifirst = np.zeros(newline.shape[0], dtype=istart.dtype)
+            ifirst[line[::-1]] = istart[::-1]
+            isdata = (nval == ncol) & (b[ifirst] >= 48) & (b[ifirst] <= 57)
+
+            # parse the values on the reach result lines
+            length = np.diff(newline, prepend=-1)
+            data = b[np.repeat(isdata, length)].tobytes()
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                v = np.fromstring(data, dtype=np.float64, sep=" ")
+            if v.size != isdata.sum() * ncol:
+                raise ValueError(
+                    "could not parse the results in {!r}".format(fname)
+                )
+            values.append(v.reshape(-1, ncol))
+            nhead = len(kstpkper) - len(ihead)
+            itime.append(
+                np.searchsorted(ihead, np.flatnonzero(isdata)) + nhead - 1
+            )
+
+    if len(values) == 0:
+        return np.zeros((0, ncol)), np.zeros(0, np.int64), kstpkper
+    values = np.concatenate(values)
+    itime = np.maximum(np.concatenate(itime), 0)
+    return values, itime, kstpkper
+
+
 class SfrFile:
     """
     Read SFR package results from text file (ISTCB2 > 0)
@@ -117,6 +201,7 @@ class SfrFile:
         self.times = self.get_times()
         self.geoms = None  # not implemented yet
         self._df = None
+        self._rchindex = None
 
     def get_times(self):
         """
@@ -170,36 +255,25 @@ class SfrFile:
             SFR output as a pandas dataframe
 
         """
-
-        df = self.pd.read_csv(
-            self.filename,
-            delim_whitespace=True,
-            header=None,
-            names=self.names,
-            error_bad_lines=False,
-            skiprows=self.sr,
-            low_memory=False,
+        values, itime, times = _read_sfr_results(
+            self.filename, len(self.names)
         )
 
-        # drop text between stress periods; convert to numeric
-        df["layer"] = self.pd.to_numeric(df.layer, errors="coerce")
-        df.dropna(axis=0, inplace=True)
-
         # convert to proper dtypes
-        for c in df.columns:
-            df[c] = df[c].astype(self.dtypes.get(c, float))
+        df = self.pd.DataFrame(
+            {
+                c: values[:, i].astype(self.dtypes.get(c, float))
+                for i, c in enumerate(self.names)
+            },
+            columns=self.names,
+        )
 
         # add time, reachID, and reach geometry (if it exists)
         self.nstrm = self.get_nstrm(df)
-        dftimes = []
-        times = self.get_times()
-        newper = df.segment.diff().fillna(0).values < 0
-        kstpkper = times.pop(0)
-        for per in newper:
-            if per:
-                kstpkper = times.pop(0)
-            dftimes.append(kstpkper)
-        df["kstpkper"] = dftimes
+        kstpkper = np.empty(max(len(times), 1), dtype=object)
+        for i, kstpkper_i in enumerate(times):
+            kstpkper[i] = kstpkper_i
+        df["kstpkper"] = kstpkper[itime]
         df["k"] = df["layer"] - 1
         df["i"] = df["row"] - 1
         df["j"] = df["column"] - 1
@@ -208,8 +282,38 @@ class SfrFile:
             geoms = self.geoms * self.nstrm
             df["geometry"] = geoms
         self._df = df
+        self._rchindex = None
         return df
 
+    def _get_rows(self, segment, reach):
+        """
+        Get the dataframe rows with results for a segment and reach, using
+        an index of the rows sorted by segment and reach that is built the
+        first time it is needed.
+
+        Returns
+        -------
+        rows : numpy array
+            Positions of the rows in SfrFile.df, in file order.
+
+        """
+        if self._rchindex is None:
+            segments = self.df.segment.values.astype(np.int64)
+            reaches = self.df.reach.values.astype(np.int64)
+            nreach = reaches.max() + 1 if reaches.shape[0] > 0 else 1
+            key = segments * nreach + reaches
+            order = np.argsort(key, kind="stable")
+            keys, start = np.unique(key[order], return_index=True)
+            end = np.append(start[1:], order.shape[0])
+            self._rchindex = (nreach, keys, start, end, order)
+        nreach, keys, start, end, order = self._rchindex
+        if reach < 0 or reach >= nreach:
+            return order[:0]
+        idx = np.searchsorted(keys, segment * nreach + reach)
+        if idx == keys.shape[0] or keys[idx] != segment * nreach + reach:
+            return order[:0]
+        return order[start[idx] : end[idx]]
+
     def _get_result(self, segment, reach):
         """
 
@@ -224,9 +328,7 @@ class SfrFile:
         -------
 
         """
-        return self.df.loc[
-            (self.df.segment == segment) & (self.df.reach == reach)
-        ].copy()
+        return self.df.iloc[self._get_rows(segment, reach)].copy()
 
     def get_results(self, segment, reach):
         """
@@ -249,13 +351,17 @@ class SfrFile:
             segment = int(segment)
             reach = int(reach)
             results = self._get_result(segment, reach)
-        except:
+        except TypeError:
             locsr = list(zip(segment, reach))
-            results = self.pd.DataFrame()
+            rows = []
             for s, r in locsr:
-                srresults = self._get_result(s, r)
-                if len(srresults) > 0:
-                    results = results.append(srresults)
+                srrows = self._get_rows(s, r)
+                if len(srrows) > 0:
+                    rows.append(srrows)
                 else:
                     print("No results for segment {}, reach {}!".format(s, r))
+            if len(rows) > 0:
+                results = self.df.iloc[np.concatenate(rows)].copy()
+            else:
+                results = self.pd.DataFrame()
         return results
@@ -34,6 +34,9 @@ class SwrFile(FlopyBinaryData):
 
     Notes
     -----
+    Data records are read from a read-only memory map of the file, so
+    time series only read the values for the selected reach from each
+    record.
 
     Examples
     --------
@@ -103,6 +106,9 @@ class SwrFile(FlopyBinaryData):
 
         self.datastart = self.file.tell()
 
+        # memory map the file to read data records
+        self._mm = np.memmap(filename, dtype=np.uint8, mode="r")
+
         # build index
         self._build_index()
 
@@ -405,16 +411,14 @@ class SwrFile(FlopyBinaryData):
     def _read_header(self):
         nitems = 0
         if self.type == "exchange" or self.type == "structure":
-            itemlist = np.zeros(self.nrecord, np.int)
-            try:
-                for i in range(self.nrecord):
-                    itemlist[i] = self.read_integer()
-                    nitems += itemlist[i]
-                self.nitems = nitems
-            except:
+            itemlist = self.read_record(self.nrecord, dtype=self.integer)
+            if itemlist.shape[0] < self.nrecord:
                 if self.verbose:
                     sys.stdout.write("\nCould not read itemlist")
                 return 0.0, 0.0, 0, 0, 0, False
+            itemlist = itemlist.astype(np.int)
+            nitems = int(itemlist.sum())
+            self.nitems = nitems
         try:
             totim = self.read_real()
             dt = self.read_real()
@@ -432,17 +436,11 @@ class SwrFile(FlopyBinaryData):
         # create array
         gage_record = np.zeros(self._ntimes, dtype=self.out_dtype)
 
-        # iterate through the record dictionary
-        idx = 0
-        for key, value in self.recorddict.items():
-            totim = np.array(key)
-            gage_record["totim"][idx] = totim
-
-            self.file.seek(value)
-            r = self._get_data()
-            for name in r.dtype.names:
-                gage_record[name][idx] = r[name][irec]
-            idx += 1
+        # read the values for the record from every time in the file
+        gage_record["totim"] = self._records["totim"]
+        r = self._records["data"][:, irec]
+        for name in r.dtype.names:
+            gage_record[name] = r[name]
 
         return gage_record.view(dtype=self.out_dtype)
 
@@ -450,25 +448,17 @@ class SwrFile(FlopyBinaryData):
 
         # create array
         gage_record = np.zeros(self._ntimes, dtype=self.out_dtype)
+        gage_record["totim"] = self._records["totim"]
 
-        # iterate through the record dictionary
-        idx = 0
-        for key, value in self.recorddict.items():
-            totim = key
-            gage_record["totim"][idx] = totim
-
-            self.file.seek(value)
-            r = self._get_data()
-
-            # find correct entry for reach and connection
-            for i in range(self.nrecord):
-                inode = self.connectivity[i, 1]
-                ic = self.connectivity[i, 2]
-                if irec == inode and ic == iconn:
-                    for name in r.dtype.names:
-                        gage_record[name][idx] = r[name][i]
-                    break
-            idx += 1
+        # find correct entry for reach and connection
+        i = np.flatnonzero(
+            (self.connectivity[:, 1] == irec)
+            & (self.connectivity[:, 2] == iconn)
+        )
+        if i.shape[0] > 0:
+            r = self._records["data"][:, i[0]]
+            for name in r.dtype.names:
+                gage_record[name] = r[name]
 
         return gage_record.view(dtype=self.out_dtype)
 
@@ -485,18 +475,15 @@ class SwrFile(FlopyBinaryData):
 
             self.nitems, self.itemlist = self.nentries[key]
 
-            self.file.seek(value)
-            r = self._get_data()
-
-            # find correct entry for record and layer
-            ilen = np.shape(r)[0]
-            for i in range(ilen):
-                ir = r["reach"][i]
-                il = r["layer"][i]
-                if ir == irec and il == klay:
-                    for name in r.dtype.names:
-                        gage_record[name][idx] = r[name][i]
-                    break
+            # find correct entry for record and layer in the items of
+            # the record
+            r = self._read_items(value, irec)
+            i = np.flatnonzero(r["layer"] - 1 == klay)
+            if i.shape[0] > 0:
+                gage_record["reach"][idx] = irec
+                for name in r.dtype.names:
+                    gage_record[name][idx] = r[name][i[0]]
+                gage_record["layer"][idx] -= 1
             idx += 1
 
         return gage_record.view(dtype=self.out_dtype)
@@ -514,22 +501,49 @@ class SwrFile(FlopyBinaryData):
 
             self.nitems, self.itemlist = self.nentries[key]
 
-            self.file.seek(value)
-            r = self._get_data()
-
-            # find correct entry for record and structure number
-            ilen = np.shape(r)[0]
-            for i in range(ilen):
-                ir = r["reach"][i]
-                il = r["structure"][i]
-                if ir == irec and il == istr:
-                    for name in r.dtype.names:
-                        gage_record[name][idx] = r[name][i]
-                    break
+            # find correct entry for record and structure number in the
+            # items of the record
+            r = self._read_items(value, irec)
+            if istr < r.shape[0]:
+                gage_record["reach"][idx] = irec
+                gage_record["structure"][idx] = istr
+                for name in r.dtype.names:
+                    gage_record[name][idx] = r[name][istr]
             idx += 1
 
         return gage_record.view(dtype=self.out_dtype)
 
+    def _get_records(self):
+        """
+        Get a read-only view of the complete records in a file with fixed
+        size records (stage, budget, and flow data).
+
+        """
+        dtype = np.dtype(
+            [
+                ("totim", self.floattype),
+                ("dt", self.floattype),
+                ("kper", self.integer),
+                ("kstp", self.integer),
+                ("kswr", self.integer),
+                ("data", self.dtype, (self.nrecord,)),
+            ]
+        )
+        nrec = (self._mm.shape[0] - self.datastart) // dtype.itemsize
+        i1 = self.datastart + nrec * dtype.itemsize
+        return self._mm[self.datastart : i1].view(dtype)
+
+    def _read_items(self, ipos, irec):
+        """
+        Read the exchange or structure items for a single record from the
+        data that start at ipos, using the current itemlist.
+
+        """
+        i0 = int(self.itemlist[:irec].sum())
+        i1 = i0 + int(self.itemlist[irec])
+        size = self.dtype.itemsize
+        return self._mm[ipos + i0 * size : ipos + i1 * size].view(self.dtype)
+
     def _get_data(self):
         if self.type == "exchange":
             return self._read_qaq()
@@ -547,18 +561,8 @@ class SwrFile(FlopyBinaryData):
         # add reach number to qaq data
         r = np.zeros(self.nitems, dtype=self.qaq_dtype)
 
-        # build array with reach numbers
-        reaches = np.zeros(self.nitems, dtype=np.int32)
-        idx = 0
-        for irch in range(self.nrecord):
-            klay = self.itemlist[irch]
-            for k in range(klay):
-                # r[idx, 0] = irch
-                reaches[idx] = irch
-                idx += 1
-
-        # add reach to array returned
-        r["reach"] = reaches.copy()
+        # add reach numbers to array returned
+        r["reach"] = np.repeat(np.arange(self.nrecord), self.itemlist)
 
         # add read data to array returned
         for idx, k in enumerate(self.dtype.names):
@@ -573,20 +577,12 @@ class SwrFile(FlopyBinaryData):
         # add reach and structure number to structure data
         r = np.zeros(self.nitems, dtype=self.str_dtype)
 
-        # build array with reach numbers
-        reaches = np.zeros(self.nitems, dtype=np.int32)
-        struct = np.zeros(self.nitems, dtype=np.int32)
-        idx = 0
-        for irch in range(self.nrecord):
-            nstr = self.itemlist[irch]
-            for n in range(nstr):
-                reaches[idx] = irch
-                struct[idx] = n
-                idx += 1
-
-        # add reach to array returned
-        r["reach"] = reaches.copy()
-        r["structure"] = struct.copy()
+        # add reach and structure numbers to array returned
+        istart = np.cumsum(self.itemlist) - self.itemlist
+        r["reach"] = np.repeat(np.arange(self.nrecord), self.itemlist)
+        r["structure"] = np.arange(self.nitems) - np.repeat(
+            istart, self.itemlist
+        )
 
         # add read data to array returned
         for idx, k in enumerate(self.dtype.names):
@@ -601,6 +597,31 @@ class SwrFile(FlopyBinaryData):
         self.file.seek(self.datastart)
         if self.verbose:
             sys.stdout.write("Generating SWR binary data time list\n")
+
+        if self.type not in ("exchange", "structure"):
+            # records have a fixed size, so the headers of all of the
+            # records are read from the memory mapped file at once
+            self._records = self._get_records()
+            ntimes = self._records.shape[0]
+            self._ntimes = ntimes
+            self._times = np.array(self._records["totim"])
+            self._recordarray = np.zeros(ntimes, dtype=self.header_dtype)
+            for name in ("kswr", "kstp", "kper"):
+                self._recordarray[name] = self._records[name] - 1
+            self._recordarray["totim"] = self._times
+            self._kswrkstpkper = np.column_stack(
+                [self._recordarray[name] for name in ("kswr", "kstp", "kper")]
+            )
+            ipos = (
+                self.datastart
+                + np.arange(ntimes) * self._records.dtype.itemsize
+                + self._records.dtype.fields["data"][1]
+            )
+            self.recorddict = OrderedDict(
+                zip(self._times.tolist(), ipos.tolist())
+            )
+            return
+
         self._ntimes = 0
         self._times = []
         self._kswrkstpkper = []
@@ -1,7 +1,9 @@
 import os
 import copy
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from .binaryfile import CellBudgetFile
+from .mfgrdfile import MfGrdFile
 from itertools import groupby
 from collections import OrderedDict
 from ..utils.utils_def import totim_to_datetime
@@ -29,6 +31,22 @@ class ZoneBudget(object):
         When using this option in conjunction with a list of zones, the
         zone(s) passed may either be all strings (aliases), all integers,
         or mixed.
+    pool : string
+        None, 'thread' or 'process'.  If None, the budgets are computed
+        one time step at a time.  Otherwise, the time steps are split into
+        groups that are computed by a pool of threads or processes, each
+        reading the cell budget file with its own file handle.
+        (default is None)
+    max_workers : int
+        Maximum number of threads or processes used if pool is not None.
+        Default is None, which uses the concurrent.futures default.
+    grb_file : str or MfGrdFile
+        The MODFLOW 6 binary grid file name or MfGrdFile object of the
+        model.  If specified, the flows between zones are computed from
+        the FLOW-JA-FACE record and the IA/JA connectivity of the binary
+        grid file, which supports DIS, DISV and DISU models.  The zone
+        array may then have any shape with the number of cells of the
+        model or of a layer.  (default is None)
 
     Returns
     -------
@@ -42,6 +60,8 @@ class ZoneBudget(object):
     >>> zb = ZoneBudget('zonebudtest.cbc', zon, kstpkper=(0, 0))
     >>> zb.to_csv('zonebudtest.csv')
     >>> zb_mgd = zb * 7.48052 / 1000000
+
+    >>> zb = ZoneBudget('model.cbc', zon, grb_file='model.disv.grb')
     """
 
     def __init__(
@@ -52,9 +72,35 @@ class ZoneBudget(object):
         totim=None,
         aliases=None,
         verbose=False,
+        pool=None,
+        max_workers=None,
+        grb_file=None,
+        **kwargs
+    ):
+
+        if pool not in (None, "thread", "process"):
+            raise Exception("Unknown pool specified: " + str(pool))
+
+        self._setup(cbc_file, z, kstpkper, totim, aliases, grb_file, **kwargs)
+        _build_budgets([self], pool, max_workers, verbose)
+
+        return
+
+    def _setup(
+        self,
+        cbc_file,
+        z,
+        kstpkper=None,
+        totim=None,
+        aliases=None,
+        grb_file=None,
         **kwargs
     ):
+        """
+        Set up the zones, time steps and budget record names of the
+        ZoneBudget object.  The budgets are not computed.
 
+        """
         if isinstance(cbc_file, CellBudgetFile):
             self.cbc = cbc_file
         elif isinstance(cbc_file, str) and os.path.isfile(cbc_file):
@@ -97,7 +143,24 @@ class ZoneBudget(object):
             raise Exception("LayerFile error: unrecognized kwargs: " + args)
 
         # Check the shape of the cbc budget file arrays
-        self.cbc_shape = self.cbc.get_data(idx=0, full3D=True)[0].shape
+        if grb_file is None:
+            self._ia, self._ja = None, None
+            self.cbc_shape = self.cbc.get_data(idx=0, full3D=True)[0].shape
+        else:
+            if not isinstance(grb_file, MfGrdFile):
+                grb_file = MfGrdFile(grb_file)
+            grbdata = grb_file._datadict
+            self._ia, self._ja = grbdata["IA"], grbdata["JA"]
+            if grb_file._grid == "DIS":
+                self.cbc_shape = (
+                    grbdata["NLAY"],
+                    grbdata["NROW"],
+                    grbdata["NCOL"],
+                )
+            elif grb_file._grid == "DISV":
+                self.cbc_shape = (grbdata["NLAY"], 1, grbdata["NCPL"])
+            else:
+                self.cbc_shape = (1, 1, grbdata["NODES"])
         self.nlay, self.nrow, self.ncol = self.cbc_shape
         self.cbc_times = self.cbc.get_times()
         self.cbc_kstpkper = self.cbc.get_kstpkper()
@@ -134,6 +197,14 @@ class ZoneBudget(object):
         self.float_type = np.float32
         self.int_type = np.int32
 
+        # Zone arrays of MODFLOW 6 models may have the shape of the model
+        # grid or of a layer of the model grid
+        if self._ja is not None and z.shape != self.cbc_shape:
+            if z.size == self.nlay * self.nrow * self.ncol:
+                z = z.reshape(self.cbc_shape)
+            elif z.size == self.nrow * self.ncol:
+                z = z.reshape(self.nrow, self.ncol)
+
         # Check dimensions of input zone array
         s = (
             "Row/col dimensions of zone array {}"
@@ -157,6 +228,11 @@ class ZoneBudget(object):
 
         self.izone = izone
         self.allzones = np.unique(izone)
+
+        # zone index of each cell and the cells on either side of the faces
+        # between zones are the same for every time step
+        self._zoneidx = np.searchsorted(self.allzones, izone.ravel())
+        self._faceidx = self._get_face_index()
         self._zonenamedict = OrderedDict(
             [(z, "ZONE_{}".format(z)) for z in self.allzones]
         )
@@ -196,58 +272,34 @@ class ZoneBudget(object):
         # CONSTANT-HEAD TERMS ARE USED TO IDENTIFY WHERE CONSTANT-HEAD CELLS
         # ARE AND THEN USE FACE FLOWS TO DETERMINE THE AMOUNT OF FLOW.
         # SWIADDTO--- terms are used by the SWI2 groundwater flow process.
-        internal_flow_terms = [
-            "CONSTANT HEAD",
-            "FLOW RIGHT FACE",
-            "FLOW FRONT FACE",
-            "FLOW LOWER FACE",
-            "SWIADDTOCH",
-            "SWIADDTOFRF",
-            "SWIADDTOFFF",
-            "SWIADDTOFLF",
-        ]
+        # MODFLOW 6 flows between cells are in the FLOW-JA-FACE term and
+        # constant head flows are a source/sink term.
+        if self._ja is None:
+            internal_flow_terms = [
+                "CONSTANT HEAD",
+                "FLOW RIGHT FACE",
+                "FLOW FRONT FACE",
+                "FLOW LOWER FACE",
+                "SWIADDTOCH",
+                "SWIADDTOFRF",
+                "SWIADDTOFFF",
+                "SWIADDTOFLF",
+            ]
+        else:
+            internal_flow_terms = ["FLOW-JA-FACE", "FLOW JA FACE"]
 
         # Source/sink/storage term record names
         # These are all of the terms that are not related to constant
-        # head cells or face flow terms
+        # head cells or face flow terms, or MODFLOW 6 auxiliary data such
+        # as DATA-SPDIS and DATA-SAT
         self.ssst_record_names = [
-            n for n in self.record_names if n not in internal_flow_terms
+            n
+            for n in self.record_names
+            if n not in internal_flow_terms and not n.startswith("DATA-")
         ]
 
-        # Initialize budget recordarray
-        array_list = []
-        if self.kstpkper is not None:
-            for kk in self.kstpkper:
-                recordarray = self._initialize_budget_recordarray(
-                    kstpkper=kk, totim=None
-                )
-                array_list.append(recordarray)
-        elif self.totim is not None:
-            for t in self.totim:
-                recordarray = self._initialize_budget_recordarray(
-                    kstpkper=None, totim=t
-                )
-                array_list.append(recordarray)
-        self._budget = np.concatenate(array_list, axis=0)
-
-        # Update budget record array
-        if self.kstpkper is not None:
-            for kk in self.kstpkper:
-                if verbose:
-                    s = (
-                        "Computing the budget for"
-                        " time step {} in stress period {}".format(
-                            kk[0] + 1, kk[1] + 1
-                        )
-                    )
-                    print(s)
-                self._compute_budget(kstpkper=kk)
-        elif self.totim is not None:
-            for t in self.totim:
-                if verbose:
-                    s = "Computing the budget for time {}".format(t)
-                    print(s)
-                self._compute_budget(totim=t)
+        # Budget record names of a time step
+        self._recnames = self._get_budget_record_names()
 
         return
 
@@ -517,91 +569,83 @@ class ZoneBudget(object):
         result.cbc = self.cbc
         return result
 
-    def _compute_budget(self, kstpkper=None, totim=None):
+    def _get_steps(self):
         """
-        Creates a budget for the specified zone array. This function only
-        supports the use of a single time step/stress period or time.
+        Get the (kstpkper, totim) tuples of the time steps for which the
+        budgets are computed.
 
-        Parameters
-        ----------
-        kstpkper : tuple
-            Tuple of kstp and kper to compute budget for (default is None).
-        totim : float
-            Totim to compute budget for (default is None).
+        """
+        if self.kstpkper is not None:
+            return [(kk, None) for kk in self.kstpkper]
+        else:
+            return [(None, t) for t in self.totim]
+
+    def _get_face_index(self):
+        """
+        Get the node numbers of the cells on either side of the faces
+        between cells in different zones in each face flow direction.
 
         Returns
         -------
-        None
+        faceidx : dict
+            Dictionary with the array axis of the face flow direction
+            (2 for FLOW RIGHT FACE, 1 for FLOW FRONT FACE and 0 for FLOW
+            LOWER FACE) as keys and tuples of the node numbers of the first
+            and second cell of each face as values.  For MODFLOW 6 models,
+            the only key is "FLOW-JA-FACE" and the value is a tuple of the
+            positions of the faces in the FLOW-JA-FACE record and the node
+            numbers of the first and second cell of each face.
 
         """
-        # Initialize an array to track where the constant head cells
-        # are located.
-        ich = np.zeros(self.cbc_shape, self.int_type)
-        swiich = np.zeros(self.cbc_shape, self.int_type)
-
-        if "CONSTANT HEAD" in self.record_names:
-            """
-            C-----CONSTANT-HEAD FLOW -- DON'T ACCUMULATE THE CELL-BY-CELL VALUES FOR
-            C-----CONSTANT-HEAD FLOW BECAUSE THEY MAY INCLUDE PARTIALLY CANCELING
-            C-----INS AND OUTS.  USE CONSTANT-HEAD TERM TO IDENTIFY WHERE CONSTANT-
-            C-----HEAD CELLS ARE AND THEN USE FACE FLOWS TO DETERMINE THE AMOUNT OF
-            C-----FLOW.  STORE CONSTANT-HEAD LOCATIONS IN ICH ARRAY.
-            """
-            chd = self.cbc.get_data(
-                text="CONSTANT HEAD",
-                full3D=True,
-                kstpkper=kstpkper,
-                totim=totim,
-            )[0]
-            ich[np.ma.where(chd != 0.0)] = 1
-        if "FLOW RIGHT FACE" in self.record_names:
-            self._accumulate_flow_frf("FLOW RIGHT FACE", ich, kstpkper, totim)
-        if "FLOW FRONT FACE" in self.record_names:
-            self._accumulate_flow_fff("FLOW FRONT FACE", ich, kstpkper, totim)
-        if "FLOW LOWER FACE" in self.record_names:
-            self._accumulate_flow_flf("FLOW LOWER FACE", ich, kstpkper, totim)
-        if "SWIADDTOCH" in self.record_names:
-            swichd = self.cbc.get_data(
-                text="SWIADDTOCH", full3D=True, kstpkper=kstpkper, totim=totim
-            )[0]
-            swiich[swichd != 0] = 1
-        if "SWIADDTOFRF" in self.record_names:
-            self._accumulate_flow_frf("SWIADDTOFRF", swiich, kstpkper, totim)
-        if "SWIADDTOFFF" in self.record_names:
-            self._accumulate_flow_fff("SWIADDTOFFF", swiich, kstpkper, totim)
-        if "SWIADDTOFLF" in self.record_names:
-            self._accumulate_flow_flf("SWIADDTOFLF", swiich, kstpkper, totim)
-
-        # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
-        # ACCUMULATE THE FLOW BY ZONE
-        # iterate over remaining items in the list
-        for recname in self.ssst_record_names:
-            self._accumulate_flow_ssst(recname, kstpkper, totim)
-
-        # Compute mass balance terms
-        self._compute_mass_balance(kstpkper, totim)
+        if self._ja is None:
+            return {axis: _get_faces(self.izone, axis) for axis in range(3)}
+
+        # The flow of a connection is positive for flow into the cell of
+        # the row from the connected cell, and each face is taken from the
+        # row of the cell with the lower node number
+        n = np.repeat(np.arange(self._ia.size - 1), np.diff(self._ia))
+        m = self._ja - 1
+        izone = self.izone.ravel()
+        ipos = np.flatnonzero((n < m) & (izone[n] != izone[m]))
+        return {"FLOW-JA-FACE": (ipos, m[ipos], n[ipos])}
+
+    def _get_budget_record_names(self):
+        """
+        Get the names of the budget records of a time step, in the order
+        of the rows of the budget record array.
 
-        return
+        Returns
+        -------
+        recnames : list of strings
 
-    def _add_empty_record(
-        self, recordarray, recname, kstpkper=None, totim=None
-    ):
         """
-        Build an empty records based on the specified flow direction and
-        record name for the given list of zones.
-
-        Parameters
-        ----------
-        recordarray :
-        recname :
-        kstpkper : tuple
-            Tuple of kstp and kper to compute budget for (default is None).
-        totim : float
-            Totim to compute budget for (default is None).
+        recnames = []
+        for prefix, total in (("FROM_", "TOTAL_IN"), ("TO_", "TOTAL_OUT")):
+            if "STORAGE" in self.record_names:
+                recnames.append(prefix + "STORAGE")
+            if (
+                "CONSTANT HEAD" in self.record_names
+                and "CONSTANT HEAD" not in self.ssst_record_names
+            ):
+                recnames.append(prefix + "CONSTANT_HEAD")
+            for recname in self.ssst_record_names:
+                if recname != "STORAGE":
+                    recnames.append(prefix + "_".join(recname.split()))
+            for n in self._zonenamedict.values():
+                recnames.append(prefix + "_".join(n.split()))
+            recnames.append(total)
+        recnames += ["IN-OUT", "PERCENT_DISCREPANCY"]
+        return recnames
+
+    def _get_step_time(self, kstpkper=None, totim=None):
+        """
+        Get the simulation time and the time step and stress period of a
+        time step defined by either kstpkper or totim.
 
         Returns
         -------
-        recordarray : np.recarray
+        totim : float
+        kstpkper : tuple
 
         """
         if kstpkper is not None:
@@ -614,20 +658,18 @@ class ZoneBudget(object):
                 kstpkper = self.cbc_kstpkper[self.cbc_times.index(totim)]
             else:
                 kstpkper = (0, 0)
+        return totim, kstpkper
 
-        row = [totim, kstpkper[0], kstpkper[1], recname]
-        row += [0.0 for _ in self._zonenamedict.values()]
-        recs = np.array(tuple(row), dtype=recordarray.dtype)
-        recordarray = np.append(recordarray, recs)
-        return recordarray
-
-    def _initialize_budget_recordarray(self, kstpkper=None, totim=None):
+    def _compute_budget(self, cbc, kstpkper=None, totim=None):
         """
-        Initialize the budget record array which will store all of the
-        fluxes in the cell-budget file.
+        Creates a budget for the specified zone array. This function only
+        supports the use of a single time step/stress period or time.
 
         Parameters
         ----------
+        cbc : CellBudgetFile
+            Cell budget file or cache of cell budget file records of the
+            time step.
         kstpkper : tuple
             Tuple of kstp and kper to compute budget for (default is None).
         totim : float
@@ -635,818 +677,340 @@ class ZoneBudget(object):
 
         Returns
         -------
+        budget : ndarray
+            Array of shape (nrecords, nzones) with the budget records.
 
         """
+        nzones = len(self.allzones)
+        budget = np.zeros((len(self._recnames), nzones), np.float64)
 
-        # Create empty array for the budget terms.
-        dtype_list = [
-            ("totim", "<f4"),
-            ("time_step", "<i4"),
-            ("stress_period", "<i4"),
-            ("name", (str, 50)),
-        ]
-        dtype_list += [
-            (n, self.float_type) for n in self._zonenamedict.values()
-        ]
-        dtype = np.dtype(dtype_list)
-        recordarray = np.array([], dtype=dtype)
+        # Flow between zones, with the zone the flow is coming from as row
+        # and the zone the flow is going to as column
+        flowmat = np.zeros((nzones, nzones), np.float64)
 
-        # Add "from" records
-        if "STORAGE" in self.record_names:
-            recordarray = self._add_empty_record(
-                recordarray, "FROM_STORAGE", kstpkper, totim
-            )
-        if "CONSTANT HEAD" in self.record_names:
-            recordarray = self._add_empty_record(
-                recordarray, "FROM_CONSTANT_HEAD", kstpkper, totim
-            )
-        for recname in self.ssst_record_names:
-            if recname != "STORAGE":
-                recordarray = self._add_empty_record(
-                    recordarray,
-                    "FROM_" + "_".join(recname.split()),
-                    kstpkper,
-                    totim,
-                )
+        # Initialize an array to track where the constant head cells
+        # are located.
+        ich = np.zeros(self.cbc_shape, bool)
+        swiich = np.zeros(self.cbc_shape, bool)
 
-        for z, n in self._zonenamedict.items():
-            if z == 0 and 0 not in self.allzones:
-                continue
-            else:
-                recordarray = self._add_empty_record(
-                    recordarray, "FROM_" + "_".join(n.split()), kstpkper, totim
+        if (
+            "CONSTANT HEAD" in self.record_names
+            and "CONSTANT HEAD" not in self.ssst_record_names
+        ):
+            """
+            C-----CONSTANT-HEAD FLOW -- DON'T ACCUMULATE THE CELL-BY-CELL VALUES FOR
+            C-----CONSTANT-HEAD FLOW BECAUSE THEY MAY INCLUDE PARTIALLY CANCELING
+            C-----INS AND OUTS.  USE CONSTANT-HEAD TERM TO IDENTIFY WHERE CONSTANT-
+            C-----HEAD CELLS ARE AND THEN USE FACE FLOWS TO DETERMINE THE AMOUNT OF
+            C-----FLOW.  STORE CONSTANT-HEAD LOCATIONS IN ICH ARRAY.
+            """
+            chd = cbc.get_data(
+                text="CONSTANT HEAD",
+                full3D=True,
+                kstpkper=kstpkper,
+                totim=totim,
+            )[0]
+            ich = np.ma.filled(chd != 0.0, False)
+        for recname, axis in (
+            ("FLOW RIGHT FACE", 2),
+            ("FLOW FRONT FACE", 1),
+            ("FLOW LOWER FACE", 0),
+        ):
+            if recname in self.record_names:
+                self._accumulate_flow_face(
+                    cbc, recname, axis, ich, kstpkper, totim, flowmat, budget
                 )
-        recordarray = self._add_empty_record(
-            recordarray, "TOTAL_IN", kstpkper, totim
-        )
-
-        # Add "out" records
-        if "STORAGE" in self.record_names:
-            recordarray = self._add_empty_record(
-                recordarray, "TO_STORAGE", kstpkper, totim
-            )
-        if "CONSTANT HEAD" in self.record_names:
-            recordarray = self._add_empty_record(
-                recordarray, "TO_CONSTANT_HEAD", kstpkper, totim
-            )
-        for recname in self.ssst_record_names:
-            if recname != "STORAGE":
-                recordarray = self._add_empty_record(
-                    recordarray,
-                    "TO_" + "_".join(recname.split()),
+        if "SWIADDTOCH" in self.record_names:
+            swichd = cbc.get_data(
+                text="SWIADDTOCH", full3D=True, kstpkper=kstpkper, totim=totim
+            )[0]
+            swiich = np.ma.filled(swichd != 0, False)
+        for recname, axis in (
+            ("SWIADDTOFRF", 2),
+            ("SWIADDTOFFF", 1),
+            ("SWIADDTOFLF", 0),
+        ):
+            if recname in self.record_names:
+                self._accumulate_flow_face(
+                    cbc,
+                    recname,
+                    axis,
+                    swiich,
                     kstpkper,
                     totim,
+                    flowmat,
+                    budget,
                 )
-
-        for z, n in self._zonenamedict.items():
-            if z == 0 and 0 not in self.allzones:
-                continue
-            else:
-                recordarray = self._add_empty_record(
-                    recordarray, "TO_" + "_".join(n.split()), kstpkper, totim
+        for recname in ("FLOW-JA-FACE", "FLOW JA FACE"):
+            if self._ja is not None and recname in self.record_names:
+                self._accumulate_flow_ja(
+                    cbc, recname, kstpkper, totim, flowmat
                 )
-        recordarray = self._add_empty_record(
-            recordarray, "TOTAL_OUT", kstpkper, totim
-        )
 
-        recordarray = self._add_empty_record(
-            recordarray, "IN-OUT", kstpkper, totim
-        )
-        recordarray = self._add_empty_record(
-            recordarray, "PERCENT_DISCREPANCY", kstpkper, totim
-        )
-        return recordarray
-
-    @staticmethod
-    def _filter_circular_flow(fz, tz, f):
-        """
-
-        Parameters
-        ----------
-        fz
-        tz
-        f
+        # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
+        # ACCUMULATE THE FLOW BY ZONE
+        # iterate over remaining items in the list
+        for recname in self.ssst_record_names:
+            self._accumulate_flow_ssst(cbc, recname, kstpkper, totim, budget)
+
+        # Flow from and to other zones, flow into zone 0 is not included
+        # in the inflows and flow out of zone 0 is not included in the
+        # outflows
+        itotin = self._recnames.index("TOTAL_IN")
+        itotout = self._recnames.index("TOTAL_OUT")
+        budget[itotin - nzones : itotin] = flowmat
+        budget[itotin - nzones : itotin, self.allzones == 0] = 0.0
+        budget[itotout - nzones : itotout] = flowmat.T
+        budget[itotout - nzones : itotout, self.allzones == 0] = 0.0
 
-        Returns
-        -------
+        # Compute mass balance terms
+        intot = budget[:itotin].sum(axis=0)
+        outot = budget[itotin + 1 : itotout].sum(axis=0)
+        budget[itotin] = intot
+        budget[itotout] = outot
+        budget[itotout + 1] = np.abs(intot - outot)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            budget[itotout + 2] = np.abs(
+                100 * (intot - outot) / ((intot + outot) / 2.0)
+            )
+        return budget
 
-        """
-        e = np.equal(fz, tz)
-        fz = fz[np.logical_not(e)]
-        tz = tz[np.logical_not(e)]
-        f = f[np.logical_not(e)]
-        return fz, tz, f
-
-    def _update_budget_fromfaceflow(
-        self, fz, tz, f, kstpkper=None, totim=None
+    def _accumulate_flow_face(
+        self, cbc, recname, axis, ich, kstpkper, totim, flowmat, budget
     ):
         """
+        Accumulate the face flows of a face flow record in the flow
+        matrix and the flow to and from constant head cells in the budget.
 
         Parameters
         ----------
-        fz
-        tz
-        f
-        kstpkper
-        totim
-
-        Returns
-        -------
+        cbc : CellBudgetFile
+            Cell budget file or cache of cell budget file records of the
+            time step.
+        recname : str
+            Face flow record name.
+        axis : int
+            Array axis of the face flow direction.
+        ich : ndarray
+            Boolean array that is True for constant head cells.
+        kstpkper : tuple
+        totim : float
+        flowmat : ndarray
+            Array of shape (nzones, nzones) with the flow from the zone
+            in the row to the zone in the column.
+        budget : ndarray
+            Array of shape (nrecords, nzones) with the budget records.
 
         """
-
-        # No circular flow within zones
-        fz, tz, f = self._filter_circular_flow(fz, tz, f)
-
-        if len(f) == 0:
+        if self.cbc_shape[axis] < 2:
             return
-
-        # Inflows
-        idx = tz != 0
-        fzi = fz[idx]
-        tzi = tz[idx]
-        rownames = ["FROM_" + self._zonenamedict[z] for z in fzi]
-        colnames = [self._zonenamedict[z] for z in tzi]
-        fluxes = f[idx]
-        self._update_budget_recordarray(
-            rownames, colnames, fluxes, kstpkper, totim
+        data = cbc.get_data(text=recname, kstpkper=kstpkper, totim=totim)[0]
+        q = np.ma.filled(data, 0.0).ravel()
+        ich = ich.ravel()
+        nzones = len(self.allzones)
+
+        # The face flow of the first cell of a face is positive for flow to
+        # the second cell.  COMPUTE FLOW ONLY BETWEEN DIFFERENT ZONES.
+        # Don't include CH to CH flow (can occur if CHTOCH option is used)
+        n0, n1 = self._faceidx[axis]
+        f = np.where(ich[n0] & ich[n1], 0.0, q[n0])
+        self._accumulate_face_flows(f, n0, n1, flowmat)
+
+        # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION, the
+        # faces between a constant head cell and another cell
+        if "CONSTANT HEAD" not in self.record_names or not ich.any():
+            return
+        n0, n1 = _get_faces(ich.reshape(self.cbc_shape), axis)
+        ch1 = ich[n1]
+        f = np.where(ch1, q[n0], -q[n0])
+        zch = np.where(ch1, self._zoneidx[n1], self._zoneidx[n0])
+        irow = self._recnames.index("TO_CONSTANT_HEAD")
+        budget[irow] += np.bincount(
+            zch, weights=np.where(f > 0, f, 0.0), minlength=nzones
         )
-
-        # Outflows
-        idx = fz != 0
-        fzi = fz[idx]
-        tzi = tz[idx]
-        rownames = ["TO_" + self._zonenamedict[z] for z in tzi]
-        colnames = [self._zonenamedict[z] for z in fzi]
-        fluxes = f[idx]
-        self._update_budget_recordarray(
-            rownames, colnames, fluxes, kstpkper, totim
+        irow = self._recnames.index("FROM_CONSTANT_HEAD")
+        budget[irow] += np.bincount(
+            zch, weights=np.where(f < 0, -f, 0.0), minlength=nzones
         )
         return
 
-    def _update_budget_fromssst(self, fz, tz, f, kstpkper=None, totim=None):
+    def _accumulate_flow_ja(self, cbc, recname, kstpkper, totim, flowmat):
         """
+        Accumulate the flows between zones of a MODFLOW 6 FLOW-JA-FACE
+        record in the flow matrix.
 
         Parameters
         ----------
-        fz
-        tz
-        f
-        kstpkper
-        totim
-
-        Returns
-        -------
+        cbc : CellBudgetFile
+            Cell budget file or cache of cell budget file records of the
+            time step.
+        recname : str
+            FLOW-JA-FACE record name.
+        kstpkper : tuple
+        totim : float
+        flowmat : ndarray
+            Array of shape (nzones, nzones) with the flow from the zone
+            in the row to the zone in the column.
 
         """
-        if len(f) == 0:
-            return
-        self._update_budget_recordarray(fz, tz, f, kstpkper, totim)
+        data = cbc.get_data(text=recname, kstpkper=kstpkper, totim=totim)[0]
+        q = np.ma.filled(data, 0.0).ravel()
+        if q.size != self._ja.size:
+            raise Exception(
+                "The size of the {} record ({}) does not match the number "
+                "of connections in the binary grid file ({})".format(
+                    recname, q.size, self._ja.size
+                )
+            )
+        ipos, n0, n1 = self._faceidx["FLOW-JA-FACE"]
+        self._accumulate_face_flows(q[ipos], n0, n1, flowmat)
         return
 
-    def _update_budget_recordarray(
-        self, rownames, colnames, fluxes, kstpkper=None, totim=None
-    ):
+    def _accumulate_face_flows(self, f, n0, n1, flowmat):
         """
-        Update the budget record array with the flux for the specified
-        flow direction (in/out), record name, and column.
+        Accumulate the flows through faces between cells in different zones
+        in the flow matrix.
 
         Parameters
         ----------
-        rownames
-        colnames
-        fluxes
-        kstpkper
-        totim
-
-        Returns
-        -------
-        None
+        f : ndarray
+            Flow through each face, positive for flow from the first to the
+            second cell of the face.
+        n0, n1 : ndarray
+            Node numbers of the first and second cell of each face.
+        flowmat : ndarray
+            Array of shape (nzones, nzones) with the flow from the zone
+            in the row to the zone in the column.
 
         """
-        try:
-
-            if kstpkper is not None:
-                for rn, cn, flux in zip(rownames, colnames, fluxes):
-                    rowidx = np.where(
-                        (self._budget["time_step"] == kstpkper[0])
-                        & (self._budget["stress_period"] == kstpkper[1])
-                        & (self._budget["name"] == rn)
-                    )
-                    self._budget[cn][rowidx] += flux
-            elif totim is not None:
-                for rn, cn, flux in zip(rownames, colnames, fluxes):
-                    rowidx = np.where(
-                        (self._budget["totim"] == totim)
-                        & (self._budget["name"] == rn)
-                    )
-                    self._budget[cn][rowidx] += flux
-
-        except Exception as e:
-            print(e)
-            raise
+        nzones = len(self.allzones)
+        z0 = self._zoneidx[n0]
+        z1 = self._zoneidx[n1]
+        idx = np.where(f > 0, z0 * nzones + z1, z1 * nzones + z0)
+        flowmat += np.bincount(
+            idx, weights=np.abs(f), minlength=nzones * nzones
+        ).reshape(nzones, nzones)
         return
 
-    def _accumulate_flow_frf(self, recname, ich, kstpkper, totim):
+    def _accumulate_flow_ssst(self, cbc, recname, kstpkper, totim, budget):
         """
+        Accumulate the inflows and outflows of a source/sink or storage
+        record by zone in the budget.
 
         Parameters
         ----------
-        recname
-        ich
-        kstpkper
-        totim
-
-        Returns
-        -------
-
-        """
-        try:
-            if self.ncol >= 2:
-                data = self.cbc.get_data(
-                    text=recname, kstpkper=kstpkper, totim=totim
-                )[0]
-
-                # "FLOW RIGHT FACE"  COMPUTE FLOW BETWEEN ZONES ACROSS COLUMNS.
-                # COMPUTE FLOW ONLY BETWEEN A ZONE AND A HIGHER ZONE -- FLOW FROM
-                # ZONE 4 TO 3 IS THE NEGATIVE OF FLOW FROM 3 TO 4.
-                # 1ST, CALCULATE FLOW BETWEEN NODE J,I,K AND J-1,I,K
-
-                k, i, j = np.where(
-                    self.izone[:, :, 1:] > self.izone[:, :, :-1]
-                )
-
-                # Adjust column values to account for the starting position of "nz"
-                j += 1
-
-                # Define the zone to which flow is going
-                nz = self.izone[k, i, j]
-
-                # Define the zone from which flow is coming
-                jl = j - 1
-                nzl = self.izone[k, i, jl]
-
-                # Get the face flow
-                q = data[k, i, jl]
-
-                # Get indices where flow face values are positive (flow out of higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nzl[idx], nz[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                # Get indices where flow face values are negative (flow into higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nz[idx], nzl[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                # FLOW BETWEEN NODE J,I,K AND J+1,I,K
-                k, i, j = np.where(
-                    self.izone[:, :, :-1] > self.izone[:, :, 1:]
-                )
-
-                # Define the zone from which flow is coming
-                nz = self.izone[k, i, j]
-
-                # Define the zone to which flow is going
-                jr = j + 1
-                nzr = self.izone[k, i, jr]
-
-                # Get the face flow
-                q = data[k, i, j]
-
-                # Get indices where flow face values are positive (flow out of higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nz[idx], nzr[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                # Get indices where flow face values are negative (flow into higher zone)
-                # Don't include CH to CH flow (can occur if CHTOCH option is used)
-                # Create an iterable tuple of (from zone, to zone, flux)
-                # Then group tuple by (from_zone, to_zone) and sum the flux values
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nzr[idx], nz[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[j > 0], i[j > 0], j[j > 0]
-                jl = j - 1
-                nzl = self.izone[k, i, jl]
-                nz = self.izone[k, i, j]
-                q = data[k, i, jl]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nzl[idx], nz[idx], q[idx])
-                fz = ["TO_CONSTANT_HEAD"] * len(tzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jl] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nzl[idx], nz[idx], q[idx])
-                fz = ["FROM_CONSTANT_HEAD"] * len(fzi)
-                tz = [self._zonenamedict[z] for z in tzi[tzi != 0]]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = (
-                    k[j < self.ncol - 1],
-                    i[j < self.ncol - 1],
-                    j[j < self.ncol - 1],
-                )
-                nz = self.izone[k, i, j]
-                jr = j + 1
-                nzr = self.izone[k, i, jr]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nzr[idx], nz[idx], q[idx])
-                fz = ["FROM_CONSTANT_HEAD"] * len(tzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, i, jr] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nzr[idx], nz[idx], q[idx])
-                fz = ["TO_CONSTANT_HEAD"] * len(fzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-        except Exception as e:
-            print(e)
-            raise
-        return
-
-    def _accumulate_flow_fff(self, recname, ich, kstpkper, totim):
-        """
-
-        Parameters
-        ----------
-        recname
-        ich
-        kstpkper
-        totim
-
-        Returns
-        -------
+        cbc : CellBudgetFile
+            Cell budget file or cache of cell budget file records of the
+            time step.
+        recname : str
+            Record name.
+        kstpkper : tuple
+        totim : float
+        budget : ndarray
+            Array of shape (nrecords, nzones) with the budget records.
 
         """
-        try:
-            if self.nrow >= 2:
-                data = self.cbc.get_data(
-                    text=recname, kstpkper=kstpkper, totim=totim
-                )[0]
-
-                # "FLOW FRONT FACE"
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I-1,K
-                k, i, j = np.where(
-                    self.izone[:, 1:, :] < self.izone[:, :-1, :]
-                )
-                i += 1
-                ia = i - 1
-                nza = self.izone[k, ia, j]
-                nz = self.izone[k, i, j]
-                q = data[k, ia, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nza[idx], nz[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nz[idx], nza[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
 
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I+1,K.
-                k, i, j = np.where(
-                    self.izone[:, :-1, :] < self.izone[:, 1:, :]
-                )
-                nz = self.izone[k, i, j]
-                ib = i + 1
-                nzb = self.izone[k, ib, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nz[idx], nzb[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx], nz[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[i > 0], i[i > 0], j[i > 0]
-                ia = i - 1
-                nza = self.izone[k, ia, j]
-                nz = self.izone[k, i, j]
-                q = data[k, ia, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nza[idx], nz[idx], q[idx])
-                fz = ["TO_CONSTANT_HEAD"] * len(tzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ia, j] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nza[idx], nz[idx], q[idx])
-                fz = ["FROM_CONSTANT_HEAD"] * len(fzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = (
-                    k[i < self.nrow - 1],
-                    i[i < self.nrow - 1],
-                    j[i < self.nrow - 1],
-                )
-                nz = self.izone[k, i, j]
-                ib = i + 1
-                nzb = self.izone[k, ib, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nzb[idx], nz[idx], q[idx])
-                fz = ["FROM_CONSTANT_HEAD"] * len(tzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
+        # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
+        # ACCUMULATE THE FLOW BY ZONE
 
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[k, ib, j] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nzb[idx], nz[idx], q[idx])
-                fz = ["TO_CONSTANT_HEAD"] * len(fzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
+        imeth = self.imeth[recname]
+        nzones = len(self.allzones)
+        name = "_".join(recname.split())
+        ifrom = self._recnames.index("FROM_" + name)
+        ito = self._recnames.index("TO_" + name)
+
+        # Empty data can occur during the first time step of a transient
+        # model when storage terms are zero and not in the cell-budget
+        # file.  Packages of the same type in a MODFLOW 6 model write
+        # records with the same name.
+        records = cbc.get_data(text=recname, kstpkper=kstpkper, totim=totim)
+        for data in records:
+            if imeth == 2 or imeth == 5 or imeth == 6:
+                # LIST
+                zi = self._zoneidx[data["node"] - 1]
+                q = np.asarray(data["q"])
+            elif imeth == 0 or imeth == 1:
+                # FULL 3-D ARRAY
+                zi = self._zoneidx
+                q = np.ma.filled(data, 0.0).ravel()
+            elif imeth == 3:
+                # 1-LAYER ARRAY WITH LAYER INDICATOR ARRAY
+                rlay, rdata = data[0], data[1]
+                ncpl = self.nrow * self.ncol
+                node = (np.asarray(rlay) - 1) * ncpl + np.arange(ncpl).reshape(
+                    self.nrow, self.ncol
+                )
+                zi = self._zoneidx[node.ravel()]
+                q = np.ma.filled(rdata, 0.0).ravel()
+            elif imeth == 4:
+                # 1-LAYER ARRAY THAT DEFINES LAYER 1
+                zi = self._zoneidx[: self.nrow * self.ncol]
+                q = np.ma.filled(data, 0.0).ravel()
+            else:
+                # Should not happen
+                raise Exception(
+                    'Unrecognized "imeth" for {} record: {}'.format(
+                        recname, imeth
+                    )
                 )
 
-        except Exception as e:
-            print(e)
-            raise
+            # Inflows and outflows of zone 0 are not included
+            qin = np.bincount(
+                zi, weights=np.where(q > 0, q, 0.0), minlength=nzones
+            )
+            qout = np.bincount(
+                zi, weights=np.where(q < 0, -q, 0.0), minlength=nzones
+            )
+            qin[self.allzones == 0] = 0.0
+            qout[self.allzones == 0] = 0.0
+            budget[ifrom] += qin
+            budget[ito] += qout
         return
 
-    def _accumulate_flow_flf(self, recname, ich, kstpkper, totim):
+    def _initialize_budget_recordarray(self, steps, values):
         """
+        Build the budget record array which stores all of the fluxes in the
+        cell-budget file.
 
         Parameters
         ----------
-        recname
-        ich
-        kstpkper
-        totim
+        steps : list of tuples
+            List of (kstpkper, totim) tuples of the time steps.
+        values : ndarray
+            Array of shape (len(steps), nrecords, nzones) with the budget
+            of each time step.
 
         Returns
         -------
+        recordarray : ndarray
 
         """
-        try:
-            if self.nlay >= 2:
-                data = self.cbc.get_data(
-                    text=recname, kstpkper=kstpkper, totim=totim
-                )[0]
-
-                # "FLOW LOWER FACE"
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I,K-1
-                k, i, j = np.where(
-                    self.izone[1:, :, :] < self.izone[:-1, :, :]
-                )
-                k += 1
-                ka = k - 1
-                nza = self.izone[ka, i, j]
-                nz = self.izone[k, i, j]
-                q = data[ka, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nza[idx], nz[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nz[idx], nza[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I,K+1
-                k, i, j = np.where(
-                    self.izone[:-1, :, :] < self.izone[1:, :, :]
-                )
-                nz = self.izone[k, i, j]
-                kb = k + 1
-                nzb = self.izone[kb, i, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nz[idx], nzb[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1))
-                )
-                fzi, tzi, fi = sum_flux_tuples(nzb[idx], nz[idx], q[idx])
-                self._update_budget_fromfaceflow(
-                    fzi, tzi, np.abs(fi), kstpkper, totim
-                )
-
-                # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-                k, i, j = np.where(ich == 1)
-                k, i, j = k[k > 0], i[k > 0], j[k > 0]
-                ka = k - 1
-                nza = self.izone[ka, i, j]
-                nz = self.izone[k, i, j]
-                q = data[ka, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nza[idx], nz[idx], q[idx])
-                fz = ["TO_CONSTANT_HEAD"] * len(tzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[ka, i, j] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nza[idx], nz[idx], q[idx])
-                fz = ["FROM_CONSTANT_HEAD"] * len(fzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-                k, i, j = np.where(ich == 1)
-                k, i, j = (
-                    k[k < self.nlay - 1],
-                    i[k < self.nlay - 1],
-                    j[k < self.nlay - 1],
-                )
-                nz = self.izone[k, i, j]
-                kb = k + 1
-                nzb = self.izone[kb, i, j]
-                q = data[k, i, j]
-                idx = np.where(
-                    (q > 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nzb[idx], nz[idx], q[idx])
-                fz = ["FROM_CONSTANT_HEAD"] * len(tzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-                idx = np.where(
-                    (q < 0) & ((ich[k, i, j] != 1) | (ich[kb, i, j] != 1))
-                )
-                fzi, tzi, f = sum_flux_tuples(nzb[idx], nz[idx], q[idx])
-                fz = ["TO_CONSTANT_HEAD"] * len(fzi)
-                tz = [self._zonenamedict[z] for z in tzi]
-                self._update_budget_fromssst(
-                    fz, tz, np.abs(f), kstpkper, totim
-                )
-
-        except Exception as e:
-            print(e)
-            raise
-        return
-
-    def _accumulate_flow_ssst(self, recname, kstpkper, totim):
-
-        # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
-        # ACCUMULATE THE FLOW BY ZONE
-
-        imeth = self.imeth[recname]
-
-        data = self.cbc.get_data(text=recname, kstpkper=kstpkper, totim=totim)
-        if len(data) == 0:
-            # Empty data, can occur during the first time step of a transient
-            # model when storage terms are zero and not in the cell-budget
-            # file.
-            return
-        else:
-            data = data[0]
-
-        if imeth == 2 or imeth == 5:
-            # LIST
-            qin = np.ma.zeros(
-                (self.nlay * self.nrow * self.ncol), self.float_type
-            )
-            qout = np.ma.zeros(
-                (self.nlay * self.nrow * self.ncol), self.float_type
-            )
-            for [node, q] in zip(data["node"], data["q"]):
-                idx = node - 1
-                if q > 0:
-                    qin.data[idx] += q
-                elif q < 0:
-                    qout.data[idx] += q
-            qin = np.ma.reshape(qin, (self.nlay, self.nrow, self.ncol))
-            qout = np.ma.reshape(qout, (self.nlay, self.nrow, self.ncol))
-        elif imeth == 0 or imeth == 1:
-            # FULL 3-D ARRAY
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            qin[data > 0] = data[data > 0]
-            qout[data < 0] = data[data < 0]
-        elif imeth == 3:
-            # 1-LAYER ARRAY WITH LAYER INDICATOR ARRAY
-            rlay, rdata = data[0], data[1]
-            data = np.ma.zeros(self.cbc_shape, self.float_type)
-            for (r, c), l in np.ndenumerate(rlay):
-                data[l - 1, r, c] = rdata[r, c]
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            qin[data > 0] = data[data > 0]
-            qout[data < 0] = data[data < 0]
-        elif imeth == 4:
-            # 1-LAYER ARRAY THAT DEFINES LAYER 1
-            qin = np.ma.zeros(self.cbc_shape, self.float_type)
-            qout = np.ma.zeros(self.cbc_shape, self.float_type)
-            r, c = np.where(data > 0)
-            qin[0, r, c] = data[r, c]
-            r, c = np.where(data < 0)
-            qout[0, r, c] = data[r, c]
-        else:
-            # Should not happen
-            raise Exception(
-                'Unrecognized "imeth" for {} record: {}'.format(recname, imeth)
-            )
-
-        # Inflows
-        fz = []
-        tz = []
-        f = []
-        for z in self.allzones:
-            if z != 0:
-                flux = qin[(self.izone == z)].sum()
-                if type(flux) == np.ma.core.MaskedConstant:
-                    flux = 0.0
-                fz.append("FROM_" + "_".join(recname.split()))
-                tz.append(self._zonenamedict[z])
-                f.append(flux)
-        fz = np.array(fz)
-        tz = np.array(tz)
-        f = np.array(f)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        # Outflows
-        fz = []
-        tz = []
-        f = []
-        for z in self.allzones:
-            if z != 0:
-                flux = qout[(self.izone == z)].sum()
-                if type(flux) == np.ma.core.MaskedConstant:
-                    flux = 0.0
-                fz.append("TO_" + "_".join(recname.split()))
-                tz.append(self._zonenamedict[z])
-                f.append(flux)
-        fz = np.array(fz)
-        tz = np.array(tz)
-        f = np.array(f)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        return
-
-    def _compute_mass_balance(self, kstpkper, totim):
-        # Returns a record array with total inflow, total outflow,
-        # and percent error summed by column.
-        skipcols = ["time_step", "stress_period", "totim", "name"]
-
-        # Compute inflows
-        recnames = self.get_record_names()
-        innames = [n for n in recnames if n.startswith("FROM_")]
-        outnames = [n for n in recnames if n.startswith("TO_")]
-        if kstpkper is not None:
-            rowidx = np.where(
-                (self._budget["time_step"] == kstpkper[0])
-                & (self._budget["stress_period"] == kstpkper[1])
-                & np.in1d(self._budget["name"], innames)
-            )
-        elif totim is not None:
-            rowidx = np.where(
-                (self._budget["totim"] == totim)
-                & np.in1d(self._budget["name"], innames)
-            )
-        a = _numpyvoid2numeric(
-            self._budget[list(self._zonenamedict.values())][rowidx]
-        )
-        intot = np.array(a.sum(axis=0))
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols])
-        )
-        fz = np.array(["TOTAL_IN"] * len(tz))
-        self._update_budget_fromssst(fz, tz, intot, kstpkper, totim)
-
-        # Compute outflows
-        if kstpkper is not None:
-            rowidx = np.where(
-                (self._budget["time_step"] == kstpkper[0])
-                & (self._budget["stress_period"] == kstpkper[1])
-                & np.in1d(self._budget["name"], outnames)
-            )
-        elif totim is not None:
-            rowidx = np.where(
-                (self._budget["totim"] == totim)
-                & np.in1d(self._budget["name"], outnames)
-            )
-        a = _numpyvoid2numeric(
-            self._budget[list(self._zonenamedict.values())][rowidx]
-        )
-        outot = np.array(a.sum(axis=0))
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols])
-        )
-        fz = np.array(["TOTAL_OUT"] * len(tz))
-        self._update_budget_fromssst(fz, tz, outot, kstpkper, totim)
 
-        # Compute IN-OUT
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols])
-        )
-        f = intot - outot
-        fz = np.array(["IN-OUT"] * len(tz))
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        # Compute percent discrepancy
-        tz = np.array(
-            list([n for n in self._budget.dtype.names if n not in skipcols])
+        # Create empty array for the budget terms.
+        dtype_list = [
+            ("totim", "<f4"),
+            ("time_step", "<i4"),
+            ("stress_period", "<i4"),
+            ("name", (str, 50)),
+        ]
+        dtype_list += [
+            (n, self.float_type) for n in self._zonenamedict.values()
+        ]
+        dtype = np.dtype(dtype_list)
+        nrec = len(self._recnames)
+        recordarray = np.zeros(len(steps) * nrec, dtype=dtype)
+
+        times = [self._get_step_time(kk, t) for kk, t in steps]
+        recordarray["totim"] = np.repeat([t for t, _ in times], nrec)
+        recordarray["time_step"] = np.repeat([kk[0] for _, kk in times], nrec)
+        recordarray["stress_period"] = np.repeat(
+            [kk[1] for _, kk in times], nrec
         )
-        fz = np.array(["PERCENT_DISCREPANCY"] * len(tz))
-        in_minus_out = intot - outot
-        in_plus_out = intot + outot
-        f = 100 * in_minus_out / (in_plus_out / 2.0)
-        self._update_budget_fromssst(fz, tz, np.abs(f), kstpkper, totim)
-
-        return
+        recordarray["name"] = np.tile(self._recnames, len(steps))
+        for i, n in enumerate(self._zonenamedict.values()):
+            recordarray[n] = values[:, :, i].ravel()
+        return recordarray
 
     def _clean_budget_names(self, names):
         newnames = []
@@ -1539,12 +1103,288 @@ class ZoneBudget(object):
         return newobj
 
 
-def _numpyvoid2numeric(a):
-    # The budget record array has multiple dtypes and a slice returns
-    # the flexible-type numpy.void which must be converted to a numeric
-    # type prior to performing reducing functions such as sum() or
-    # mean()
-    return np.array([list(r) for r in a])
+def zone_budgets(
+    cbc_file,
+    zones,
+    kstpkper=None,
+    totim=None,
+    aliases=None,
+    verbose=False,
+    pool=None,
+    max_workers=None,
+    grb_file=None,
+    **kwargs
+):
+    """
+    Compute the budgets of several zone arrays in a single pass over the
+    records of a cell budget file.  Each budget record is read once per
+    time step and used for all of the zone arrays.
+
+    Parameters
+    ----------
+    cbc_file : str or CellBudgetFile object
+        The file name or CellBudgetFile object for which budgets will be
+        computed.
+    zones : list or dict of ndarrays
+        The zone arrays.
+    kstpkper : tuple of ints
+        A tuple containing the time step and stress period (kstp, kper).
+        The kstp and kper values are zero based.
+    totim : float
+        The simulation time.
+    aliases : dict or list of dicts
+        A dictionary with key, value pairs of zones and aliases that is
+        used for all of the zone arrays, or a list with a dictionary for
+        each zone array.
+    pool : string
+        None, 'thread' or 'process'.  See ZoneBudget.  (default is None)
+    max_workers : int
+        Maximum number of threads or processes used if pool is not None.
+    grb_file : str or MfGrdFile
+        The MODFLOW 6 binary grid file name or MfGrdFile object of the
+        model.  See ZoneBudget.  (default is None)
+
+    Returns
+    -------
+    zbs : list or dict of ZoneBudget objects
+        The ZoneBudget object of each zone array.  A dictionary with the
+        keys of zones is returned if zones is a dictionary.
+
+    Examples
+    --------
+
+    >>> from flopy.utils.zonbud import zone_budgets
+    >>> zbs = zone_budgets('zonebudtest.cbc', {'units': zon1, 'parcels': zon2})
+    >>> zbs['parcels'].to_csv('parcels.csv')
+    """
+    if pool not in (None, "thread", "process"):
+        raise Exception("Unknown pool specified: " + str(pool))
+
+    if isinstance(zones, dict):
+        keys = list(zones.keys())
+        zones = list(zones.values())
+    else:
+        keys = None
+        zones = list(zones)
+    if len(zones) == 0:
+        raise Exception("No zone arrays specified.")
+    if isinstance(aliases, (list, tuple)):
+        s = "The number of aliases ({}) and zone arrays ({}) differ.".format(
+            len(aliases), len(zones)
+        )
+        assert len(aliases) == len(zones), s
+    else:
+        aliases = [aliases] * len(zones)
+
+    # Open the cell budget file and the binary grid file once
+    if isinstance(cbc_file, str) and os.path.isfile(cbc_file):
+        cbc_file = CellBudgetFile(cbc_file)
+    if isinstance(grb_file, str):
+        grb_file = MfGrdFile(grb_file)
+
+    zbs = []
+    for z, a in zip(zones, aliases):
+        zb = ZoneBudget.__new__(ZoneBudget)
+        zb._setup(cbc_file, z, kstpkper, totim, a, grb_file, **kwargs)
+        zbs.append(zb)
+    _build_budgets(zbs, pool, max_workers, verbose)
+
+    if keys is not None:
+        return OrderedDict(zip(keys, zbs))
+    return zbs
+
+
+def _build_budgets(zbs, pool=None, max_workers=None, verbose=False):
+    """
+    Compute the budgets of ZoneBudget objects for the same cell budget
+    file and time steps, and build the budget record array of each
+    object.
+
+    """
+    steps = zbs[0]._get_steps()
+    if pool is None:
+        values = _compute_budgets(zbs, zbs[0].cbc, steps, verbose)
+    else:
+        values = _compute_budgets_pool(zbs, steps, pool, max_workers, verbose)
+    for zb, v in zip(zbs, values):
+        zb._budget = zb._initialize_budget_recordarray(steps, v)
+    return
+
+
+def _compute_budgets(zbs, cbc, steps, verbose=False):
+    """
+    Compute the budgets of ZoneBudget objects for a list of (kstpkper,
+    totim) tuples in a single pass over the cell budget file records.
+
+    Returns
+    -------
+    values : list of ndarrays
+        Array of shape (len(steps), nrecords, nzones) with the budget of
+        each time step for each ZoneBudget object.
+
+    """
+    values = [
+        np.zeros(
+            (len(steps), len(zb._recnames), len(zb.allzones)), zb.float_type
+        )
+        for zb in zbs
+    ]
+    records = _StepRecords(cbc)
+    for n, (kk, t) in enumerate(steps):
+        if verbose:
+            if kk is not None:
+                s = (
+                    "Computing the budget for"
+                    " time step {} in stress period {}".format(
+                        kk[0] + 1, kk[1] + 1
+                    )
+                )
+            else:
+                s = "Computing the budget for time {}".format(t)
+            print(s)
+        for zb, v in zip(zbs, values):
+            v[n] = zb._compute_budget(records, kstpkper=kk, totim=t)
+        records.clear()
+    return values
+
+
+def _compute_budgets_pool(zbs, steps, pool, max_workers, verbose):
+    """
+    Compute the budgets of ZoneBudget objects for a list of (kstpkper,
+    totim) tuples using a pool of threads or processes.  Each group of
+    time steps is computed by copies of the ZoneBudget objects with a cell
+    budget file that is opened with the record index of the cell budget
+    file of the ZoneBudget objects.
+
+    Returns
+    -------
+    values : list of ndarrays
+        Array of shape (len(steps), nrecords, nzones) with the budget of
+        each time step for each ZoneBudget object.
+
+    """
+    if pool == "thread":
+        executor = ThreadPoolExecutor
+    else:
+        executor = ProcessPoolExecutor
+    nworkers = max_workers
+    if nworkers is None:
+        nworkers = os.cpu_count() or 1
+    nchunks = min(len(steps), 4 * nworkers)
+    chunks = np.array_split(np.arange(len(steps)), nchunks)
+
+    # attributes that are needed to compute budgets, the cell budget
+    # file and model objects are not passed to the workers
+    ignore_attrs = ["cbc", "_budget", "model", "dis", "sr"]
+    states = [
+        {k: v for k, v in zb.__dict__.items() if k not in ignore_attrs}
+        for zb in zbs
+    ]
+    cbc = zbs[0].cbc
+    if cbc.realtype == np.float64:
+        precision = "double"
+    else:
+        precision = "single"
+    index = {name: getattr(cbc, name) for name in cbc._index_names}
+
+    values = [
+        np.zeros(
+            (len(steps), len(zb._recnames), len(zb.allzones)), zb.float_type
+        )
+        for zb in zbs
+    ]
+    with executor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(
+                _compute_zone_budgets,
+                states,
+                cbc.filename,
+                precision,
+                index,
+                [steps[i] for i in chunk],
+                verbose,
+            )
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            for v, vchunk in zip(values, future.result()):
+                v[chunk] = vchunk
+    return values
+
+
+def _compute_zone_budgets(states, filename, precision, index, steps, verbose):
+    """
+    Compute the budgets of ZoneBudget objects for a list of (kstpkper,
+    totim) tuples and return the budget of each time step.  The ZoneBudget
+    objects are rebuilt from states, dictionaries of their attributes, and
+    the cell budget file is opened with a shared record index.  This is a
+    module level function so that it can be used with a process pool.
+
+    """
+    zbs = []
+    for state in states:
+        zb = ZoneBudget.__new__(ZoneBudget)
+        zb.__dict__.update(state)
+        zbs.append(zb)
+    with CellBudgetFile(filename, precision=precision, index=index) as cbc:
+        values = _compute_budgets(zbs, cbc, steps, verbose)
+    return values
+
+
+class _StepRecords(object):
+    """
+    Cache of the cell budget file records of a time step, so that each
+    record is read once when the budgets of several zone arrays are
+    computed.
+
+    Parameters
+    ----------
+    cbc : CellBudgetFile object
+
+    """
+
+    def __init__(self, cbc):
+        self.cbc = cbc
+        self._data = {}
+
+    def get_data(self, text, kstpkper=None, totim=None, full3D=False):
+        key = (text, kstpkper, totim, full3D)
+        if key not in self._data:
+            self._data[key] = self.cbc.get_data(
+                text=text, kstpkper=kstpkper, totim=totim, full3D=full3D
+            )
+        return self._data[key]
+
+    def clear(self):
+        self._data = {}
+
+
+def _get_faces(a, axis):
+    """
+    Get the node numbers of the cells on either side of the faces along
+    an axis of a 3-D array between cells with different values.
+
+    Parameters
+    ----------
+    a : ndarray
+        3-D array.
+    axis : int
+        Array axis of the faces.
+
+    Returns
+    -------
+    n0, n1 : ndarray
+        Node numbers of the first and second cell of each face.
+
+    """
+    nodes = np.arange(a.size).reshape(a.shape)
+    s0 = [slice(None)] * a.ndim
+    s1 = [slice(None)] * a.ndim
+    s0[axis] = slice(None, -1)
+    s1[axis] = slice(1, None)
+    s0, s1 = tuple(s0), tuple(s1)
+    idx = a[s0] != a[s1]
+    return nodes[s0][idx], nodes[s1][idx]
 
 
 def write_zbarray(fname, X, fmtin=None, iprn=None):